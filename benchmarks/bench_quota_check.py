@@ -0,0 +1,96 @@
+"""
+Benchmark quota-check latency under concurrent updates.
+
+Usage:
+    python benchmarks/bench_quota_check.py [--updates 2000] [--concurrency 64]
+
+Simulates PTB's concurrent update processing: each update constructs
+its handler-side UserSession, checks the remaining quota and records
+one use, all on the event loop as the handlers do. "legacy" opens a
+private sqlite3 connection per UserSession (the old behaviour); "shared"
+uses the process-wide Database. Runs against a temporary database file.
+"""
+import argparse
+import asyncio
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import Config
+from models.user_session import UserSession
+from services.database import Database
+
+
+class LegacyUserSession(UserSession):
+    """UserSession as it was: one fresh connection per instance, default pragmas."""
+
+    class _Connection:
+        def __init__(self, path):
+            self.conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+
+        def ensure_schema(self, name, *statements):
+            for statement in statements:
+                self.conn.execute(statement)
+
+        def fetchone(self, sql, params=()):
+            return self.conn.execute(sql, params).fetchone()
+
+        def execute(self, sql, params=()):
+            return self.conn.execute(sql, params).rowcount
+
+        def transaction(self):
+            return self.conn
+
+    def __init__(self):
+        self.db = self._Connection(Config.DATABASE_PATH)
+        self._create_tables()
+
+
+async def run(session_cls, updates: int, concurrency: int, users: int) -> list:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def handle(i: int):
+        async with semaphore:
+            start = time.perf_counter()
+            session = session_cls()
+            if session.get_remaining_quota(i % users) > 0:
+                session.increment_usage(i % users)
+            latencies.append((time.perf_counter() - start) * 1000)
+            await asyncio.sleep(0)
+
+    await asyncio.gather(*(handle(i) for i in range(updates)))
+    return latencies
+
+
+def report(name: str, latencies: list, elapsed: float):
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(f"{name:>7} {statistics.mean(latencies):>9.3f} {latencies[len(latencies) // 2]:>9.3f} "
+          f"{p99:>9.3f} {len(latencies) / elapsed:>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--updates", type=int, default=2000, help="updates to simulate")
+    parser.add_argument("--concurrency", type=int, default=Config.CONCURRENT_UPDATES, help="updates in flight")
+    parser.add_argument("--users", type=int, default=500, help="distinct user ids")
+    args = parser.parse_args()
+
+    print(f"{'':>7} {'mean ms':>9} {'p50 ms':>9} {'p99 ms':>9} {'updates/s':>10}")
+    for name, session_cls in (("legacy", LegacyUserSession), ("shared", UserSession)):
+        with tempfile.TemporaryDirectory() as tmp:
+            Config.DATABASE_PATH = Path(tmp) / "bench.db"
+            start = time.perf_counter()
+            latencies = asyncio.run(run(session_cls, args.updates, args.concurrency, args.users))
+            report(name, latencies, time.perf_counter() - start)
+            Database.shutdown()
+
+
+if __name__ == "__main__":
+    main()
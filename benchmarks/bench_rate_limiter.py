@@ -0,0 +1,88 @@
+"""
+Benchmark rate-limit checks with many active users.
+
+Usage:
+    python benchmarks/bench_rate_limiter.py [--users 100000] [--requests 500000]
+
+"legacy" is the old per-user timestamp list, rebuilt on every request;
+"gcra" is SQLiteStorage.allow_request, which keeps one float per user.
+Both see the same stream of requests from --users users spread over
+--seconds of simulated time, then report throughput, per-call latency
+and the memory held by limiter state.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import Config
+from services.storage import SQLiteStorage
+
+
+class LegacyLimiter:
+    """RateLimiter as it was: a list of timestamps per user that is never evicted."""
+
+    def __init__(self):
+        self.user_requests = {}
+
+    def allow_request(self, key, limit, window, now, cost=1):
+        requests = self.user_requests.setdefault(key, [])
+        requests[:] = [t for t in requests if now - t < window]
+        if len(requests) >= limit:
+            return False
+        requests.append(now)
+        return True
+
+
+def run(limiter, stream) -> tuple:
+    latencies = []
+    allowed = 0
+    start = time.perf_counter()
+    for key, now in stream:
+        t0 = time.perf_counter()
+        allowed += limiter.allow_request(key, Config.RATE_LIMIT_PER_MINUTE, 60, now)
+        latencies.append(time.perf_counter() - t0)
+    return latencies, time.perf_counter() - start, allowed
+
+
+def state_memory(limiter_cls, stream) -> int:
+    """Bytes still held by a fresh limiter after replaying the stream, without timing overhead."""
+    tracemalloc.start()
+    limiter = limiter_cls()
+    for key, now in stream:
+        limiter.allow_request(key, Config.RATE_LIMIT_PER_MINUTE, 60, now)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del limiter
+    return current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=100_000, help="distinct active users")
+    parser.add_argument("--requests", type=int, default=500_000, help="requests to simulate")
+    parser.add_argument("--seconds", type=float, default=600, help="simulated time span")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    # A few heavy users and a long tail, as in real traffic
+    weights = [1 / (rank + 1) for rank in range(args.users)]
+    users = rng.choices(range(args.users), weights=weights, k=args.requests)
+    stream = [(f"user:{user}", 1000.0 + i * args.seconds / args.requests) for i, user in enumerate(users)]
+
+    print(f"{'':>7} {'calls/s':>10} {'mean us':>9} {'p99 us':>9} {'state MiB':>10} {'allowed':>9}")
+    for name, limiter_cls in (("legacy", LegacyLimiter), ("gcra", SQLiteStorage)):
+        latencies, elapsed, allowed = run(limiter_cls(), stream)
+        memory = state_memory(limiter_cls, stream)
+        latencies.sort()
+        print(f"{name:>7} {len(stream) / elapsed:>10.0f} {statistics.mean(latencies) * 1e6:>9.2f} "
+              f"{latencies[int(len(latencies) * 0.99) - 1] * 1e6:>9.2f} {memory / 2**20:>10.1f} {allowed:>9}")
+
+
+if __name__ == "__main__":
+    main()
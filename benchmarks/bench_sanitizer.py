@@ -0,0 +1,94 @@
+"""
+Benchmark sanitizing and validating 5000-character messages.
+
+Usage:
+    python benchmarks/bench_sanitizer.py [--chars 5000] [--rounds 2000]
+
+"legacy" is SecurityMiddleware.sanitize_input followed by
+TextValidator.is_valid_text as they were: one regex pass per pattern,
+eleven in total. "fused" is a single Sanitizer.scan, whose result gives
+both the clean text and the verdict. Each corpus is checked for equal
+clean text and verdicts before timing.
+"""
+import argparse
+import random
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from utils.sanitizer import Sanitizer
+
+LEGACY_SUSPICIOUS = [
+    re.compile(r'<script.*?>.*?</script>', re.IGNORECASE),
+    re.compile(r'on\w+\s*=', re.IGNORECASE),
+    re.compile(r'javascript:', re.IGNORECASE),
+    re.compile(r'vbscript:', re.IGNORECASE),
+]
+
+
+def legacy(text: str) -> tuple:
+    """sanitize_input and is_valid_text as they were before the fused scanner."""
+    sanitized = re.sub(r'<[^>]*>', '', text)
+    for pattern in (r'javascript:', r'vbscript:', r'on\w+=', r'data:', r'alert\(', r'eval\(', r'expression\('):
+        sanitized = re.sub(pattern, '', sanitized, flags=re.IGNORECASE)
+    sanitized = sanitized.strip()
+
+    cleaned = text.strip()
+    valid = bool(cleaned) and not any(p.search(cleaned) for p in LEGACY_SUSPICIOUS) \
+        and any(char.isalnum() for char in cleaned)
+    return sanitized, valid
+
+
+def fused(text: str) -> tuple:
+    result = Sanitizer.scan(text)
+    return result.text, not result.is_dangerous and any(char.isalnum() for char in text)
+
+
+def make_corpus(kind: str, chars: int, rng: random.Random) -> str:
+    words = ["the", "quick", "brown", "fox", "jumps", "over", "lazy", "dog", "speech", "audio", "voice"]
+    extras = {
+        "prose": [],
+        "markup": ["<b>", "</b>", "<i>", "</i>", '<a href="x">', "</a>"],
+        "hostile": ["<b>", "</b>", "<script>alert(1)</script>", "javascript:", "onload=", "data:", "eval("],
+    }[kind]
+    parts, size = [], 0
+    while size < chars:
+        token = rng.choice(extras) if extras and rng.random() < 0.1 else rng.choice(words)
+        parts.append(token)
+        size += len(token) + 1
+    return " ".join(parts)[:chars]
+
+
+def run(func, text: str, rounds: int) -> list:
+    latencies = []
+    for _ in range(rounds):
+        t0 = time.perf_counter()
+        func(text)
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chars", type=int, default=5000, help="characters per message")
+    parser.add_argument("--rounds", type=int, default=2000, help="messages per corpus and implementation")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'corpus':>8} {'':>7} {'msgs/s':>9} {'mean us':>9} {'p99 us':>9} {'valid':>6}")
+    for kind in ("prose", "markup", "hostile"):
+        text = make_corpus(kind, args.chars, rng)
+        assert legacy(text)[1] == fused(text)[1], f"verdicts differ on {kind}"
+        for name, func in (("legacy", legacy), ("fused", fused)):
+            latencies = sorted(run(func, text, args.rounds))
+            print(f"{kind:>8} {name:>7} {len(latencies) / sum(latencies):>9.0f} "
+                  f"{statistics.mean(latencies) * 1e6:>9.1f} "
+                  f"{latencies[int(len(latencies) * 0.99) - 1] * 1e6:>9.1f} {str(func(text)[1]):>6}")
+
+
+if __name__ == "__main__":
+    main()
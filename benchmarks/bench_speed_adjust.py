@@ -0,0 +1,75 @@
+"""
+Benchmark the streaming (pipe) speed adjustment against the temp-file path.
+
+Usage:
+    python benchmarks/bench_speed_adjust.py [--seconds 10] [--runs 5]
+
+Requires ffmpeg on PATH (or FFMPEG_BINARY). Filesystem and process
+activity is counted with an audit hook, so the numbers reflect what
+TTSService.adjust_audio_speed does, not what ffmpeg does internally.
+"""
+import argparse
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import Config
+from services.tts_service import TTSService
+
+FILE_EVENTS = {"open", "os.remove", "os.unlink", "tempfile.mkstemp"}
+PROCESS_EVENTS = {"subprocess.Popen"}
+counts = {"file": 0, "process": 0}
+
+
+def audit_hook(event, args):
+    if event in FILE_EVENTS:
+        counts["file"] += 1
+    elif event in PROCESS_EVENTS:
+        counts["process"] += 1
+
+
+def make_sample_mp3(seconds: int) -> bytes:
+    """Render a speech-like test tone to MP3 in memory."""
+    result = subprocess.run(
+        [Config.FFMPEG_BINARY, "-hide_banner", "-loglevel", "error",
+         "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate={Config.AUDIO_SAMPLE_RATE}:duration={seconds}",
+         "-ac", "1", "-b:a", "32k", "-f", "mp3", "pipe:1"],
+        stdout=subprocess.PIPE, check=True,
+    )
+    return result.stdout
+
+
+def run(service: TTSService, audio: bytes, speed: float, streaming: bool, runs: int) -> dict:
+    Config.AUDIO_STREAMING_PIPELINE = streaming
+    counts["file"] = counts["process"] = 0
+    start = time.perf_counter()
+    for _ in range(runs):
+        service.adjust_audio_speed(audio, speed)
+    elapsed = (time.perf_counter() - start) / runs
+    return {"ms": elapsed * 1000, "file_ops": counts["file"] / runs, "spawns": counts["process"] / runs}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=int, default=10, help="length of the test clip")
+    parser.add_argument("--runs", type=int, default=5, help="iterations per measurement")
+    args = parser.parse_args()
+
+    audio = make_sample_mp3(args.seconds)
+    service = TTSService()
+    sys.addaudithook(audit_hook)
+
+    print(f"{args.seconds}s clip, {len(audio)} bytes, {args.runs} runs")
+    print(f"{'speed':>6} {'mode':>10} {'ms/call':>10} {'file ops':>9} {'spawns':>7}")
+    for speed in (1.5, 2.0):
+        for streaming in (False, True):
+            r = run(service, audio, speed, streaming, args.runs)
+            mode = "streaming" if streaming else "tempfile"
+            print(f"{speed:>5}x {mode:>10} {r['ms']:>10.1f} {r['file_ops']:>9.1f} {r['spawns']:>7.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark the NumPy phase-vocoder time stretch against the old frame-rate hack.
+
+Usage:
+    python benchmarks/bench_time_stretch.py [--runs 3]
+
+Runs on synthetic 16-bit mono PCM, so no ffmpeg or network is needed.
+The legacy path is the pydub frame_rate override + set_frame_rate
+resample that TTSService used before. It runs in audioop's C resampler
+but shifts pitch; "cost" is the NumPy time relative to it.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from pydub import AudioSegment
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from config import Config
+from services.time_stretch import TimeStretcher
+
+
+def make_pcm(seconds: int, frame_rate: int) -> bytes:
+    """Speech-like test signal: a few harmonics with a slow amplitude envelope."""
+    t = np.arange(seconds * frame_rate) / frame_rate
+    signal = sum(np.sin(2 * np.pi * f * t) / (i + 1) for i, f in enumerate((180, 360, 720, 1440)))
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 3 * t)
+    return (signal * envelope * 8000).astype('<i2').tobytes()
+
+
+def legacy_change_speed(pcm: bytes, frame_rate: int, speed: float) -> bytes:
+    audio = AudioSegment(data=pcm, sample_width=2, frame_rate=frame_rate, channels=1)
+    adjusted = audio._spawn(audio.raw_data, overrides={"frame_rate": int(audio.frame_rate * speed)})
+    return adjusted.set_frame_rate(audio.frame_rate).raw_data
+
+
+def timed(func, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3, help="iterations per measurement")
+    args = parser.parse_args()
+
+    frame_rate = Config.AUDIO_SAMPLE_RATE
+    print(f"{'clip':>5} {'speed':>6} {'legacy ms':>10} {'numpy ms':>9} {'cost':>6}")
+    for seconds in (1, 10, 60):
+        pcm = make_pcm(seconds, frame_rate)
+        for speed in (0.5, 1.5, 2.0, 3.0):
+            legacy = timed(lambda: legacy_change_speed(pcm, frame_rate, speed), args.runs)
+            numpy_ms = timed(lambda: TimeStretcher.stretch_pcm16(pcm, speed), args.runs)
+            print(f"{seconds:>4}s {speed:>5}x {legacy:>10.1f} {numpy_ms:>9.1f} {numpy_ms / legacy:>5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import sys
 from pathlib import Path
@@ -12,14 +13,21 @@ load_dotenv(dotenv_path)
 sys.path.insert(0, str(project_root))
 
 from telegram import Update
-from telegram.ext import Application, CommandHandler, MessageHandler, filters, ConversationHandler
+from telegram.ext import Application, CommandHandler, MessageHandler, TypeHandler, filters, ConversationHandler
 from config import Config
 from utils.logger import bot_logger
 from handlers.start_handler import StartHandler
 from handlers.text_handler import TextHandler
 from handlers.audio_handler import AudioHandler
 from handlers.error_handler import ErrorHandler
+from middleware.outbound_limiter import OutboundRateLimiter
+from middleware.update_gate import UpdateGate
 from services.file_service import FileService
+from services.synthesis_pool import SynthesisPool
+from services.database import Database
+from services.db_worker import DatabaseWorker
+from services.usage_counter import UsageCounter
+from services.usage_ledger import UsageLedger
 
 class TextToSpeechBot:
     """Telegram TTS Bot."""
@@ -29,6 +37,8 @@ class TextToSpeechBot:
         self.start_handler = StartHandler()
         self.text_handler = TextHandler()
         self.audio_handler = AudioHandler()
+        self.update_gate = UpdateGate()
+        self._prune_task: asyncio.Task | None = None
 
     def setup_handlers(self):
         """Setup conversation and command handlers."""
@@ -41,31 +51,41 @@ class TextToSpeechBot:
             fallbacks=self._get_fallbacks(),
         )
 
+        # Shed invalid and over-limit updates before any handler touches SQLite or TTS
+        self.application.add_handler(TypeHandler(Update, self.update_gate.check), group=-1)
         self.application.add_handler(conv_handler)
         self.application.add_handler(CommandHandler('help', self.start_handler.help_command))
         self.application.add_handler(CommandHandler('cancel', self.start_handler.cancel))
+        self.application.add_handler(TypeHandler(Update, self.update_gate.finish), group=1)
         self.application.add_error_handler(ErrorHandler.error_handler)
 
     def _get_states(self) -> dict:
-        """Define conversation states for the bot."""
+        """
+        Define conversation states for the bot.
+
+        filters.TEXT also matches commands, and state handlers are tried
+        before fallbacks, so text handlers exclude commands to let /cancel
+        and /start reach the fallbacks in every state.
+        """
+        text = filters.TEXT & ~filters.COMMAND
         return {
             Config.LANGUAGE_SELECTION: [
-                MessageHandler(filters.TEXT, self.start_handler.handle_language_selection)
+                MessageHandler(text, self.start_handler.handle_language_selection)
             ],
             Config.MAIN_MENU: [
-                MessageHandler(filters.TEXT, self.start_handler.handle_main_menu)
+                MessageHandler(text, self.start_handler.handle_main_menu)
             ],
             Config.AWAITING_TEXT: [
                 MessageHandler(
-                    filters.TEXT | filters.Document.ALL | filters.PHOTO,
+                    text | filters.Document.ALL | filters.PHOTO,
                     self.text_handler.handle_text_input
                 )
             ],
             Config.AWAITING_SPEED: [
-                MessageHandler(filters.TEXT, self.audio_handler.handle_speed_selection)
+                MessageHandler(text, self.audio_handler.handle_speed_selection)
             ],
             Config.CONTINUOUS_MODE: [
-                MessageHandler(filters.TEXT, self.audio_handler.handle_continuous_mode)
+                MessageHandler(text, self.audio_handler.handle_continuous_mode)
             ],
         }
 
@@ -82,18 +102,49 @@ class TextToSpeechBot:
             FileService.cleanup_old_files()
         except Exception as e:
             bot_logger.warning(f"Initial file cleanup failed: {e}")
+        self._prune_task = asyncio.create_task(self._prune_usage_ledger())
+        if Config.USAGE_WRITE_BEHIND:
+            UsageCounter.instance().start()
         bot_logger.info("Bot initialized successfully")
 
+    async def _prune_usage_ledger(self):
+        """Drop expired usage buckets at startup and every Config.USAGE_PRUNE_INTERVAL seconds after."""
+        while True:
+            try:
+                pruned = await DatabaseWorker.instance().submit(UsageLedger().prune)
+                bot_logger.info(f"Pruned {pruned} expired usage buckets")
+            except Exception as e:
+                bot_logger.warning(f"Usage ledger pruning failed: {e}")
+            await asyncio.sleep(Config.USAGE_PRUNE_INTERVAL)
+
     async def post_stop(self, application: Application):
         """Run on bot shutdown."""
         bot_logger.info("Bot shutting down")
+        if self._prune_task is not None:
+            self._prune_task.cancel()
+            self._prune_task = None
+        SynthesisPool.instance().shutdown()
         FileService.cleanup_old_files(0)
+        # Queued reserve/refund calls change the counters, so they must run before the final flush
+        DatabaseWorker.shutdown()
+        if Config.USAGE_WRITE_BEHIND:
+            try:
+                await UsageCounter.instance().stop()
+            except Exception as e:
+                bot_logger.error(f"Final usage flush failed: {e}")
+        Database.shutdown()
 
     def run(self):
         """Start the bot polling."""
         try:
             Config.validate_setup()
-            self.application = Application.builder().token(Config.TELEGRAM_TOKEN).build()
+            self.application = (
+                Application.builder()
+                .token(Config.TELEGRAM_TOKEN)
+                .concurrent_updates(Config.CONCURRENT_UPDATES)
+                .rate_limiter(OutboundRateLimiter())
+                .build()
+            )
             self.setup_handlers()
 
             self.application.post_init = self.post_init
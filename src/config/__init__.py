@@ -28,19 +28,59 @@ class Config:
     AUDIO_TEMP_DIR.mkdir(exist_ok=True, parents=True)
     DATA_DIR.mkdir(exist_ok=True, parents=True)
 
+    # ====== DATABASE ======
+    DB_CACHED_STATEMENTS = 256  # prepared statements kept per connection
+    DB_CACHE_KB = 16 * 1024  # page cache size
+    DB_MMAP_BYTES = 64 * 1024 * 1024  # memory-mapped I/O window
+    DB_BUSY_TIMEOUT_MS = 5000
+    DB_BATCH_SIZE = 64  # queued calls run per transaction by the database thread
+
+    # ====== SHARED STORAGE ======
+    STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "sqlite").strip().lower()  # 'sqlite' or 'redis'
+    REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0").strip()
+    REDIS_KEY_PREFIX = os.getenv("REDIS_KEY_PREFIX", "ttsbot:").strip()
+
     # ====== BATCH SETTINGS ======
     MAX_BATCH_SIZE = 10
     MAX_BATCH_TEXT_LENGTH = 1000
 
     # ====== AUDIO SETTINGS ======
     DEFAULT_SPEED = 1.0
+    AUDIO_SAMPLE_RATE = 24000  # gTTS native sample rate
+    AUDIO_STREAMING_PIPELINE = True  # pipe audio through ffmpeg instead of temp files
+    AUDIO_SPILL_BYTES = 8 * 1024 * 1024  # larger clips are uploaded from a temp file instead of memory
+    FFMPEG_BINARY = os.getenv("FFMPEG_BINARY", "ffmpeg").strip()
+
+    # ====== SYNTHESIS POOL ======
+    TTS_WORKER_THREADS = 4
+    TTS_QUEUE_SIZE = 32
+    TTS_JOB_TIMEOUT = 60  # seconds
+    CONCURRENT_UPDATES = 64  # updates processed concurrently by the dispatcher
+    TTS_CHUNK_MAX_CHARS = 300  # long texts are split into sentence chunks of this size
+    TTS_CHUNK_CONCURRENCY = 4  # parallel chunk requests per text
+    SPECULATIVE_RENDERING = False  # start synthesis while the user is still choosing a speed
+    ADMISSION_MAX_CONCURRENT = 8  # synthesis requests admitted at once across all users
+    ADMISSION_QUEUE_SIZE = 32  # requests waiting for admission before load is shed
+    ADMISSION_MAX_WAIT = 15  # seconds a request may wait for admission before it is shed
 
     # ====== RATE LIMITING ======
-    RATE_LIMIT_PER_MINUTE = 20
+    RATE_LIMIT_PER_MINUTE = 20  # request units per user per minute
+    RATE_LIMIT_CHARS_PER_UNIT = 1000  # each started block of text beyond the first costs one more unit
+    RATE_LIMIT_SWEEP_INTERVAL = 60  # seconds between sweeps of idle users' limiter state
 
     # ====== QUOTAS ======
     DAILY_QUOTA_FREE = 5
     DAILY_QUOTA_PREMIUM = 100
+    USAGE_WRITE_BEHIND = os.getenv("USAGE_WRITE_BEHIND", "false").strip().lower() == "true"  # buffer usage counters in memory
+    USAGE_FLUSH_INTERVAL = 5  # seconds between write-behind flushes
+    USAGE_FLUSH_MAX_PENDING = 100  # flush early after this many buffered updates
+    USAGE_LEDGER_RETENTION_DAYS = 90  # days of per-user usage history and daily rollups kept
+    USAGE_HOURLY_RETENTION_DAYS = 14  # days of hourly rollups kept
+    USAGE_PRUNE_INTERVAL = 24 * 60 * 60  # seconds between usage ledger prunes
+
+    # ====== USER PROFILES ======
+    PROFILE_CACHE_SIZE = 10000  # users whose language/tier/usage are kept in memory
+    PROFILE_CACHE_TTL = 600  # seconds before a cached profile is re-read
 
     # ====== TEXT LIMITS ======
     MAX_TEXT_LENGTH = 5000
@@ -70,13 +110,27 @@ class Config:
 
     # ====== FILE SETTINGS ======
     AUDIO_TEMP_MAX_AGE = 24  # hours
+    MAX_UPLOAD_BYTES = 1024 * 1024  # uploaded text documents are read into memory up to this size
 
     # ====== TELEGRAM ======
     TELEGRAM_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "").strip()
+    OUTBOUND_GLOBAL_RATE = 30  # Bot API calls per second across all chats
+    OUTBOUND_CHAT_RATE = 1.0  # calls per second to one private chat
+    OUTBOUND_CHAT_BURST = 3  # calls a private chat may receive back to back
+    OUTBOUND_GROUP_RATE = 20 / 60  # calls per second to one group or channel
+    OUTBOUND_MAX_RETRIES = 3  # RetryAfter retries before the error reaches the handler
+    LEAN_DELIVERY = os.getenv("LEAN_DELIVERY", "true").strip().lower() == "true"  # one audio message per conversion
 
     # ====== CACHE SETTINGS ======
-    ENABLE_AUDIO_CACHING = False
+    ENABLE_AUDIO_CACHING = os.getenv("ENABLE_AUDIO_CACHING", "true").strip().lower() == "true"
     AUDIO_CACHE_TTL_HOURS = 24
+    AUDIO_CACHE_MEMORY_BYTES = 32 * 1024 * 1024  # hot clips served from RAM
+    BASE_RENDER_CACHE_BYTES = 64 * 1024 * 1024  # 1.0x renderings + decoded PCM kept in memory
+    AUDIO_CACHE_DISK_BYTES = 1024 * 1024 * 1024  # disk budget for cached clips
+    AUDIO_CACHE_HIGH_WATERMARK = 0.95  # start evicting above this share of the budget
+    AUDIO_CACHE_LOW_WATERMARK = 0.80  # evict down to this share of the budget
+    AUDIO_CACHE_EVICTION_POLICY = os.getenv("AUDIO_CACHE_EVICTION_POLICY", "lru").strip().lower()  # lru or lfu
+    AUDIO_CACHE_TOUCH_BATCH = 100  # memory-tier hits buffered before their access times reach the disk index
 
     @staticmethod
     def validate_setup():
@@ -1,10 +1,21 @@
+import asyncio
 from telegram import Update, ReplyKeyboardMarkup, ReplyKeyboardRemove
-from telegram.ext import ContextTypes
+from telegram.constants import ChatAction
+from telegram.ext import ContextTypes, ConversationHandler
 from config import Config
 from utils.logger import bot_logger
+from utils.metrics import metrics
 from services.tts_service import TTSService
-from services.file_service import FileService
+from services.audio_buffer import AudioBuffer
+from services.synthesis_pool import SynthesisPool, SynthesisCancelled
+from services.admission import AdmissionController, AdmissionRejected
+from services.file_id_cache import FileIdCache
+from services.quota_service import QuotaService
+from services.db_worker import DatabaseWorker
+from services.usage_ledger import UsageLedger
 from models.user_session import UserSession
+from services.profile_cache import ProfileCache
+from utils.helpers import Helpers
 from locales import Locale
 
 
@@ -13,7 +24,14 @@ class AudioHandler:
 
     def __init__(self):
         self.tts_service = TTSService()
+        self.synthesis_pool = SynthesisPool.instance()
+        self.admission = AdmissionController.instance()
+        self.file_id_cache = FileIdCache()
         self.user_session = UserSession()
+        self.quota_service = QuotaService()
+        self.db_worker = DatabaseWorker.instance()
+        self.usage_ledger = UsageLedger()
+        self.profile_cache = ProfileCache.instance()
         self.locale = Locale()
 
     async def handle_speed_selection(
@@ -22,11 +40,12 @@ class AudioHandler:
         """Handle speed selection and generate audio."""
         user = update.effective_user
         user_input = update.message.text
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(user.id, context.user_data)
 
         bot_logger.info(f"User {user.id} selected speed: {user_input}")
 
         if user_input in ("Back", "بازگشت"):
+            self._cancel_prerender(context)
             from handlers.start_handler import StartHandler
             return await StartHandler().show_main_menu(update, context, user.id)
 
@@ -34,25 +53,37 @@ class AudioHandler:
         if speed is None:
             return Config.AWAITING_SPEED
 
-        text = context.user_data.get("text_to_process")
+        # Claim the text and the quota reserved for it. With concurrent updates the
+        # state only moves on once this handler returns, so a second tap must find nothing.
+        text = context.user_data.pop("text_to_process", None)
         if not text:
+            if context.user_data.get("converting"):
+                bot_logger.info(f"Ignoring speed selection from user {user.id} during a conversion")
+                return Config.AWAITING_SPEED
             error_text = self.locale.get_text(language, "errors.unexpected")
             await update.message.reply_text(error_text)
             from handlers.start_handler import StartHandler
             return await StartHandler().show_main_menu(update, context, user.id)
 
         context.user_data["last_speed"] = speed
-        success = await self._generate_and_send_audio(
-            update, context, text, speed, user.id, language
-        )
+        context.user_data["converting"] = True
+        try:
+            await self._await_prerender(context)
+            success = await self._generate_and_send_audio(
+                update, context, text, speed, user.id, language
+            )
+        except SynthesisCancelled:
+            await self.db_worker.submit(self.quota_service.refund, user.id)
+            return ConversationHandler.END
+        finally:
+            context.user_data.pop("converting", None)
+
+        if not success:
+            await self.db_worker.submit(self.quota_service.refund, user.id)
 
         if success:
-            keyboard = (
-                [["🔄 ادامه", "🛑 توقف"]] if language == "fa" else [["🔄 Continue", "🛑 Stop"]]
-            )
-            reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-            next_action_text = self.locale.get_text(language, "continuous_mode.next_action")
-            await update.message.reply_text(next_action_text, reply_markup=reply_markup)
+            if not Config.LEAN_DELIVERY:
+                await self._send_next_action(update, language)
             return Config.CONTINUOUS_MODE
         else:
             from handlers.start_handler import StartHandler
@@ -64,7 +95,7 @@ class AudioHandler:
         """Handle continuous mode operations."""
         user_input = update.message.text
         user = update.effective_user
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(user.id, context.user_data)
 
         bot_logger.info(f"User {user.id} in continuous mode: {user_input}")
 
@@ -80,11 +111,7 @@ class AudioHandler:
         text = update.message.text
         if not text or text.startswith("/"):
             invalid_input_text = self.locale.get_text(language, "continuous_mode.invalid_input")
-            keyboard = (
-                [["🔄 ادامه", "🛑 توقف"]] if language == "fa" else [["🔄 Continue", "🛑 Stop"]]
-            )
-            reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-            await update.message.reply_text(invalid_input_text, reply_markup=reply_markup)
+            await update.message.reply_text(invalid_input_text, reply_markup=self._next_action_keyboard(language))
             return Config.CONTINUOUS_MODE
 
         if len(text) > Config.MAX_TEXT_LENGTH:
@@ -94,33 +121,87 @@ class AudioHandler:
             await update.message.reply_text(error_text)
             return Config.CONTINUOUS_MODE
 
-        remaining = self.user_session.get_remaining_quota(user.id)
-        if remaining <= 0:
+        if not await self.db_worker.submit(self.quota_service.reserve, user.id):
+            status = await self.db_worker.submit(self.quota_service.get_quota_status, user.id)
             quota_text = self.locale.get_text(
                 language,
                 "quota.exceeded",
-                used=self.user_session.get_daily_usage(user.id),
-                total=Config.DAILY_QUOTA_FREE,
+                used=status["used"],
+                total=status["total"],
             )
             await update.message.reply_text(quota_text)
             from handlers.start_handler import StartHandler
             return await StartHandler().show_main_menu(update, context, user.id)
 
         speed = context.user_data.get("last_speed", Config.DEFAULT_SPEED)
-        self.user_session.increment_usage(user.id)
 
-        success = await self._generate_and_send_audio(update, context, text, speed, user.id, language)
+        try:
+            success = await self._generate_and_send_audio(update, context, text, speed, user.id, language)
+        except SynthesisCancelled:
+            await self.db_worker.submit(self.quota_service.refund, user.id)
+            return ConversationHandler.END
 
-        if success:
-            keyboard = (
-                [["🔄 ادامه", "🛑 توقف"]] if language == "fa" else [["🔄 Continue", "🛑 Stop"]]
-            )
-            reply_markup = ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
-            next_action_text = self.locale.get_text(language, "continuous_mode.next_action")
-            await update.message.reply_text(next_action_text, reply_markup=reply_markup)
+        if not success:
+            await self.db_worker.submit(self.quota_service.refund, user.id)
+
+        if success and not Config.LEAN_DELIVERY:
+            await self._send_next_action(update, language)
 
         return Config.CONTINUOUS_MODE
 
+    async def _record_usage(self, user_id: int, text: str, speed: float, audio: AudioBuffer = None):
+        """
+        Add a delivered message to the usage ledger; statistics never block delivery.
+
+        The measured duration of the synthesized audio is recorded when there
+        is one; audio served by file_id falls back to an estimate.
+        """
+        if audio is not None and audio.duration:
+            audio_seconds = audio.duration
+        else:
+            audio_seconds = Helpers.estimate_speech_duration(text, speed)
+        try:
+            await self.db_worker.submit(self.usage_ledger.record, user_id, len(text), audio_seconds)
+        except Exception as e:
+            bot_logger.error(f"Failed to record usage for user {user_id}: {e}")
+
+    async def _await_prerender(self, context: ContextTypes.DEFAULT_TYPE):
+        """
+        Wait for a speculative base rendering started by TextHandler, if any.
+
+        A render still queued in the speculative lane is cancelled instead:
+        waiting for it would hold this interactive request behind all batch work.
+
+        Raises:
+            SynthesisCancelled: If the user cancelled while it was running.
+        """
+        admitted = context.user_data.pop("prerender_admitted", None)
+        task = context.user_data.pop("prerender_task", None)
+        if task is None:
+            return
+
+        if admitted is not None and not admitted.is_set() and not task.done():
+            task.cancel()
+            metrics.increment("prerender.preempted")
+            return
+
+        try:
+            await task
+            metrics.increment("prerender.used")
+        except SynthesisCancelled:
+            raise
+        except Exception as e:
+            bot_logger.debug(f"Speculative render unavailable, synthesizing normally: {e}")
+
+    @staticmethod
+    def _cancel_prerender(context: ContextTypes.DEFAULT_TYPE):
+        """Cancel a speculative render the user no longer needs."""
+        context.user_data.pop("prerender_admitted", None)
+        task = context.user_data.pop("prerender_task", None)
+        if task is not None and not task.done():
+            task.cancel()
+            metrics.increment("prerender.cancelled")
+
     async def _parse_speed_input(
         self, update: Update, user_input: str, context: ContextTypes.DEFAULT_TYPE, language: str
     ) -> float:
@@ -166,59 +247,65 @@ class AudioHandler:
         user_id: int,
         language: str,
     ) -> bool:
-        """Generate audio and send to user. Returns success status."""
+        """
+        Generate audio, send it to the user and record its usage. Returns success status.
+
+        In lean delivery mode (Config.LEAN_DELIVERY) progress is shown with an
+        upload_voice chat action, and the audio message itself carries the
+        caption and the Continue/Stop keyboard. A conversion then takes one
+        message instead of a progress message, its edit and deletion, a
+        success message and a keyboard message.
+
+        Raises:
+            SynthesisCancelled: If the user cancelled while audio was being generated.
+        """
+        lean = Config.LEAN_DELIVERY
         try:
-            generating_text = self.locale.get_text(language, "audio.generating")
-            if generating_text == "[audio.generating]":
-                generating_text = (
-                    "🔄 Generating audio..." if language == "en" else "🔄 در حال تولید صوت..."
-                )
-
-            bot_logger.info(f"Starting audio generation for user {user_id}, text length: {len(text)}")
-            progress_msg = await update.message.reply_text(generating_text)
-
-            audio_file_path = self.tts_service.convert_text_to_speech(text, speed)
-
-            sending_text = self.locale.get_text(language, "audio.sending")
-            if sending_text == "[audio.sending]":
-                sending_text = "📤 Sending audio..." if language == "en" else "📤 در حال ارسال صوت..."
-
-            await progress_msg.edit_text(sending_text)
-
-            caption_text = self.locale.get_text(language, "audio.caption", speed=speed, length=len(text))
-            if caption_text == "[audio.caption]":
-                caption_text = f"Speed: {speed}x | Characters: {len(text)}"
-
-            with open(audio_file_path, "rb") as audio_file:
-                await update.message.reply_audio(
-                    audio=audio_file,
-                    title="Text-to-Speech Audio",
-                    performer="SpeechBot",
-                    caption=caption_text,
+            with metrics.timer("delivery.latency"):
+                caption_text = self.locale.get_text(language, "audio.caption", speed=speed, length=len(text))
+                if caption_text == "[audio.caption]":
+                    caption_text = f"Speed: {speed}x | Characters: {len(text)}"
+                reply_markup = self._next_action_keyboard(language) if lean else None
+
+                speech_language = self.tts_service.detect_language(text)
+                sent_from_cache = await self.file_id_cache.reply_cached_audio(
+                    update.message, text, speed, speech_language, caption=caption_text, reply_markup=reply_markup
                 )
-
-            await progress_msg.delete()
-            FileService.delete_file(audio_file_path)
-
-            success_text = self.locale.get_text(language, "audio.success")
-            if success_text == "[audio.success]":
-                success_text = "✅ Audio sent successfully!" if language == "en" else "✅ صوت با موفقیت ارسال شد!"
-
-            await update.message.reply_text(success_text)
+                audio = None
+                if sent_from_cache:
+                    metrics.increment("delivery.api_calls")
+                    bot_logger.info(f"Served cached file_id to user {user_id}, no synthesis or upload")
+                else:
+                    audio = await self._synthesize_and_upload(
+                        update, text, speed, user_id, language, speech_language, caption_text, reply_markup
+                    )
+
+            if not lean:
+                success_text = self.locale.get_text(language, "audio.success")
+                if success_text == "[audio.success]":
+                    success_text = "✅ Audio sent successfully!" if language == "en" else "✅ صوت با موفقیت ارسال شد!"
+                await update.message.reply_text(success_text)
+                metrics.increment("delivery.api_calls")
+
+            metrics.increment("delivery.conversions")
+            await self._record_usage(user_id, text, speed, audio)
             bot_logger.info(
                 f"✅ Audio successfully delivered to user {user_id} (speed: {speed}x, length: {len(text)} chars)"
             )
 
             return True
 
+        except SynthesisCancelled:
+            bot_logger.info(f"Audio generation cancelled by user {user_id}")
+            raise
+
+        except AdmissionRejected:
+            await update.message.reply_text(self.locale.get_text(language, "errors.busy"))
+            return False
+
         except Exception as e:
             bot_logger.error(f"❌ Audio generation failed for user {user_id}: {str(e)[:100]}")
 
-            try:
-                await progress_msg.delete()
-            except Exception:
-                pass
-
             failed_text = self.locale.get_text(language, "audio.failed")
             if failed_text == "[audio.failed]":
                 failed_text = (
@@ -228,10 +315,103 @@ class AudioHandler:
                 )
             await update.message.reply_text(failed_text)
 
-            if "audio_file_path" in locals():
-                try:
-                    FileService.delete_file(audio_file_path)
-                except Exception as cleanup_error:
-                    bot_logger.warning(f"Failed to cleanup audio file: {cleanup_error}")
-
             return False
+
+    async def _synthesize_and_upload(
+        self,
+        update: Update,
+        text: str,
+        speed: float,
+        user_id: int,
+        language: str,
+        speech_language: str,
+        caption_text: str,
+        reply_markup: ReplyKeyboardMarkup = None,
+    ) -> AudioBuffer:
+        """
+        Synthesize audio, upload it and remember its file_id.
+
+        Progress is shown as a chat action in lean delivery mode and as a
+        progress message that is edited and then deleted otherwise.
+
+        Returns:
+            AudioBuffer: The audio that was sent.
+        """
+        bot_logger.info(f"Starting audio generation for user {user_id}, text length: {len(text)}")
+        progress_msg = action_task = None
+        if Config.LEAN_DELIVERY:
+            action_task = asyncio.create_task(self._show_upload_action(update.message))
+        else:
+            generating_text = self.locale.get_text(language, "audio.generating")
+            if generating_text == "[audio.generating]":
+                generating_text = (
+                    "🔄 Generating audio..." if language == "en" else "🔄 در حال تولید صوت..."
+                )
+            progress_msg = await update.message.reply_text(generating_text)
+            metrics.increment("delivery.api_calls")
+
+        try:
+            tier = await self.profile_cache.get_tier(user_id)
+            priority = self.admission.priority(AdmissionController.INTERACTIVE, tier)
+            async with self.admission.admit(priority, user_id):
+                audio = await self.synthesis_pool.submit(
+                    user_id,
+                    self.tts_service.render_buffer,
+                    text,
+                    speed,
+                    key=self.tts_service.synthesis_key(text, speed),
+                )
+
+            if progress_msg is not None:
+                sending_text = self.locale.get_text(language, "audio.sending")
+                if sending_text == "[audio.sending]":
+                    sending_text = "📤 Sending audio..." if language == "en" else "📤 در حال ارسال صوت..."
+                await progress_msg.edit_text(sending_text)
+                metrics.increment("delivery.api_calls")
+
+            sent_message = await update.message.reply_audio(
+                audio=audio.input_file(),
+                duration=audio.duration,
+                title="Text-to-Speech Audio",
+                performer="SpeechBot",
+                caption=caption_text,
+                reply_markup=reply_markup,
+            )
+            metrics.increment("delivery.api_calls")
+            await self.file_id_cache.remember(sent_message, text, speed, speech_language)
+            return audio
+
+        finally:
+            if action_task is not None:
+                action_task.cancel()
+            if progress_msg is not None:
+                try:
+                    await progress_msg.delete()
+                    metrics.increment("delivery.api_calls")
+                except Exception:
+                    pass
+
+    @staticmethod
+    async def _show_upload_action(message):
+        """Keep the upload_voice chat action visible until cancelled; Telegram clears it after 5 seconds."""
+        try:
+            while True:
+                await message.reply_chat_action(ChatAction.UPLOAD_VOICE)
+                metrics.increment("delivery.api_calls")
+                await asyncio.sleep(4)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            bot_logger.debug(f"Chat action failed: {e}")
+
+    @staticmethod
+    def _next_action_keyboard(language: str) -> ReplyKeyboardMarkup:
+        """Continue/Stop keyboard shown after each conversion."""
+        keyboard = [["🔄 ادامه", "🛑 توقف"]] if language == "fa" else [["🔄 Continue", "🛑 Stop"]]
+        return ReplyKeyboardMarkup(keyboard, resize_keyboard=True)
+
+    async def _send_next_action(self, update: Update, language: str):
+        """Ask what to do next with a separate keyboard message (non-lean delivery)."""
+        next_action_text = self.locale.get_text(language, "continuous_mode.next_action")
+        await update.message.reply_text(next_action_text, reply_markup=self._next_action_keyboard(language))
+        metrics.increment("delivery.api_calls")
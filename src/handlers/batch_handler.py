@@ -1,10 +1,20 @@
+from itertools import islice
 from telegram import Update, ReplyKeyboardMarkup
-from telegram.ext import ContextTypes
+from telegram.constants import ChatAction
+from telegram.ext import ContextTypes, ConversationHandler
 from config import Config
 from utils.logger import bot_logger
+from utils.helpers import Helpers
 from services.tts_service import TTSService
-from services.file_service import FileService
+from services.audio_buffer import AudioBuffer
+from services.synthesis_pool import SynthesisPool, SynthesisCancelled
+from services.admission import AdmissionController, AdmissionRejected
+from services.file_id_cache import FileIdCache
+from services.document_reader import DocumentReader, DocumentTooLarge
+from services.db_worker import DatabaseWorker
+from services.usage_ledger import UsageLedger
 from models.user_session import UserSession
+from services.profile_cache import ProfileCache
 from locales import Locale
 
 
@@ -13,12 +23,18 @@ class BatchHandler:
 
     def __init__(self):
         self.tts_service = TTSService()
+        self.synthesis_pool = SynthesisPool.instance()
+        self.admission = AdmissionController.instance()
+        self.file_id_cache = FileIdCache()
         self.user_session = UserSession()
+        self.db_worker = DatabaseWorker.instance()
+        self.usage_ledger = UsageLedger()
+        self.profile_cache = ProfileCache.instance()
         self.locale = Locale()
 
     async def start_batch_mode(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Prompt user to enter multiple texts for batch processing."""
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(update.effective_user.id, context.user_data)
 
         prompt_text = self.locale.get_text(language, "batch.prompt")
         max_size_text = self.locale.get_text(language, "batch.max_size", max_batch=Config.MAX_BATCH_SIZE)
@@ -37,7 +53,7 @@ class BatchHandler:
     async def handle_batch_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Process user input for batch TTS generation."""
         user = update.effective_user
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(user.id, context.user_data)
 
         if update.message.text == "Back":
             from handlers.start_handler import StartHandler
@@ -55,34 +71,63 @@ class BatchHandler:
             return Config.BATCH_MODE
 
         success_count, failed_count = 0, 0
+        priority = self.admission.priority(AdmissionController.BATCH, await self.profile_cache.get_tier(user.id))
 
         for i, text in enumerate(texts, 1):
             if len(text) > Config.MAX_BATCH_TEXT_LENGTH:
                 failed_count += 1
                 continue
 
-            processing_text = self.locale.get_text(language, "batch.processing", current=i, total=len(texts))
-            progress_msg = await update.message.reply_text(processing_text)
+            progress_msg = await self._show_progress(update, language, i, len(texts))
 
             try:
-                audio_file_path = self.tts_service.convert_text_to_speech(text, Config.DEFAULT_SPEED)
-
-                with open(audio_file_path, "rb") as audio_file:
-                    await update.message.reply_audio(
-                        audio=audio_file,
+                speed = Config.DEFAULT_SPEED
+                speech_language = self.tts_service.detect_language(text)
+                caption = f"Text {i}/{len(texts)}"
+                audio = None
+
+                sent_from_cache = await self.file_id_cache.reply_cached_audio(
+                    update.message, text, speed, speech_language, caption=caption
+                )
+                if not sent_from_cache:
+                    async with self.admission.admit(priority, user.id):
+                        audio = await self.synthesis_pool.submit(
+                            user.id,
+                            self.tts_service.render_buffer,
+                            text,
+                            speed,
+                            key=self.tts_service.synthesis_key(text, speed),
+                        )
+
+                    sent_message = await update.message.reply_audio(
+                        audio=audio.input_file(),
+                        duration=audio.duration,
                         title=f"Batch Audio {i}",
                         performer="SpeechBot",
-                        caption=f"Text {i}/{len(texts)}",
+                        caption=caption,
                     )
+                    await self.file_id_cache.remember(sent_message, text, speed, speech_language)
 
-                FileService.delete_file(audio_file_path)
                 success_count += 1
+                await self._record_usage(user.id, text, speed, audio)
+
+            except SynthesisCancelled:
+                bot_logger.info(f"Batch processing cancelled by user {user.id}")
+                await self._delete_progress(progress_msg)
+                return ConversationHandler.END
+
+            except AdmissionRejected:
+                # The remaining items would be shed as well
+                await self._delete_progress(progress_msg)
+                await update.message.reply_text(self.locale.get_text(language, "errors.busy"))
+                failed_count += len(texts) - i + 1
+                break
 
             except Exception as e:
                 bot_logger.error(f"Batch processing failed for text {i}: {e}")
                 failed_count += 1
 
-            await progress_msg.delete()
+            await self._delete_progress(progress_msg)
 
         completed_text = self.locale.get_text(
             language, "batch.completed", success=success_count, failed=failed_count
@@ -92,6 +137,40 @@ class BatchHandler:
         from handlers.start_handler import StartHandler
         return await StartHandler().show_main_menu(update, context, user.id)
 
+    async def _show_progress(self, update: Update, language: str, current: int, total: int):
+        """
+        Show that an item is being processed.
+
+        In lean delivery mode this is an upload_voice chat action, since each
+        item's audio already carries its position in the caption. Otherwise
+        a progress message is sent, and it is returned for deletion.
+        """
+        if Config.LEAN_DELIVERY:
+            try:
+                await update.message.reply_chat_action(ChatAction.UPLOAD_VOICE)
+            except Exception as e:
+                bot_logger.debug(f"Chat action failed: {e}")
+            return None
+        processing_text = self.locale.get_text(language, "batch.processing", current=current, total=total)
+        return await update.message.reply_text(processing_text)
+
+    @staticmethod
+    async def _delete_progress(progress_msg):
+        """Delete a progress message sent by _show_progress, if any."""
+        if progress_msg is not None:
+            await progress_msg.delete()
+
+    async def _record_usage(self, user_id: int, text: str, speed: float, audio: AudioBuffer = None):
+        """Add a delivered text to the usage ledger, with its measured duration if it was synthesized."""
+        if audio is not None and audio.duration:
+            audio_seconds = audio.duration
+        else:
+            audio_seconds = Helpers.estimate_speech_duration(text, speed)
+        try:
+            await self.db_worker.submit(self.usage_ledger.record, user_id, len(text), audio_seconds)
+        except Exception as e:
+            bot_logger.error(f"Failed to record usage for user {user_id}: {e}")
+
     async def _extract_batch_texts(self, update: Update) -> list:
         """Extract texts from message or uploaded file for batch processing."""
         if update.message.text:
@@ -106,21 +185,18 @@ class BatchHandler:
     async def _handle_batch_file_upload(self, update: Update) -> list:
         """Handle uploaded text file for batch TTS."""
         document = update.message.document
-        if document.mime_type == "text/plain" or document.file_name.endswith(".txt"):
+        if DocumentReader.is_text_document(document):
             try:
-                file = await document.get_file()
-                file_path = f"temp_batch_{document.file_id}.txt"
-                await file.download_to_drive(file_path)
-
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                import os
-                os.remove(file_path)
-
-                texts = [text.strip() for text in content.split("\n") if text.strip()]
-                return [text for text in texts if len(text) <= Config.MAX_BATCH_TEXT_LENGTH]
-
+                buffer = await DocumentReader.download(document)
+                texts = (
+                    text for text in DocumentReader.iter_lines(buffer)
+                    if len(text) <= Config.MAX_BATCH_TEXT_LENGTH
+                )
+                # One past the limit is enough for the caller to reject the batch
+                return list(islice(texts, Config.MAX_BATCH_SIZE + 1))
+
+            except DocumentTooLarge as e:
+                bot_logger.warning(f"Rejected batch upload from user {update.effective_user.id}: {e}")
             except Exception as e:
                 bot_logger.error(f"Batch file upload error: {e}")
 
@@ -3,6 +3,8 @@ from telegram.ext import ContextTypes
 from config import Config
 from utils.logger import bot_logger
 from models.user_session import UserSession
+from services.db_worker import DatabaseWorker
+from services.profile_cache import ProfileCache
 
 
 class LanguageHandler:
@@ -10,6 +12,8 @@ class LanguageHandler:
 
     def __init__(self):
         self.user_session = UserSession()
+        self.db_worker = DatabaseWorker.instance()
+        self.profile_cache = ProfileCache.instance()
 
     async def select_language(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Prompt user to select a language."""
@@ -43,7 +47,7 @@ class LanguageHandler:
             await update.message.reply_text("⚠ Please select a valid option.")
             return Config.LANGUAGE_SELECTION
 
-        self.user_session.set_user_language(user_id, language)
+        await self.db_worker.submit(self.profile_cache.set_language, user_id, language)
         context.user_data["language"] = language
 
         await update.message.reply_text(message)
@@ -3,6 +3,11 @@ from telegram.ext import ContextTypes, ConversationHandler
 from config import Config
 from utils.logger import bot_logger
 from models.user_session import UserSession
+from services.synthesis_pool import SynthesisPool
+from services.db_worker import DatabaseWorker
+from services.profile_cache import ProfileCache
+from services.admission import AdmissionController
+from handlers.audio_handler import AudioHandler
 from locales import Locale
 
 
@@ -11,6 +16,8 @@ class StartHandler:
 
     def __init__(self):
         self.user_session = UserSession()
+        self.db_worker = DatabaseWorker.instance()
+        self.profile_cache = ProfileCache.instance()
         self.locale = Locale()
 
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
@@ -49,7 +56,7 @@ class StartHandler:
             await update.message.reply_text("⚠ Please select a valid option.")
             return Config.LANGUAGE_SELECTION
 
-        self.user_session.set_user_language(user_id, language)
+        await self.db_worker.submit(self.profile_cache.set_language, user_id, language)
         context.user_data["language"] = language
 
         await update.message.reply_text(message)
@@ -57,7 +64,7 @@ class StartHandler:
 
     async def show_main_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int) -> int:
         """Display the main menu based on user's language."""
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(user_id, context.user_data)
 
         if language == "fa":
             keyboard = [
@@ -79,7 +86,7 @@ class StartHandler:
     async def handle_main_menu(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Handle main menu button actions."""
         user_input = update.message.text
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(update.effective_user.id, context.user_data)
 
         if language == "fa":
             button_mapping = {
@@ -116,7 +123,7 @@ class StartHandler:
 
     async def help_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
         """Show localized help message to the user."""
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
+        language = await self.profile_cache.get_language(update.effective_user.id, context.user_data)
 
         try:
             help_title = self.locale.get_text(language, "help.title")
@@ -137,7 +144,11 @@ class StartHandler:
             await update.message.reply_text(fallback_text, parse_mode="Markdown")
 
     async def cancel(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-        """Cancel current operation and clear user data."""
+        """Cancel current operation, stop pending synthesis and clear user data."""
+        user_id = update.effective_user.id
+        AudioHandler._cancel_prerender(context)
+        SynthesisPool.instance().cancel_user(user_id)
+        AdmissionController.instance().cancel_user(user_id)
         context.user_data.clear()
         await update.message.reply_text(
             "Operation cancelled. Use /start to begin again.",
@@ -1,40 +1,54 @@
+import asyncio
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes
 from config import Config
 from utils.logger import bot_logger
 from utils.validators import TextValidator
+from utils.metrics import metrics
 from models.user_session import UserSession
+from services.tts_service import TTSService
+from services.quota_service import QuotaService
+from services.db_worker import DatabaseWorker
+from services.synthesis_pool import SynthesisPool
+from services.admission import AdmissionController
+from services.file_id_cache import FileIdCache
+from services.document_reader import DocumentReader, DocumentTooLarge
+from services.profile_cache import ProfileCache
 from locales import Locale
-import os
 
 
 class TextHandler:
     """Handles user text input, validation, and TTS preparation."""
 
+    SPEED_OPTIONS = (0.5, 1.0, 1.5, 2.0)  # speeds offered on the speed keyboard
+
     def __init__(self):
         self.validator = TextValidator()
+        self.tts_service = TTSService()
+        self.synthesis_pool = SynthesisPool.instance()
+        self.admission = AdmissionController.instance()
         self.user_session = UserSession()
+        self.quota_service = QuotaService()
+        self.db_worker = DatabaseWorker.instance()
+        self.profile_cache = ProfileCache.instance()
+        self.file_id_cache = FileIdCache()
         self.locale = Locale()
 
     async def handle_text_input(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
         """Validate user text input and prompt for TTS speed."""
         user = update.effective_user
-        language = context.user_data.get("language", Config.DEFAULT_LANGUAGE)
-
-        # Check quota
-        remaining = self.user_session.get_remaining_quota(user.id)
-        if remaining <= 0:
-            quota_text = self.locale.get_text(
-                language, "quota.exceeded",
-                used=self.user_session.get_daily_usage(user.id),
-                total=Config.DAILY_QUOTA_FREE
-            )
-            await update.message.reply_text(quota_text)
-            from handlers.start_handler import StartHandler
-            return await StartHandler().show_main_menu(update, context, user.id)
+        language = await self.profile_cache.get_language(user.id, context.user_data)
 
         # Extract text
-        text = await self._extract_text(update)
+        try:
+            text = await self._extract_text(update)
+        except DocumentTooLarge:
+            error_text = self.locale.get_text(
+                language, "text_input.too_long",
+                current=f">{Config.MAX_TEXT_LENGTH}", max=Config.MAX_TEXT_LENGTH
+            )
+            await update.message.reply_text(error_text)
+            return Config.AWAITING_TEXT
         if not text:
             error_text = self.locale.get_text(language, "text_input.invalid")
             await update.message.reply_text(error_text)
@@ -86,9 +100,23 @@ class TextHandler:
             await update.message.reply_text(error_msg)
             return Config.AWAITING_TEXT
 
+        # Charge quota; refunded by AudioHandler if synthesis fails
+        if not await self.db_worker.submit(self.quota_service.reserve, user.id):
+            status = await self.db_worker.submit(self.quota_service.get_quota_status, user.id)
+            quota_text = self.locale.get_text(
+                language, "quota.exceeded",
+                used=status["used"],
+                total=status["total"]
+            )
+            await update.message.reply_text(quota_text)
+            from handlers.start_handler import StartHandler
+            return await StartHandler().show_main_menu(update, context, user.id)
+
         # Store text and prompt for speed
         context.user_data["text_to_process"] = text
-        self.user_session.increment_usage(user.id)
+
+        if Config.SPECULATIVE_RENDERING:
+            self._start_speculative_render(context, user.id, text)
 
         received_text = self.locale.get_text(language, "text_input.received", char_count=len(text))
         choose_speed = self.locale.get_text(language, "text_input.choose_speed")
@@ -104,6 +132,44 @@ class TextHandler:
 
         return Config.AWAITING_SPEED
 
+    def _start_speculative_render(self, context: ContextTypes.DEFAULT_TYPE, user_id: int, text: str):
+        """Start the base synthesis while the user is choosing a speed."""
+        admitted = asyncio.Event()
+        task = asyncio.create_task(self._speculative_render(user_id, text, admitted))
+        task.add_done_callback(self._on_speculative_render_done)
+        context.user_data["prerender_task"] = task
+        context.user_data["prerender_admitted"] = admitted
+        metrics.increment("prerender.started")
+
+    async def _speculative_render(self, user_id: int, text: str, admitted: asyncio.Event = None):
+        """
+        Run the base synthesis in the speculative lane, behind all requested work.
+
+        Texts already uploaded at one of the offered speeds are skipped; a
+        repeat is most likely answered from the file_id cache.
+
+        Args:
+            user_id (int): Telegram user ID.
+            text (str): Text to render.
+            admitted (asyncio.Event): Set once the render holds a synthesis slot.
+        """
+        speech_language = self.tts_service.detect_language(text)
+        if await self.db_worker.submit(self.file_id_cache.contains_any, text, self.SPEED_OPTIONS, speech_language):
+            metrics.increment("prerender.skipped")
+            return
+
+        tier = await self.profile_cache.get_tier(user_id)
+        async with self.admission.admit(self.admission.priority(AdmissionController.SPECULATIVE, tier), user_id):
+            if admitted is not None:
+                admitted.set()
+            await self.synthesis_pool.submit(user_id, self.tts_service.prerender, text)
+
+    @staticmethod
+    def _on_speculative_render_done(task: asyncio.Task):
+        """Log failed speculative renders; the speed handler will retry normally."""
+        if not task.cancelled() and task.exception() is not None:
+            bot_logger.debug(f"Speculative render failed: {task.exception()}")
+
     def _is_mostly_english(self, text: str) -> bool:
         """Check if the majority of alphabetic characters are English letters."""
         if not text:
@@ -116,7 +182,12 @@ class TextHandler:
         return (english_chars / total_alpha) >= 0.8
 
     async def _extract_text(self, update: Update) -> str:
-        """Extract text from message, document, or caption."""
+        """
+        Extract text from message, document, or caption.
+
+        Raises:
+            DocumentTooLarge: If an uploaded document is too large to hold an acceptable text.
+        """
         if update.message.text and not update.message.text.startswith("/"):
             return update.message.text.strip()
         elif update.message.document:
@@ -126,19 +197,23 @@ class TextHandler:
         return ""
 
     async def _handle_file_upload(self, update: Update) -> str:
-        """Handle plain text file uploads and return content."""
+        """
+        Handle plain text file uploads and return content.
+
+        Raises:
+            DocumentTooLarge: If the document could not fit within Config.MAX_TEXT_LENGTH characters.
+        """
         document = update.message.document
-        if document.mime_type == "text/plain" or document.file_name.endswith(".txt"):
+        if DocumentReader.is_text_document(document):
+            # UTF-8 needs at most 4 bytes per character, so larger files are always too long
+            max_bytes = min(Config.MAX_UPLOAD_BYTES, Config.MAX_TEXT_LENGTH * 4)
             try:
-                file = await document.get_file()
-                file_path = f"temp_{document.file_id}.txt"
-                await file.download_to_drive(file_path)
-
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read().strip()
-                os.remove(file_path)
-                return content
+                buffer = await DocumentReader.download(document, max_bytes)
+                return DocumentReader.read_text(buffer).strip()
 
+            except DocumentTooLarge as e:
+                bot_logger.warning(f"Rejected upload from user {update.effective_user.id}: {e}")
+                raise
             except Exception as e:
                 bot_logger.error(f"File upload error: {e}")
 
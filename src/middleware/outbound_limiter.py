@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import time
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+from config import Config
+from utils.logger import bot_logger
+from utils.metrics import metrics
+
+
+class TokenBucket:
+    """
+    Token bucket kept as a single theoretical arrival time.
+
+    reserve() books the next free slot and returns how long the caller
+    must wait for it, so concurrent callers queue in arrival order
+    without a lock or a background task.
+    """
+
+    __slots__ = ("interval", "tolerance", "tat")
+
+    def __init__(self, rate: float, burst: int):
+        self.interval = 1.0 / rate
+        self.tolerance = (max(burst, 1) - 1) * self.interval
+        self.tat = 0.0
+
+    def reserve(self, now: float) -> float:
+        """Book one token and return the seconds until it may be used."""
+        tat = max(self.tat, now)
+        self.tat = tat + self.interval
+        return max(tat - self.tolerance - now, 0.0)
+
+    def hold_until(self, moment: float):
+        """Hand out no token before moment."""
+        self.tat = max(self.tat, moment + self.tolerance)
+
+    def idle(self, now: float) -> bool:
+        """True once the bucket is full again and carries no state worth keeping."""
+        return self.tat + self.interval <= now
+
+
+class OutboundRateLimiter(BaseRateLimiter):
+    """
+    Shapes outgoing Bot API calls to stay under Telegram's flood limits.
+
+    Every call waits for a token from its chat's bucket and then from the
+    global bucket. Private chats get Config.OUTBOUND_CHAT_RATE calls per
+    second and groups get Config.OUTBOUND_GROUP_RATE. The whole bot gets
+    Config.OUTBOUND_GLOBAL_RATE. On RetryAfter, both buckets are held for
+    the requested time and the call is retried, up to
+    Config.OUTBOUND_MAX_RETRIES times.
+
+    A message edit that is still waiting when a newer edit or a delete of
+    the same message arrives is dropped and reported as successful. Only
+    the latest progress text is ever sent.
+    """
+
+    EDIT_ENDPOINTS = ("editMessageText", "editMessageCaption", "editMessageReplyMarkup")
+
+    def __init__(self):
+        self._global = TokenBucket(Config.OUTBOUND_GLOBAL_RATE, Config.OUTBOUND_GLOBAL_RATE)
+        self._chats = {}  # chat_id -> TokenBucket
+        self._latest_edits = {}  # (chat_id, message_id) -> token of the newest pending edit
+        self._last_sweep = 0.0
+
+    async def initialize(self) -> None:
+        """Nothing to set up; buckets are created on demand."""
+
+    async def shutdown(self) -> None:
+        """Forget all bucket state."""
+        self._chats.clear()
+        self._latest_edits.clear()
+
+    async def process_request(self, callback, args, kwargs, endpoint, data, rate_limit_args):
+        """
+        Send a request once the chat and global buckets allow it.
+
+        Args:
+            rate_limit_args (int | None): Maximum RetryAfter retries for this call.
+                Defaults to Config.OUTBOUND_MAX_RETRIES.
+        """
+        chat_id = data.get("chat_id")
+        with contextlib.suppress(ValueError, TypeError):
+            chat_id = int(chat_id)
+        max_retries = Config.OUTBOUND_MAX_RETRIES if rate_limit_args is None else rate_limit_args
+
+        edit_key = token = None
+        if chat_id is not None and data.get("message_id") is not None:
+            edit_key = (chat_id, data["message_id"])
+            token = object()
+            self._latest_edits[edit_key] = token
+
+        try:
+            for attempt in range(max_retries + 1):
+                await self._wait_for_slot(chat_id)
+                if endpoint in self.EDIT_ENDPOINTS and self._latest_edits.get(edit_key) is not token:
+                    metrics.increment("outbound.coalesced")
+                    return True
+
+                metrics.increment("outbound.calls")
+                try:
+                    return await callback(*args, **kwargs)
+                except RetryAfter as e:
+                    metrics.increment("outbound.retry_after")
+                    if attempt == max_retries:
+                        bot_logger.error(f"Telegram flood limit persisted after {max_retries} retries ({endpoint})")
+                        raise
+                    bot_logger.warning(f"Telegram asked to retry {endpoint} after {e.retry_after}s")
+                    resume = time.monotonic() + e.retry_after
+                    self._global.hold_until(resume)
+                    if chat_id is not None:
+                        self._chat_bucket(chat_id).hold_until(resume)
+        finally:
+            if edit_key is not None and self._latest_edits.get(edit_key) is token:
+                del self._latest_edits[edit_key]
+
+    async def _wait_for_slot(self, chat_id):
+        """Wait for the chat's bucket, then for the global one."""
+        now = time.monotonic()
+        if now - self._last_sweep >= Config.RATE_LIMIT_SWEEP_INTERVAL:
+            self._chats = {chat: bucket for chat, bucket in self._chats.items() if not bucket.idle(now)}
+            self._last_sweep = now
+
+        delay = self._chat_bucket(chat_id).reserve(now) if chat_id is not None else 0.0
+        if delay:
+            metrics.observe("outbound.chat_wait", delay)
+            await self._wait(delay)
+
+        delay = self._global.reserve(time.monotonic())
+        if delay:
+            metrics.observe("outbound.global_wait", delay)
+            await self._wait(delay)
+
+    def _chat_bucket(self, chat_id) -> TokenBucket:
+        """Return the bucket of a chat; negative and string ids are groups and channels."""
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            if is_group:
+                bucket = TokenBucket(Config.OUTBOUND_GROUP_RATE, 1)
+            else:
+                bucket = TokenBucket(Config.OUTBOUND_CHAT_RATE, Config.OUTBOUND_CHAT_BURST)
+            self._chats[chat_id] = bucket
+        return bucket
+
+    @staticmethod
+    async def _wait(seconds: float):
+        """Sleep on the event loop; separate so tests can observe delays."""
+        await asyncio.sleep(seconds)
@@ -1,43 +1,66 @@
+import asyncio
 import time
 from telegram import Update
 from telegram.ext import ContextTypes
+from config import Config
+from services.storage import StorageBackend, LocalRateLimits
 from utils.logger import bot_logger
 
 
 class RateLimiter:
-    """Simple per-user rate limiter using a 1-minute sliding window."""
+    """
+    Per-user GCRA rate limiter allowing Config.RATE_LIMIT_PER_MINUTE units per minute.
 
-    def __init__(self):
-        self.user_requests = {}
+    Requests are weighted by text length, so a long message uses more of
+    the budget than a short one. State lives in the storage backend.
 
-    async def check_rate_limit(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    A shared backend (Redis) is a network round trip, so it is preceded
+    by an in-process limit with the same budget. This worker only sees a
+    share of a user's requests, so anything the local limit rejects, the
+    shared one would reject too. Rejections are answered on the event
+    loop, and only requests that pass locally are checked remotely, in a
+    worker thread.
+    """
+
+    WINDOW_SECONDS = 60
+
+    def __init__(self, storage: StorageBackend = None):
+        self.storage = storage or StorageBackend.instance()
+        self.local = LocalRateLimits() if self.storage.SHARED else None
+
+    @staticmethod
+    def request_cost(update: Update) -> int:
+        """Return the units a message costs: one, plus one per further Config.RATE_LIMIT_CHARS_PER_UNIT characters."""
+        message = update.effective_message
+        text = getattr(message, "text", None) or getattr(message, "caption", None) or ""
+        cost = 1 + max(len(text) - 1, 0) // Config.RATE_LIMIT_CHARS_PER_UNIT
+        return min(cost, Config.RATE_LIMIT_PER_MINUTE)
+
+    async def check_rate_limit(self, update: Update, context: ContextTypes.DEFAULT_TYPE, cost: int = None) -> bool:
         """
         Check if the user has exceeded the allowed request rate.
 
         Args:
             update (Update): Telegram update object.
             context (ContextTypes.DEFAULT_TYPE): Telegram context object.
+            cost (int): Units to charge. Defaults to request_cost(update).
 
         Returns:
             bool: True if under the rate limit, False if exceeded.
         """
         user_id = update.effective_user.id
-        current_time = time.time()
+        key = f"user:{user_id}"
+        limit, window = Config.RATE_LIMIT_PER_MINUTE, self.WINDOW_SECONDS
+        cost = self.request_cost(update) if cost is None else cost
 
-        if user_id not in self.user_requests:
-            self.user_requests[user_id] = []
-
-        # Remove requests older than 60 seconds
-        self.user_requests[user_id] = [
-            req_time for req_time in self.user_requests[user_id]
-            if current_time - req_time < 60
-        ]
-
-        # Check against limit (consider using Config.RATE_LIMIT_PER_MINUTE)
-        if len(self.user_requests[user_id]) >= 20:
+        if self.local is None:
+            allowed = self.storage.allow_request(key, limit, window, time.time(), cost)
+        elif not self.local.allow_request(key, limit, window, time.time(), cost):
+            allowed = False
+        else:
+            allowed = await asyncio.to_thread(self.storage.allow_request, key, limit, window, time.time(), cost)
+            if not allowed:
+                self.local.refund(key, limit, window, cost)
+        if not allowed:
             bot_logger.warning(f"Rate limit exceeded for user {user_id}")
-            return False
-
-        # Record current request
-        self.user_requests[user_id].append(current_time)
-        return True
+        return allowed
@@ -1,7 +1,8 @@
 """Security middleware for Telegram bot."""
-import re
 from telegram import Update
 from telegram.ext import ContextTypes
+from middleware.rate_limiter import RateLimiter
+from utils.sanitizer import Sanitizer
 
 
 class SecurityMiddleware:
@@ -20,19 +21,7 @@ class SecurityMiddleware:
         """
         if not text:
             return text
-
-        # Remove HTML/JS tags
-        sanitized = re.sub(r'<[^>]*>', '', text)
-
-        # Remove suspicious patterns
-        suspicious_patterns = [
-            r'javascript:', r'vbscript:', r'on\w+=',
-            r'data:', r'alert\(', r'eval\(', r'expression\('
-        ]
-        for pattern in suspicious_patterns:
-            sanitized = re.sub(pattern, '', sanitized, flags=re.IGNORECASE)
-
-        return sanitized.strip()
+        return Sanitizer.scan(text).text
 
     @staticmethod
     def validate_filename(filename: str) -> bool:
@@ -52,34 +41,48 @@ class SecurityMiddleware:
         if not any(filename.lower().endswith(ext) for ext in allowed_extensions):
             return False
 
+        return SecurityMiddleware._is_safe_name(filename)
+
+    @staticmethod
+    def _is_safe_name(filename: str) -> bool:
+        """True if a filename has no path components and a sane length."""
         if '..' in filename or '/' in filename or '\\' in filename:
             return False
-
         return len(filename) <= 255
 
     @staticmethod
-    async def check_rate_limit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+    def validate_update(update: Update) -> str | None:
         """
-        Basic per-user rate limiting.
+        Check that an update is one the bot should act on.
 
         Args:
             update (Update): Telegram update object.
-            context (ContextTypes.DEFAULT_TYPE): Telegram context object.
 
         Returns:
-            bool: True if under limit, False if exceeded.
+            str | None: Why the update must be dropped, or None if it is acceptable.
         """
-        user_id = update.effective_user.id
-
-        if 'request_count' not in context.user_data:
-            context.user_data['request_count'] = 0
-            context.user_data['request_time'] = update.message.date.timestamp()
+        user = update.effective_user
+        if user is None or getattr(user, "is_bot", False):
+            return "no_user"
+        if update.effective_message is None or getattr(update, "edited_message", None) is not None:
+            return "unsupported"
+
+        document = getattr(update.effective_message, "document", None)
+        file_name = getattr(document, "file_name", None)
+        if file_name and not SecurityMiddleware._is_safe_name(file_name):
+            return "unsafe_filename"
+        return None
 
-        current_time = update.message.date.timestamp()
-        if current_time - context.user_data['request_time'] > 60:
-            context.user_data['request_count'] = 0
-            context.user_data['request_time'] = current_time
+    @staticmethod
+    async def check_rate_limit(update: Update, context: ContextTypes.DEFAULT_TYPE) -> bool:
+        """
+        Per-user rate limiting, shared with the dispatch gate.
 
-        context.user_data['request_count'] += 1
+        Args:
+            update (Update): Telegram update object.
+            context (ContextTypes.DEFAULT_TYPE): Telegram context object.
 
-        return context.user_data['request_count'] <= 20
+        Returns:
+            bool: True if under limit, False if exceeded.
+        """
+        return await RateLimiter().check_rate_limit(update, context)
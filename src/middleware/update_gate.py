@@ -0,0 +1,77 @@
+import time
+from telegram import Update
+from telegram.ext import ApplicationHandlerStop, ContextTypes
+from middleware.rate_limiter import RateLimiter
+from middleware.security import SecurityMiddleware
+from locales import Locale
+from utils.logger import bot_logger
+from utils.metrics import metrics
+
+
+class UpdateGate:
+    """
+    Pre-handler stage that sheds unwanted updates before any handler runs.
+
+    check() is registered as a TypeHandler in group -1. It drops updates
+    the bot must not act on, then applies the per-user rate limit. Both
+    checks are O(1) and touch neither SQLite nor TTS; with a shared
+    backend, the remote rate check runs off the event loop (see
+    RateLimiter). A rejected update
+    stops dispatch with ApplicationHandlerStop. finish() runs in group 1,
+    after the conversation handlers, and records how long they took.
+    Together the two give per-stage timings for shed and served updates.
+    """
+
+    NOTICE_INTERVAL = 60  # seconds between "slow down" replies to one user
+
+    def __init__(self, rate_limiter: RateLimiter = None):
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.locale = Locale()
+
+    async def check(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """
+        Validate and rate-limit an update.
+
+        Raises:
+            ApplicationHandlerStop: If the update is rejected.
+        """
+        started = time.perf_counter()
+        reason = SecurityMiddleware.validate_update(update)
+        validated = time.perf_counter()
+        metrics.observe("gate.validate_time", validated - started)
+        if reason is not None:
+            self._reject(reason)
+
+        allowed = await self.rate_limiter.check_rate_limit(update, context)
+        limited = time.perf_counter()
+        metrics.observe("gate.rate_limit_time", limited - validated)
+        if not allowed:
+            await self._notify_rate_limited(update, context)
+            self._reject("rate_limited")
+
+        metrics.increment("gate.passed")
+        context.gate_passed_at = limited
+
+    async def finish(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Record the time handlers spent on an update that passed the gate."""
+        passed_at = getattr(context, "gate_passed_at", None)
+        if passed_at is not None:
+            metrics.observe("pipeline.handler_time", time.perf_counter() - passed_at)
+
+    async def _notify_rate_limited(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
+        """Tell a user to slow down, at most once per NOTICE_INTERVAL so the reply is no flood itself."""
+        now = time.monotonic()
+        if now - context.user_data.get("rate_limit_notice", float("-inf")) < self.NOTICE_INTERVAL:
+            return
+        context.user_data["rate_limit_notice"] = now
+        language = context.user_data.get("language", "en")
+        try:
+            await update.effective_message.reply_text(self.locale.get_text(language, "errors.rate_limit"))
+        except Exception as e:
+            bot_logger.debug(f"Rate limit notice failed: {e}")
+
+    @staticmethod
+    def _reject(reason: str):
+        """Count a shed update and stop dispatch."""
+        metrics.increment(f"gate.rejected.{reason}")
+        raise ApplicationHandlerStop
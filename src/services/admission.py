@@ -0,0 +1,180 @@
+"""Global admission control with priority lanes for synthesis work."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager
+from config import Config
+from utils.logger import bot_logger
+from utils.metrics import metrics
+from services.synthesis_pool import SynthesisCancelled
+
+
+class AdmissionRejected(Exception):
+    """Raised when synthesis is shed because the bot is overloaded."""
+
+
+class AdmissionController:
+    """
+    Limits how much synthesis runs at once across all users.
+
+    Up to Config.ADMISSION_MAX_CONCURRENT requests hold a slot at a time.
+    Up to Config.ADMISSION_QUEUE_SIZE more wait for one, served by lane:
+    interactive requests, then batch items, then speculative renders, and
+    premium users before free users within each lane. When the queue is full, the request
+    with the lowest priority is rejected at once. A waiter that would
+    wait longer than Config.ADMISSION_MAX_WAIT seconds is rejected too.
+    """
+
+    INTERACTIVE = 0
+    BATCH = 1
+    SPECULATIVE = 2
+
+    _instance = None
+
+    def __init__(self, max_concurrent: int = None, max_queue: int = None, max_wait: float = None):
+        self.max_concurrent = max_concurrent or Config.ADMISSION_MAX_CONCURRENT
+        self.max_queue = Config.ADMISSION_QUEUE_SIZE if max_queue is None else max_queue
+        self.max_wait = max_wait or Config.ADMISSION_MAX_WAIT
+        self._active = 0
+        self._waiting = []  # heap of (priority, sequence, future)
+        self._user_waiters = {}  # user_id -> futures of that user's waiting requests
+        self._sequence = itertools.count()
+
+    @classmethod
+    def instance(cls) -> "AdmissionController":
+        """Return the process-wide admission controller, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def active(self) -> int:
+        """Number of requests holding a slot."""
+        return self._active
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a slot."""
+        return sum(1 for _, _, future in self._waiting if not future.done())
+
+    @classmethod
+    def priority(cls, lane: int, tier: str) -> int:
+        """Return the scheduling priority of a request; lower runs first."""
+        return lane * 2 + (0 if tier == Config.PREMIUM else 1)
+
+    @asynccontextmanager
+    async def admit(self, priority: int, user_id: int = None):
+        """
+        Hold a synthesis slot for the duration of the block.
+
+        Args:
+            priority (int): Value from priority(); lower is served first.
+            user_id (int): Telegram user ID owning the request, so cancel_user() can reach it while it waits.
+
+        Raises:
+            AdmissionRejected: If the request was shed instead of admitted.
+            SynthesisCancelled: If the user cancelled while the request was waiting.
+        """
+        await self._acquire(priority, user_id)
+        try:
+            yield
+        finally:
+            self._release()
+
+    async def _acquire(self, priority: int, user_id: int = None):
+        """Take a slot, waiting in the queue if none is free."""
+        if self._active < self.max_concurrent and not self.queue_depth:
+            self._active += 1
+            self._report()
+            metrics.increment("admission.admitted")
+            metrics.observe("admission.wait_time", 0.0)
+            return
+
+        if self.queue_depth >= self.max_queue and not self._shed_lowest(priority):
+            self._reject("queue full")
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), future))
+        if user_id is not None:
+            self._user_waiters.setdefault(user_id, set()).add(future)
+        self._report()
+        started = time.monotonic()
+        try:
+            # The slot is handed over by _release, which counts it as active
+            await asyncio.wait_for(asyncio.shield(future), self.max_wait)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release()  # a slot arrived just as the wait ran out
+            future.cancel()
+            self._reject("waited too long")
+        except BaseException:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                self._release()  # admitted just as the caller went away
+            future.cancel()
+            raise
+        finally:
+            if user_id is not None:
+                waiters = self._user_waiters.get(user_id, set())
+                waiters.discard(future)
+                if not waiters:
+                    self._user_waiters.pop(user_id, None)
+            self._report()
+        metrics.increment("admission.admitted")
+        metrics.observe("admission.wait_time", time.monotonic() - started)
+
+    def _release(self):
+        """Give a slot back, handing it to the highest-priority waiter."""
+        while self._waiting:
+            _, _, future = heapq.heappop(self._waiting)
+            if not future.done():
+                future.set_result(None)
+                self._report()
+                return
+        self._active -= 1
+        self._report()
+
+    def cancel_user(self, user_id: int) -> int:
+        """
+        Cancel all requests of a user still waiting for a slot.
+
+        Returns:
+            int: Number of requests cancelled.
+        """
+        cancelled = 0
+        for future in list(self._user_waiters.get(user_id, ())):
+            if not future.done():
+                future.set_exception(SynthesisCancelled(f"Admission wait cancelled by user {user_id}"))
+                cancelled += 1
+        if cancelled:
+            metrics.increment("admission.cancelled", cancelled)
+            bot_logger.info(f"Cancelled {cancelled} waiting request(s) for user {user_id}")
+            self._report()
+        return cancelled
+
+    def _shed_lowest(self, priority: int) -> bool:
+        """Reject the lowest-priority waiter to make room for a more urgent request."""
+        live = [entry for entry in self._waiting if not entry[2].done()]
+        if not live:
+            return False
+        worst = max(live, key=lambda entry: (entry[0], entry[1]))
+        if worst[0] <= priority:
+            return False
+        worst[2].set_exception(AdmissionRejected("Shed for a higher-priority request"))
+        metrics.increment("admission.shed")
+        self._waiting = live
+        self._waiting.remove(worst)
+        heapq.heapify(self._waiting)
+        return True
+
+    def _reject(self, reason: str):
+        """Count and raise a rejection."""
+        metrics.increment("admission.shed")
+        bot_logger.warning(f"Synthesis request shed: {reason} ({self._active} active, {self.queue_depth} queued)")
+        raise AdmissionRejected(reason)
+
+    def _report(self):
+        """Export slot usage and queue depth."""
+        metrics.set_gauge("admission.active", self._active)
+        metrics.set_gauge("admission.queue_depth", self.queue_depth)
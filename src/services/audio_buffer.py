@@ -0,0 +1,53 @@
+"""In-memory container for synthesized audio on its way to Telegram."""
+
+import weakref
+from pathlib import Path
+from telegram import InputFile
+from config import Config
+from services.file_service import FileService
+
+
+class AudioBuffer:
+    """
+    Synthesized MP3 audio plus the metadata needed to upload it.
+
+    Audio stays in memory and is uploaded straight from the buffer.
+    Payloads larger than Config.AUDIO_SPILL_BYTES are spilled to a temp
+    file instead; the file is deleted once the buffer is released.
+    """
+
+    def __init__(self, data: bytes, duration: int = None):
+        """
+        Args:
+            data (bytes): MP3 audio content.
+            duration (int): Playback length in whole seconds, or None to let Telegram work it out.
+        """
+        self.size = len(data)
+        self.duration = duration
+        self.filename = FileService.generate_filename()
+        self.path = None
+        self._data = data
+
+        if self.size > Config.AUDIO_SPILL_BYTES:
+            self.path = FileService.save_audio_file(data, self.filename)
+            self._data = None
+            weakref.finalize(self, FileService.delete_file, self.path)
+
+    @property
+    def spilled(self) -> bool:
+        """Whether the audio was written to disk rather than kept in memory."""
+        return self.path is not None
+
+    @property
+    def data(self) -> bytes:
+        """The audio content, read back from disk if it was spilled."""
+        if self._data is not None:
+            return self._data
+        with open(self.path, 'rb') as f:
+            return f.read()
+
+    def input_file(self) -> InputFile | Path:
+        """Return the audio in a form reply_audio accepts, without copying in-memory data."""
+        if self.spilled:
+            return Path(self.path)
+        return InputFile(self._data, filename=self.filename)
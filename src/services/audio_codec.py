@@ -0,0 +1,123 @@
+"""In-memory audio decoding and encoding through ffmpeg pipes."""
+
+import subprocess
+from config import Config
+
+
+class AudioCodecError(Exception):
+    """Raised when ffmpeg fails to decode or encode audio."""
+
+
+class AudioCodec:
+    """Pipes audio through ffmpeg over stdin/stdout without touching the filesystem."""
+
+    SAMPLE_WIDTH = 2  # 16-bit PCM
+    CHANNELS = 1
+
+    # MPEG audio Layer III header tables, indexed by the header's version bits (0 = 2.5, 2 = 2, 3 = 1)
+    MP3_BITRATES = {
+        3: (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+        2: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+        0: (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    }
+    MP3_SAMPLE_RATES = {3: (44100, 48000, 32000), 2: (22050, 24000, 16000), 0: (11025, 12000, 8000)}
+
+    @staticmethod
+    def decode_mp3(audio_data: bytes, frame_rate: int = None) -> bytes:
+        """
+        Decode MP3 bytes to raw PCM.
+
+        Args:
+            audio_data (bytes): MP3 audio content.
+            frame_rate (int): Output sample rate. Defaults to Config.AUDIO_SAMPLE_RATE.
+
+        Returns:
+            bytes: Signed 16-bit little-endian mono PCM.
+        """
+        frame_rate = frame_rate or Config.AUDIO_SAMPLE_RATE
+        return AudioCodec._run(
+            ["-f", "mp3", "-i", "pipe:0",
+             "-f", "s16le", "-acodec", "pcm_s16le",
+             "-ac", str(AudioCodec.CHANNELS), "-ar", str(frame_rate), "pipe:1"],
+            audio_data,
+        )
+
+    @staticmethod
+    def encode_mp3(pcm_data: bytes, frame_rate: int = None, bitrate: str = "64k") -> bytes:
+        """
+        Encode raw PCM to MP3 bytes.
+
+        Args:
+            pcm_data (bytes): Signed 16-bit little-endian mono PCM.
+            frame_rate (int): Sample rate of the PCM. Defaults to Config.AUDIO_SAMPLE_RATE.
+            bitrate (str): Target MP3 bitrate.
+
+        Returns:
+            bytes: MP3 audio content.
+        """
+        frame_rate = frame_rate or Config.AUDIO_SAMPLE_RATE
+        return AudioCodec._run(
+            ["-f", "s16le", "-ac", str(AudioCodec.CHANNELS), "-ar", str(frame_rate), "-i", "pipe:0",
+             "-f", "mp3", "-b:a", bitrate, "pipe:1"],
+            pcm_data,
+        )
+
+    @classmethod
+    def mp3_duration(cls, audio_data: bytes) -> float | None:
+        """
+        Measure the playback length of MP3 audio by walking its frame headers.
+
+        Works on concatenated chunks and skips ID3v2 tags and stray bytes
+        between frames. No decoding is needed, so it costs a fraction of a
+        millisecond per minute of audio.
+
+        Args:
+            audio_data (bytes): MP3 audio content.
+
+        Returns:
+            float | None: Duration in seconds, or None if no MP3 frame was found.
+        """
+        samples = 0.0
+        position, end = 0, len(audio_data) - 4
+        while position <= end:
+            if audio_data[position:position + 3] == b"ID3" and position + 10 <= len(audio_data):
+                size = audio_data[position + 6:position + 10]
+                position += 10 + ((size[0] << 21) | (size[1] << 14) | (size[2] << 7) | size[3])
+                continue
+
+            b1, b2 = audio_data[position + 1], audio_data[position + 2]
+            version, layer = (b1 >> 3) & 0x3, (b1 >> 1) & 0x3
+            bitrate_index, rate_index = b2 >> 4, (b2 >> 2) & 0x3
+            if (audio_data[position] != 0xFF or b1 & 0xE0 != 0xE0 or version == 1 or layer != 1
+                    or bitrate_index in (0, 15) or rate_index == 3):
+                position += 1
+                continue
+
+            sample_rate = cls.MP3_SAMPLE_RATES[version][rate_index]
+            frame_samples = 1152 if version == 3 else 576
+            bitrate = cls.MP3_BITRATES[version][bitrate_index] * 1000
+            samples += frame_samples / sample_rate
+            position += frame_samples // 8 * bitrate // sample_rate + ((b2 >> 1) & 0x1)
+
+        return samples or None
+
+    @staticmethod
+    def _run(args: list, input_data: bytes) -> bytes:
+        """Run ffmpeg with the given arguments, feeding input_data on stdin."""
+        command = [Config.FFMPEG_BINARY, "-hide_banner", "-loglevel", "error", *args]
+        try:
+            result = subprocess.run(
+                command,
+                input=input_data,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        except OSError as e:
+            raise AudioCodecError(f"Failed to start ffmpeg: {e}")
+
+        if result.returncode != 0:
+            error = result.stderr.decode("utf-8", errors="replace").strip()
+            raise AudioCodecError(f"ffmpeg exited with {result.returncode}: {error[:200]}")
+
+        return result.stdout
@@ -1,23 +1,249 @@
 """Cache service for audio files."""
 import os
+import time
+import sqlite3
 import hashlib
-from datetime import datetime, timedelta
+import threading
 from config import Config
 from utils.logger import bot_logger
+from utils.lru_cache import LRUCache
+from utils.metrics import metrics
+
+
+class DiskCacheIndex:
+    """
+    SQLite index of on-disk cache entries (size, creation, last access, hits).
+
+    Lookups go through the primary key and eviction walks an index on
+    the eviction order, so neither needs to list or stat the cache
+    directory. One index is shared per cache directory.
+
+    Hits served from the memory tier are recorded with touch_later() and
+    written in one batch every Config.AUDIO_CACHE_TOUCH_BATCH hits, and
+    always before eviction reads the order.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    # Eviction order per policy; each is backed by an index
+    EVICTION_ORDER = {
+        'lru': "last_access",
+        'lfu': "hits, last_access",
+    }
+
+    def __init__(self, cache_dir: str):
+        self.conn = sqlite3.connect(os.path.join(cache_dir, 'index.db'), check_same_thread=False)
+        self.lock = threading.Lock()
+        self._pending_touches = {}  # cache_key -> [hits, last access]
+        self._create_tables()
+        self.total_bytes = self.conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()[0]
+
+    @classmethod
+    def for_directory(cls, cache_dir: str) -> "DiskCacheIndex":
+        """Return the shared index for a cache directory."""
+        with cls._instances_lock:
+            index = cls._instances.get(cache_dir)
+            if index is None:
+                index = cls._instances[cache_dir] = cls(cache_dir)
+            return index
+
+    def _create_tables(self):
+        """Create the cache_entries table and its ordering indexes."""
+        with self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    cache_key TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (last_access)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_hits ON cache_entries (hits, last_access)"
+            )
+            self.conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_created ON cache_entries (created_at)"
+            )
+
+    def lookup(self, cache_key: str) -> float | None:
+        """Return the creation time of an entry, or None if it is not cached."""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT created_at FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def touch(self, cache_key: str):
+        """Record an access to an entry."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE cache_entries SET last_access = ?, hits = hits + 1 WHERE cache_key = ?",
+                (time.time(), cache_key)
+            )
+
+    def touch_later(self, cache_key: str):
+        """Record an access to an entry in the next batch of touches."""
+        with self.lock:
+            pending = self._pending_touches.setdefault(cache_key, [0, 0.0])
+            pending[0] += 1
+            pending[1] = time.time()
+            if len(self._pending_touches) >= Config.AUDIO_CACHE_TOUCH_BATCH:
+                self._flush_touches()
+
+    def _flush_touches(self):
+        """Write buffered accesses; caller must hold the lock."""
+        if not self._pending_touches:
+            return
+        rows = [(last_access, hits, cache_key) for cache_key, (hits, last_access) in self._pending_touches.items()]
+        self._pending_touches = {}
+        with self.conn:
+            self.conn.executemany(
+                "UPDATE cache_entries SET last_access = MAX(last_access, ?), hits = hits + ? WHERE cache_key = ?",
+                rows
+            )
+
+    def add(self, cache_key: str, size: int):
+        """Insert or replace an entry."""
+        now = time.time()
+        with self.lock, self.conn:
+            row = self.conn.execute(
+                "SELECT size FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+            self.conn.execute("""
+                INSERT OR REPLACE INTO cache_entries (cache_key, size, created_at, last_access)
+                VALUES (?, ?, ?, ?)
+            """, (cache_key, size, now, now))
+            self.total_bytes += size - (row[0] if row else 0)
+
+    def remove(self, cache_keys: list):
+        """Remove entries from the index."""
+        if not cache_keys:
+            return
+        with self.lock, self.conn:
+            for cache_key in cache_keys:
+                row = self.conn.execute(
+                    "DELETE FROM cache_entries WHERE cache_key = ? RETURNING size", (cache_key,)
+                ).fetchone()
+                if row:
+                    self.total_bytes -= row[0]
+
+    def eviction_candidates(self, bytes_to_free: int, policy: str) -> list:
+        """
+        Return the keys to evict, coldest first, to free at least bytes_to_free.
+
+        Args:
+            bytes_to_free (int): Number of bytes that must be released.
+            policy (str): 'lru' or 'lfu'.
+
+        Returns:
+            list: Cache keys in eviction order.
+        """
+        order = self.EVICTION_ORDER.get(policy, self.EVICTION_ORDER['lru'])
+        victims, freed = [], 0
+        with self.lock:
+            self._flush_touches()
+            cursor = self.conn.execute(f"SELECT cache_key, size FROM cache_entries ORDER BY {order}")
+            for cache_key, size in cursor:
+                if freed >= bytes_to_free:
+                    break
+                victims.append(cache_key)
+                freed += size
+        return victims
+
+    def expired(self, cutoff: float) -> list:
+        """Return the keys of entries created before cutoff."""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT cache_key FROM cache_entries WHERE created_at < ?", (cutoff,)
+            ).fetchall()
+        return [row[0] for row in rows]
 
 
 class CacheService:
-    """Handles caching of generated audio files for reuse."""
+    """Two-tier cache of generated audio: a byte-bounded in-memory LRU over an indexed disk cache."""
+
+    # Hot tier shared by all instances: key -> (audio bytes, created timestamp)
+    _memory = LRUCache(Config.AUDIO_CACHE_MEMORY_BYTES)
+
+    # Cache key variants: base renderings are the 1.0x synthesis every speed is derived from
+    BASE = 'base'
+    DERIVED = 'derived'
 
     def __init__(self):
         self.cache_dir = os.path.join(Config.TEMP_AUDIO_DIR, 'cache')
         os.makedirs(self.cache_dir, exist_ok=True)
+        self.index = DiskCacheIndex.for_directory(self.cache_dir)
+
+    def _generate_cache_key(self, text: str, speed: float, language: str = 'en', variant: str = DERIVED) -> str:
+        """
+        Generate a unique cache key based on text, speed, language, and variant.
 
-    def _generate_cache_key(self, text: str, speed: float, language: str = 'en') -> str:
-        """Generate a unique cache key based on text, speed, and language."""
-        content = f"{text}_{speed}_{language}".encode('utf-8')
+        Base renderings and derived speed variants never share a key, even
+        for the same text at 1.0x.
+        """
+        if variant == self.BASE:
+            speed = 1.0
+        content = f"{variant}:{text}_{float(speed)}_{language}".encode('utf-8')
         return hashlib.md5(content).hexdigest()
 
+    def get_cache_key(self, text: str, speed: float, language: str = 'en', variant: str = DERIVED) -> str:
+        """Public accessor for the cache key of a rendering."""
+        return self._generate_cache_key(text, speed, language, variant)
+
+    def _entry_path(self, cache_key: str) -> str:
+        """Sharded location of a cache entry: cache/ab/cd/abcd....mp3."""
+        return os.path.join(self.cache_dir, cache_key[:2], cache_key[2:4], f"{cache_key}.mp3")
+
+    def get_audio(self, text: str, speed: float, language: str = 'en', variant: str = DERIVED) -> bytes | None:
+        """
+        Retrieve cached audio bytes, checking memory first and then disk.
+
+        Disk hits are promoted into the memory tier.
+
+        Returns:
+            bytes | None: Audio content or None on a miss.
+        """
+        if not Config.ENABLE_AUDIO_CACHING:
+            return None
+
+        cache_key = self._generate_cache_key(text, speed, language, variant)
+
+        entry = self._memory.get(cache_key)
+        if entry is not None:
+            audio_data, created = entry
+            if self._is_fresh(created):
+                self.index.touch_later(cache_key)
+                metrics.increment("audio_cache.memory_hits")
+                return audio_data
+            self._memory.pop(cache_key)
+
+        cache_file = self._get_fresh_entry(cache_key)
+        if cache_file is None:
+            metrics.increment("audio_cache.misses")
+            return None
+
+        try:
+            with open(cache_file, 'rb') as f:
+                audio_data = f.read()
+        except OSError as e:
+            bot_logger.warning(f"Failed to read cached audio: {e}")
+            self.index.remove([cache_key])
+            metrics.increment("audio_cache.misses")
+            return None
+
+        self._memory.put(cache_key, (audio_data, time.time()), len(audio_data))
+        metrics.increment("audio_cache.disk_hits")
+        return audio_data
+
     def get_cached_audio(self, text: str, speed: float, language: str = 'en') -> str | None:
         """
         Retrieve cached audio file if it exists and is within TTL.
@@ -26,59 +252,96 @@ class CacheService:
             str | None: Path to cached file or None if not found/fresh.
         """
         cache_key = self._generate_cache_key(text, speed, language)
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.mp3")
+        cache_file = self._get_fresh_entry(cache_key)
+        if cache_file is not None:
+            bot_logger.debug(f"Cache hit for key: {cache_key[:8]}")
+        return cache_file
+
+    def _get_fresh_entry(self, cache_key: str) -> str | None:
+        """Return the path of an indexed, unexpired entry and record the access."""
+        created = self.index.lookup(cache_key)
+        if created is None:
+            return None
 
-        if os.path.exists(cache_file):
-            file_time = datetime.fromtimestamp(os.path.getctime(cache_file))
-            if datetime.now() - file_time < timedelta(hours=Config.AUDIO_CACHE_TTL_HOURS):
-                bot_logger.debug(f"Cache hit for key: {cache_key[:8]}")
-                return cache_file
-            else:
-                # Remove stale cache
-                os.remove(cache_file)
-                bot_logger.debug(f"Removed stale cache file: {cache_file}")
+        if not self._is_fresh(created):
+            # Remove stale cache
+            self._delete_entries([cache_key])
+            bot_logger.debug(f"Removed stale cache entry: {cache_key[:8]}")
+            return None
 
-        return None
+        self.index.touch(cache_key)
+        return self._entry_path(cache_key)
 
-    def cache_audio(self, text: str, speed: float, audio_data: bytes, language: str = 'en'):
+    def cache_audio(self, text: str, speed: float, audio_data: bytes, language: str = 'en', variant: str = DERIVED):
         """
-        Save audio data to cache.
+        Save audio data to both cache tiers.
 
         Args:
             text (str): Original text.
             speed (float): TTS speed.
             audio_data (bytes): Audio file content.
             language (str): Language code.
+            variant (str): CacheService.BASE or CacheService.DERIVED.
         """
         if not Config.ENABLE_AUDIO_CACHING:
             return
 
-        cache_key = self._generate_cache_key(text, speed, language)
-        cache_file = os.path.join(self.cache_dir, f"{cache_key}.mp3")
+        cache_key = self._generate_cache_key(text, speed, language, variant)
+        self._memory.put(cache_key, (audio_data, time.time()), len(audio_data))
+
+        cache_file = self._entry_path(cache_key)
 
         try:
+            os.makedirs(os.path.dirname(cache_file), exist_ok=True)
             with open(cache_file, 'wb') as f:
                 f.write(audio_data)
+            self.index.add(cache_key, len(audio_data))
             bot_logger.debug(f"Cached audio for key: {cache_key[:8]}")
         except Exception as e:
             bot_logger.warning(f"Failed to cache audio: {e}")
+            return
+
+        self._enforce_disk_budget()
+
+    def _enforce_disk_budget(self):
+        """Evict cold entries once the disk cache passes its high watermark."""
+        budget = Config.AUDIO_CACHE_DISK_BYTES
+        if self.index.total_bytes <= budget * Config.AUDIO_CACHE_HIGH_WATERMARK:
+            return
+
+        target = budget * Config.AUDIO_CACHE_LOW_WATERMARK
+        victims = self.index.eviction_candidates(
+            self.index.total_bytes - target, Config.AUDIO_CACHE_EVICTION_POLICY
+        )
+        self._delete_entries(victims)
+        metrics.increment("audio_cache.evictions", len(victims))
+        bot_logger.info(f"Evicted {len(victims)} cache entries, disk cache now {self.index.total_bytes} bytes")
+
+    def _delete_entries(self, cache_keys: list):
+        """Delete entries from disk and from the index."""
+        for cache_key in cache_keys:
+            try:
+                os.remove(self._entry_path(cache_key))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                bot_logger.warning(f"Failed to delete cache entry {cache_key[:8]}: {e}")
+        self.index.remove(cache_keys)
+
+    @staticmethod
+    def _is_fresh(created: float) -> bool:
+        """Check whether an entry created at the given time is within TTL."""
+        return time.time() - created < Config.AUDIO_CACHE_TTL_HOURS * 3600
 
     def cleanup_old_cache(self):
-        """Delete cache files older than TTL to free up space."""
+        """Delete cache entries older than TTL to free up space."""
         try:
-            cutoff_time = datetime.now() - timedelta(hours=Config.AUDIO_CACHE_TTL_HOURS)
-            removed_count = 0
-
-            for filename in os.listdir(self.cache_dir):
-                file_path = os.path.join(self.cache_dir, filename)
-                if os.path.isfile(file_path):
-                    file_time = datetime.fromtimestamp(os.path.getctime(file_path))
-                    if file_time < cutoff_time:
-                        os.remove(file_path)
-                        removed_count += 1
-
-            if removed_count > 0:
-                bot_logger.info(f"Cleaned up {removed_count} old cache files")
+            cutoff_time = time.time() - Config.AUDIO_CACHE_TTL_HOURS * 3600
+            expired = self.index.expired(cutoff_time)
+            self._delete_entries(expired)
+
+            if expired:
+                bot_logger.info(f"Cleaned up {len(expired)} old cache files")
 
         except Exception as e:
             bot_logger.error(f"Cache cleanup error: {e}")
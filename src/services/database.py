@@ -0,0 +1,132 @@
+"""Process-wide SQLite connection shared by every model and service."""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from config import Config
+from utils.logger import bot_logger
+
+
+class Database:
+    """
+    A single tuned SQLite connection for the whole process.
+
+    The connection runs in WAL mode so readers never block the writer,
+    and keeps its prepared statements cached across calls. All access is
+    serialized by a reentrant lock, so it is safe from the event loop and
+    from worker threads alike.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, path):
+        self.path = path
+        self.conn = sqlite3.connect(
+            path,
+            check_same_thread=False,
+            isolation_level=None,  # autocommit; transactions are explicit
+            cached_statements=Config.DB_CACHED_STATEMENTS,
+        )
+        self.lock = threading.RLock()
+        self._depth = 0
+        self._schemas = set()
+        self._apply_pragmas()
+
+    @classmethod
+    def instance(cls) -> "Database":
+        """Return the shared database, opening it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls(Config.DATABASE_PATH)
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """Close the shared database, if it was opened."""
+        with cls._instance_lock:
+            if cls._instance is not None:
+                cls._instance.close()
+                cls._instance = None
+
+    def _apply_pragmas(self):
+        """Configure journaling, durability and caching for a long-lived connection."""
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA temp_store=MEMORY")
+        self.conn.execute(f"PRAGMA busy_timeout={int(Config.DB_BUSY_TIMEOUT_MS)}")
+        self.conn.execute(f"PRAGMA cache_size=-{int(Config.DB_CACHE_KB)}")
+        self.conn.execute(f"PRAGMA mmap_size={int(Config.DB_MMAP_BYTES)}")
+
+    def ensure_schema(self, name: str, *statements: str):
+        """
+        Run schema statements once per connection.
+
+        Args:
+            name (str): Identifier of the schema, e.g. the owning table.
+            *statements (str): CREATE TABLE / CREATE INDEX statements.
+        """
+        if name in self._schemas:
+            return
+        with self.transaction():
+            for statement in statements:
+                self.conn.execute(statement)
+        self._schemas.add(name)
+
+    def fetchone(self, sql: str, params: tuple = ()):
+        """Run a query and return its first row, or None."""
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()
+
+    def fetchall(self, sql: str, params: tuple = ()) -> list:
+        """Run a query and return all rows."""
+        with self.lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def execute(self, sql: str, params: tuple = ()) -> int:
+        """
+        Run a write statement.
+
+        Returns:
+            int: Number of rows changed.
+        """
+        with self.lock:
+            return self.conn.execute(sql, params).rowcount
+
+    def executemany(self, sql: str, rows) -> int:
+        """Run a write statement for each parameter tuple inside one transaction."""
+        with self.transaction():
+            return self.conn.executemany(sql, rows).rowcount
+
+    @contextmanager
+    def transaction(self):
+        """
+        Group statements into one transaction.
+
+        Nested use joins the outer transaction; only the outermost block
+        commits, and an exception anywhere rolls the whole transaction back.
+        """
+        with self.lock:
+            outermost = self._depth == 0
+            if outermost:
+                self.conn.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield self.conn
+            except BaseException:
+                self._depth -= 1
+                if outermost:
+                    self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self._depth -= 1
+                if outermost:
+                    self.conn.execute("COMMIT")
+
+    def close(self):
+        """Close the connection."""
+        with self.lock:
+            try:
+                self.conn.close()
+            except sqlite3.Error as e:
+                bot_logger.warning(f"Failed to close database: {e}")
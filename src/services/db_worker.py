@@ -0,0 +1,125 @@
+"""Dedicated database thread that runs queued storage calls for async handlers."""
+
+import asyncio
+import queue
+import threading
+import time
+from config import Config
+from utils.logger import bot_logger
+from utils.metrics import metrics
+from services.database import Database
+
+
+class DatabaseWorker:
+    """
+    Runs blocking storage calls on one background thread.
+
+    Handlers await submit() instead of calling sqlite3 on the event loop.
+    Calls queued while the thread is busy are drained together and run
+    in a single transaction, each under its own savepoint, so one failing
+    call never undoes the others.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+    _STOP = object()
+
+    def __init__(self, batch_size: int = None):
+        self.batch_size = batch_size or Config.DB_BATCH_SIZE
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="db-worker", daemon=True)
+        self._thread.start()
+
+    @classmethod
+    def instance(cls) -> "DatabaseWorker":
+        """Return the process-wide database worker, starting it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def shutdown(cls):
+        """Finish queued calls and stop the worker thread, if it was started."""
+        with cls._instance_lock:
+            worker, cls._instance = cls._instance, None
+        if worker is not None:
+            worker._queue.put(cls._STOP)
+            worker._thread.join()
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for the database thread."""
+        return self._queue.qsize()
+
+    async def submit(self, func, *args):
+        """
+        Run a blocking storage call on the database thread.
+
+        Args:
+            func (callable): Function to run, e.g. QuotaService.reserve.
+            *args: Arguments passed to func.
+
+        Returns:
+            The return value of func.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.put((func, args, loop, future, time.perf_counter()))
+        metrics.set_gauge("db.queue_depth", self._queue.qsize())
+        return await future
+
+    def _run(self):
+        """Drain the queue in batches until told to stop."""
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            metrics.set_gauge("db.queue_depth", self._queue.qsize())
+
+            commands = [command for command in batch if command is not self._STOP]
+            if commands:
+                self._run_batch(commands)
+            if len(commands) != len(batch):
+                return
+
+    def _run_batch(self, commands: list):
+        """Run a batch of calls in one transaction and hand back their outcomes."""
+        metrics.increment("db.batches")
+        metrics.increment("db.commands", len(commands))
+        outcomes = []
+        db = Database.instance()
+        try:
+            with db.transaction() as conn:
+                for func, args, _, _, _ in commands:
+                    conn.execute("SAVEPOINT command")
+                    try:
+                        outcomes.append((func(*args), None))
+                        conn.execute("RELEASE command")
+                    except Exception as e:
+                        conn.execute("ROLLBACK TO command")
+                        conn.execute("RELEASE command")
+                        outcomes.append((None, e))
+        except Exception as e:
+            bot_logger.error(f"Database batch of {len(commands)} failed: {e}")
+            outcomes = [(None, e)] * len(commands)
+
+        for (_, _, loop, future, enqueued), (result, error) in zip(commands, outcomes):
+            metrics.observe("db.latency", time.perf_counter() - enqueued)
+            try:
+                loop.call_soon_threadsafe(self._resolve, future, result, error)
+            except RuntimeError:
+                pass  # the submitting loop is already closed
+
+    @staticmethod
+    def _resolve(future: asyncio.Future, result, error: Exception = None):
+        """Complete a waiter's future on its event loop."""
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
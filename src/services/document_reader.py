@@ -0,0 +1,82 @@
+"""Reads uploaded text documents into memory within a size limit."""
+
+import io
+from typing import Iterator
+from telegram import Document
+from config import Config
+from utils.metrics import metrics
+
+
+class DocumentTooLarge(Exception):
+    """Raised when an uploaded document exceeds the allowed size."""
+
+
+class BoundedBuffer(io.BytesIO):
+    """In-memory byte buffer that refuses to grow past a fixed size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__()
+        self.max_bytes = max_bytes
+
+    def write(self, data) -> int:
+        if self.tell() + len(data) > self.max_bytes:
+            raise DocumentTooLarge(f"Document exceeds {self.max_bytes} bytes")
+        return super().write(data)
+
+
+class DocumentReader:
+    """Downloads plain text documents without touching the disk."""
+
+    ENCODING = 'utf-8'
+
+    @staticmethod
+    def is_text_document(document: Document) -> bool:
+        """Check whether a document is a plain text file."""
+        return document.mime_type == "text/plain" or (document.file_name or "").endswith(".txt")
+
+    @staticmethod
+    async def download(document: Document, max_bytes: int = None) -> io.BytesIO:
+        """
+        Download a document into a bounded in-memory buffer.
+
+        Args:
+            document (Document): Telegram document to fetch.
+            max_bytes (int): Size limit. Defaults to Config.MAX_UPLOAD_BYTES.
+
+        Returns:
+            io.BytesIO: Buffer positioned at the start of the content.
+
+        Raises:
+            DocumentTooLarge: If the document is larger than max_bytes. The
+                size Telegram reports is checked before anything is fetched.
+        """
+        max_bytes = max_bytes or Config.MAX_UPLOAD_BYTES
+        if document.file_size and document.file_size > max_bytes:
+            metrics.increment("uploads.rejected")
+            raise DocumentTooLarge(f"Document is {document.file_size} bytes, limit is {max_bytes}")
+
+        buffer = BoundedBuffer(max_bytes)
+        file = await document.get_file()
+        await file.download_to_memory(out=buffer)
+        buffer.seek(0)
+        return buffer
+
+    @staticmethod
+    def read_text(buffer: io.BytesIO) -> str:
+        """Decode a downloaded document to text."""
+        with io.TextIOWrapper(buffer, encoding=DocumentReader.ENCODING) as reader:
+            return reader.read()
+
+    @staticmethod
+    def iter_lines(buffer: io.BytesIO) -> Iterator[str]:
+        """
+        Yield the stripped, non-empty lines of a downloaded document.
+
+        Lines are decoded incrementally, so the decoded text never has to be
+        held in memory alongside the raw bytes.
+        """
+        with io.TextIOWrapper(buffer, encoding=DocumentReader.ENCODING) as reader:
+            for line in reader:
+                line = line.strip()
+                if line:
+                    yield line
@@ -0,0 +1,93 @@
+"""Cache of Telegram file_ids for audio that has already been uploaded."""
+
+import hashlib
+import unicodedata
+from telegram import Message
+from telegram.error import BadRequest
+from services.db_worker import DatabaseWorker
+from services.storage import StorageBackend
+from utils.logger import bot_logger
+from utils.metrics import metrics
+
+
+class FileIdCache:
+    """Maps (text, speed, language, format) to the Telegram file_id of its uploaded audio."""
+
+    AUDIO_FORMAT = 'mp3'
+
+    def __init__(self):
+        self.storage = StorageBackend.instance()
+
+    @staticmethod
+    def make_key(text: str, speed: float, language: str, audio_format: str = AUDIO_FORMAT) -> str:
+        """
+        Build the cache key for a rendering.
+
+        Text is Unicode-normalized and its whitespace collapsed, so trivially
+        different copies of the same message share an entry.
+        """
+        normalized = unicodedata.normalize('NFC', ' '.join(text.split()))
+        content = f"{normalized}\x00{float(speed)}\x00{language}\x00{audio_format}".encode('utf-8')
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, text: str, speed: float, language: str) -> str | None:
+        """Return the cached file_id for a rendering, or None."""
+        file_id = self.storage.get_file_id(self.make_key(text, speed, language))
+        metrics.increment("file_id_cache.hits" if file_id else "file_id_cache.misses")
+        return file_id
+
+    def contains_any(self, text: str, speeds: tuple, language: str) -> bool:
+        """True if audio of the text was uploaded at any of the speeds; not counted as hits or misses."""
+        return any(self.storage.get_file_id(self.make_key(text, speed, language)) for speed in speeds)
+
+    def put(self, text: str, speed: float, language: str, file_id: str):
+        """Store the file_id Telegram assigned to an uploaded rendering."""
+        self.storage.put_file_id(self.make_key(text, speed, language), file_id)
+
+    def invalidate(self, text: str, speed: float, language: str):
+        """Forget a file_id that Telegram no longer accepts."""
+        self.storage.delete_file_id(self.make_key(text, speed, language))
+        metrics.increment("file_id_cache.invalidated")
+
+    async def reply_cached_audio(self, message: Message, text: str, speed: float, language: str, **kwargs) -> bool:
+        """
+        Reply with previously uploaded audio if its file_id is cached.
+
+        Args:
+            message (Message): Message to reply to.
+            text (str): Original text.
+            speed (float): TTS speed.
+            language (str): Speech language code.
+            **kwargs: Extra reply_audio arguments (caption, reply_markup, ...).
+
+        Returns:
+            bool: True if the audio was sent, False on a miss or a stale file_id.
+        """
+        worker = DatabaseWorker.instance()
+        file_id = await worker.submit(self.get, text, speed, language)
+        if not file_id:
+            return False
+
+        try:
+            await message.reply_audio(audio=file_id, **kwargs)
+            return True
+        except BadRequest as e:
+            bot_logger.warning(f"Cached file_id rejected by Telegram, re-uploading: {e}")
+            await worker.submit(self.invalidate, text, speed, language)
+            return False
+
+    async def remember(self, sent_message: Message, text: str, speed: float, language: str):
+        """
+        Store the file_id of an audio message that was just uploaded.
+
+        The audio has already been delivered, so a failure here is logged
+        rather than raised; the next request for it is simply uploaded again.
+        """
+        audio = getattr(sent_message, "audio", None)
+        file_id = getattr(audio, "file_id", None)
+        if not isinstance(file_id, str):
+            return
+        try:
+            await DatabaseWorker.instance().submit(self.put, text, speed, language, file_id)
+        except Exception as e:
+            bot_logger.error(f"Failed to cache file_id: {e}")
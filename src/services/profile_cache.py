@@ -0,0 +1,112 @@
+"""In-process cache of user profiles (language, tier, today's usage)."""
+
+import time
+from datetime import date
+from config import Config
+from services.db_worker import DatabaseWorker
+from services.storage import StorageBackend
+from utils.lru_cache import LRUCache
+from utils.metrics import metrics
+
+
+class UserProfile:
+    """The per-user settings handlers need on every message."""
+
+    def __init__(self, language: str, tier: str, daily_usage: int = 0, usage_day: str = None):
+        self.language = language
+        self.tier = tier
+        self.daily_usage = daily_usage
+        self.usage_day = usage_day
+        self.loaded_at = time.monotonic()
+
+    def usage_today(self) -> int | None:
+        """Today's usage, or None if the cached value is from another day."""
+        return self.daily_usage if self.usage_day == date.today().isoformat() else None
+
+
+class ProfileCache:
+    """
+    Read-through, write-through cache of user profiles held by the storage backend.
+
+    Profiles are loaded lazily on first use and kept for
+    Config.PROFILE_CACHE_TTL seconds, with at most
+    Config.PROFILE_CACHE_SIZE users held at once (least recently used
+    first out). Writes go to the backend before the cache, so a restart
+    only costs one read per user.
+    """
+
+    _instance = None
+
+    def __init__(self, max_entries: int = None, ttl: float = None):
+        self.ttl = ttl or Config.PROFILE_CACHE_TTL
+        # Every profile counts as size 1, so the byte budget is an entry budget
+        self._profiles = LRUCache(max_entries or Config.PROFILE_CACHE_SIZE)
+
+    @classmethod
+    def instance(cls) -> "ProfileCache":
+        """Return the process-wide profile cache, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def peek(self, user_id: int) -> UserProfile | None:
+        """Return a fresh cached profile without touching the database."""
+        profile = self._profiles.get(user_id)
+        if profile is None or time.monotonic() - profile.loaded_at >= self.ttl:
+            return None
+        return profile
+
+    def get(self, user_id: int) -> UserProfile:
+        """Return a user's profile, loading it from the storage backend on a miss."""
+        profile = self.peek(user_id)
+        if profile is not None:
+            metrics.increment("profile_cache.hits")
+            return profile
+
+        metrics.increment("profile_cache.misses")
+        row = StorageBackend.instance().get_profile(user_id)
+        if row is None:
+            profile = UserProfile(Config.DEFAULT_LANGUAGE, Config.FREE)
+        else:
+            language, tier, daily_usage, last_reset = row
+            profile = UserProfile(
+                language or Config.DEFAULT_LANGUAGE, tier or Config.FREE, daily_usage or 0, last_reset
+            )
+        self._profiles.put(user_id, profile, 1)
+        return profile
+
+    async def get_language(self, user_id: int, user_data: dict) -> str:
+        """
+        Return the user's language for a handler.
+
+        The conversation's user_data is checked first; after a restart the
+        stored preference is restored from the profile and put back there.
+        """
+        language = user_data.get("language")
+        if language is None:
+            profile = self.peek(user_id) or await DatabaseWorker.instance().submit(self.get, user_id)
+            language = user_data["language"] = profile.language
+        return language
+
+    async def get_tier(self, user_id: int) -> str:
+        """Return the user's tier for a handler, loading the profile on the database thread on a miss."""
+        profile = self.peek(user_id) or await DatabaseWorker.instance().submit(self.get, user_id)
+        return profile.tier
+
+    def set_language(self, user_id: int, language: str):
+        """Store a user's language in the storage backend and in the cache."""
+        StorageBackend.instance().set_language(user_id, language)
+        profile = self.peek(user_id)
+        if profile is not None:
+            profile.language = language
+
+    def update_usage(self, user_id: int, daily_usage: int):
+        """Record today's usage after it was written to the storage backend."""
+        profile = self.peek(user_id)
+        if profile is not None:
+            profile.daily_usage = daily_usage
+            profile.usage_day = date.today().isoformat()
+
+    def invalidate(self, user_id: int):
+        """Drop a user's profile so the next read goes to the storage backend."""
+        self._profiles.pop(user_id)
@@ -1,7 +1,11 @@
 """Service for managing user quotas."""
 
 from models.user_session import UserSession
+from services.storage import StorageBackend
+from services.usage_counter import UsageCounter
+from services.profile_cache import ProfileCache
 from config import Config
+from utils.metrics import metrics
 from datetime import datetime, date
 
 class QuotaService:
@@ -9,6 +13,72 @@ class QuotaService:
 
     def __init__(self):
         self.user_session = UserSession()
+        self.storage = StorageBackend.instance()
+
+    @staticmethod
+    def get_tier_limit(tier: str) -> int:
+        """Return the daily quota of a user tier."""
+        return Config.DAILY_QUOTA_PREMIUM if tier == Config.PREMIUM else Config.DAILY_QUOTA_FREE
+
+    def get_limit(self, user_id: int) -> int:
+        """Return the daily quota of a user based on their tier."""
+        return self.get_tier_limit(ProfileCache.instance().get(user_id).tier)
+
+    def reserve(self, user_id: int, cost: int = 1) -> bool:
+        """
+        Atomically charge quota for a request if the user has enough left.
+
+        The daily reset, the tier-aware limit check and the increment run as
+        one atomic operation in the storage backend, so concurrent updates
+        cannot overspend, even from other bot workers.
+
+        Args:
+            user_id (int): Telegram user ID.
+            cost (int): Units of quota to charge.
+
+        Returns:
+            bool: True if the quota was charged, False if it would be exceeded.
+        """
+        if Config.USAGE_WRITE_BEHIND:
+            reserved = UsageCounter.instance().reserve(user_id, cost, self.get_tier_limit)
+        else:
+            usage = self.storage.reserve_quota(
+                user_id, cost, date.today().isoformat(), Config.DAILY_QUOTA_FREE, Config.DAILY_QUOTA_PREMIUM
+            )
+            if usage is not None:
+                ProfileCache.instance().update_usage(user_id, usage)
+            reserved = usage is not None
+
+        if reserved:
+            metrics.increment("quota.reserved", cost)
+            return True
+        metrics.increment("quota.denied")
+        return False
+
+    def refund(self, user_id: int, cost: int = 1):
+        """
+        Give back quota charged by reserve() for a request that failed.
+
+        Usage charged on a previous day is not refunded.
+
+        Args:
+            user_id (int): Telegram user ID.
+            cost (int): Units of quota to return.
+        """
+        if not (Config.USAGE_WRITE_BEHIND and UsageCounter.instance().refund(user_id, cost)):
+            usage = self.storage.refund_quota(user_id, cost, date.today().isoformat())
+            if usage is not None:
+                ProfileCache.instance().update_usage(user_id, usage)
+        metrics.increment("quota.refunded", cost)
+
+    def get_usage(self, user_id: int) -> int:
+        """Return today's usage from memory when known, otherwise from the storage backend."""
+        if Config.USAGE_WRITE_BEHIND:
+            usage = UsageCounter.instance().get_usage(user_id)
+        else:
+            profile = ProfileCache.instance().peek(user_id)
+            usage = profile.usage_today() if profile else None
+        return self.storage.get_usage(user_id, date.today().isoformat()) if usage is None else usage
 
     def check_quota(self, user_id: int) -> tuple[bool, int, int]:
         """
@@ -20,8 +90,8 @@ class QuotaService:
         Returns:
             Tuple[bool, int, int]: (has_quota, remaining_quota, total_quota)
         """
-        usage = self.user_session.get_daily_usage(user_id)
-        total_quota = Config.DAILY_QUOTA_FREE
+        usage = self.get_usage(user_id)
+        total_quota = self.get_limit(user_id)
         remaining = max(0, total_quota - usage)
         has_quota = remaining > 0
         return has_quota, remaining, total_quota
@@ -0,0 +1,377 @@
+"""Storage backends for state shared by bot workers: profiles, quotas, rate limits and file_ids."""
+
+import threading
+from abc import ABC, abstractmethod
+from config import Config
+from models.user_session import UserSession
+from services.database import Database
+
+
+class StorageBackend(ABC):
+    """
+    Interface to the state a bot worker shares with other workers.
+
+    SQLiteStorage (the default) keeps everything in the local database and
+    in process memory. RedisStorage keeps it in Redis so several workers
+    can serve the same users. Pick one with Config.STORAGE_BACKEND.
+    """
+
+    # True when calls go over the network to state shared with other workers;
+    # such calls must not run on the event loop
+    SHARED = False
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def instance(cls) -> "StorageBackend":
+        """Return the configured process-wide backend, creating it on first use."""
+        with cls._instance_lock:
+            if cls._instance is None:
+                backends = {'sqlite': SQLiteStorage, 'redis': RedisStorage}
+                backend = backends.get(Config.STORAGE_BACKEND)
+                if backend is None:
+                    raise ValueError(f"Unknown storage backend: {Config.STORAGE_BACKEND}")
+                cls._instance = backend()
+            return cls._instance
+
+    # ----- profiles -----
+
+    @abstractmethod
+    def get_profile(self, user_id: int) -> tuple | None:
+        """Return (language, tier, daily_usage, last_reset_date) for a user, or None."""
+
+    @abstractmethod
+    def set_language(self, user_id: int, language: str):
+        """Store a user's language without touching their tier or usage."""
+
+    # ----- quotas -----
+
+    @abstractmethod
+    def reserve_quota(self, user_id: int, cost: int, today: str, free_limit: int, premium_limit: int) -> int | None:
+        """
+        Atomically roll the day over, check the tier limit and charge cost.
+
+        Returns:
+            int | None: Today's usage after the charge, or None if it would exceed the limit.
+        """
+
+    @abstractmethod
+    def refund_quota(self, user_id: int, cost: int, today: str) -> int | None:
+        """Give back quota charged today. Returns today's usage, or None if nothing was charged today."""
+
+    @abstractmethod
+    def get_usage(self, user_id: int, today: str) -> int:
+        """Return a user's usage for today."""
+
+    @abstractmethod
+    def write_usage(self, rows: list):
+        """Store absolute (user_id, daily_usage, day) counters in one batch."""
+
+    # ----- rate limits -----
+
+    @abstractmethod
+    def allow_request(self, key: str, limit: int, window: float, now: float, cost: int = 1) -> bool:
+        """
+        Admit a request of the given cost under a GCRA limit of limit units per window seconds.
+
+        Each key stores only its theoretical arrival time (TAT): the moment
+        its budget would be fully replenished. A request is admitted if
+        charging it keeps the TAT within one window of now.
+
+        Returns:
+            bool: True if the request was admitted and charged.
+        """
+
+    # ----- Telegram file_ids -----
+
+    @abstractmethod
+    def get_file_id(self, cache_key: str) -> str | None:
+        """Return the file_id stored for a rendering, or None."""
+
+    @abstractmethod
+    def put_file_id(self, cache_key: str, file_id: str):
+        """Store the file_id Telegram assigned to a rendering."""
+
+    @abstractmethod
+    def delete_file_id(self, cache_key: str):
+        """Forget a rendering's file_id."""
+
+
+class LocalRateLimits:
+    """
+    In-process GCRA state: one theoretical arrival time per key.
+
+    Keys whose budget is full again carry no information and are swept
+    every Config.RATE_LIMIT_SWEEP_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._rates = {}  # rate-limit key -> theoretical arrival time
+        self._lock = threading.Lock()
+        self._last_sweep = 0.0
+
+    def allow_request(self, key: str, limit: int, window: float, now: float, cost: int = 1) -> bool:
+        """Admit and charge a request; see StorageBackend.allow_request."""
+        with self._lock:
+            if now - self._last_sweep >= Config.RATE_LIMIT_SWEEP_INTERVAL:
+                self._sweep(now)
+            tat = max(self._rates.get(key, now), now) + cost * window / limit
+            if tat - now > window:
+                return False
+            self._rates[key] = tat
+            return True
+
+    def refund(self, key: str, limit: int, window: float, cost: int = 1):
+        """Give back the units charged by an earlier allow_request."""
+        with self._lock:
+            if key in self._rates:
+                self._rates[key] -= cost * window / limit
+
+    def __len__(self) -> int:
+        return len(self._rates)
+
+    def _sweep(self, now: float):
+        """Drop keys whose budget is fully replenished; caller must hold the lock."""
+        self._rates = {key: tat for key, tat in self._rates.items() if tat > now}
+        self._last_sweep = now
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Single-host backend: SQLite for persistent state, process memory for rate limits.
+    """
+
+    # Rolls the day over, checks the tier limit and charges in one statement.
+    # New users are inserted only if the cost fits the free quota; existing
+    # rows are updated only if today's usage plus the cost fits their tier.
+    RESERVE_SQL = """
+        INSERT INTO users (user_id, daily_usage, last_reset_date)
+        SELECT :user_id, :cost, :today
+        WHERE :cost <= COALESCE(
+            (SELECT CASE tier WHEN :premium_tier THEN :premium ELSE :free END
+             FROM users WHERE user_id = :user_id),
+            :free
+        )
+        ON CONFLICT(user_id) DO UPDATE SET
+            daily_usage = (CASE WHEN last_reset_date = :today THEN daily_usage ELSE 0 END)
+                + excluded.daily_usage,
+            last_reset_date = excluded.last_reset_date
+        WHERE (CASE WHEN last_reset_date = :today THEN daily_usage ELSE 0 END) + excluded.daily_usage
+            <= CASE tier WHEN :premium_tier THEN :premium ELSE :free END
+        RETURNING daily_usage
+    """
+
+    REFUND_SQL = """
+        UPDATE users SET daily_usage = MAX(daily_usage - :cost, 0)
+        WHERE user_id = :user_id AND last_reset_date = :today
+        RETURNING daily_usage
+    """
+
+    # Counters hold absolute values, so replaying a batch is harmless
+    WRITE_USAGE_SQL = """
+        INSERT INTO users (user_id, daily_usage, last_reset_date)
+        VALUES (?, ?, ?)
+        ON CONFLICT(user_id) DO UPDATE SET
+            daily_usage = excluded.daily_usage,
+            last_reset_date = excluded.last_reset_date
+    """
+
+    def __init__(self):
+        self._rates = LocalRateLimits()
+
+    @staticmethod
+    def _db() -> Database:
+        """The shared database, with the tables this backend uses created."""
+        db = UserSession().db
+        db.ensure_schema("audio_file_ids", """
+            CREATE TABLE IF NOT EXISTS audio_file_ids (
+                cache_key TEXT PRIMARY KEY,
+                file_id TEXT NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        return db
+
+    def get_profile(self, user_id: int) -> tuple | None:
+        return UserSession().get_profile(user_id)
+
+    def set_language(self, user_id: int, language: str):
+        UserSession().set_user_language(user_id, language)
+
+    def reserve_quota(self, user_id: int, cost: int, today: str, free_limit: int, premium_limit: int) -> int | None:
+        rows = self._db().fetchall(self.RESERVE_SQL, {
+            "user_id": user_id,
+            "cost": cost,
+            "today": today,
+            "premium_tier": Config.PREMIUM,
+            "premium": premium_limit,
+            "free": free_limit,
+        })
+        return rows[0][0] if rows else None
+
+    def refund_quota(self, user_id: int, cost: int, today: str) -> int | None:
+        rows = self._db().fetchall(self.REFUND_SQL, {"user_id": user_id, "cost": cost, "today": today})
+        return rows[0][0] if rows else None
+
+    def get_usage(self, user_id: int, today: str) -> int:
+        row = self._db().fetchone(
+            "SELECT daily_usage, last_reset_date FROM users WHERE user_id = ?", (user_id,)
+        )
+        return row[0] if row and row[1] == today else 0
+
+    def write_usage(self, rows: list):
+        self._db().executemany(self.WRITE_USAGE_SQL, rows)
+
+    def allow_request(self, key: str, limit: int, window: float, now: float, cost: int = 1) -> bool:
+        return self._rates.allow_request(key, limit, window, now, cost)
+
+    @property
+    def rate_limited_keys(self) -> int:
+        """Number of keys with rate-limit state in memory."""
+        return len(self._rates)
+
+    def get_file_id(self, cache_key: str) -> str | None:
+        row = self._db().fetchone("SELECT file_id FROM audio_file_ids WHERE cache_key = ?", (cache_key,))
+        return row[0] if row else None
+
+    def put_file_id(self, cache_key: str, file_id: str):
+        self._db().execute("""
+            INSERT OR REPLACE INTO audio_file_ids (cache_key, file_id)
+            VALUES (?, ?)
+        """, (cache_key, file_id))
+
+    def delete_file_id(self, cache_key: str):
+        self._db().execute("DELETE FROM audio_file_ids WHERE cache_key = ?", (cache_key,))
+
+
+class RedisStorage(StorageBackend):
+    """
+    Multi-worker backend on any Redis-protocol server.
+
+    Read-modify-write operations use WATCH/MULTI transactions, so they
+    stay atomic across workers without server-side scripting.
+    """
+
+    SHARED = True
+
+    USAGE_TTL = 2 * 24 * 3600  # usage counters outlive their day just long enough
+
+    def __init__(self, client=None, prefix: str = None):
+        """
+        Args:
+            client: A redis.Redis-compatible client. Defaults to one for Config.REDIS_URL.
+            prefix (str): Key namespace. Defaults to Config.REDIS_KEY_PREFIX.
+        """
+        if client is None:
+            try:
+                import redis
+            except ImportError as e:
+                raise RuntimeError("STORAGE_BACKEND=redis requires the 'redis' package") from e
+            client = redis.Redis.from_url(Config.REDIS_URL, decode_responses=True)
+        self.client = client
+        self.prefix = Config.REDIS_KEY_PREFIX if prefix is None else prefix
+
+    def _key(self, *parts) -> str:
+        return self.prefix + ":".join(str(part) for part in parts)
+
+    def get_profile(self, user_id: int) -> tuple | None:
+        pipe = self.client.pipeline(transaction=False)
+        pipe.hgetall(self._key("profile", user_id))
+        pipe.hgetall(self._key("usage", user_id))
+        profile, usage = (self._fields(reply) for reply in pipe.execute())
+        if not profile and not usage:
+            return None
+        return (
+            profile.get("language") or Config.DEFAULT_LANGUAGE,
+            profile.get("tier") or Config.FREE,
+            int(usage.get("used", 0)),
+            usage.get("day"),
+        )
+
+    def set_language(self, user_id: int, language: str):
+        self.client.hset(self._key("profile", user_id), "language", language)
+
+    def reserve_quota(self, user_id: int, cost: int, today: str, free_limit: int, premium_limit: int) -> int | None:
+        profile_key, usage_key = self._key("profile", user_id), self._key("usage", user_id)
+
+        def charge(pipe):
+            tier = self._text(pipe.hget(profile_key, "tier"))
+            limit = premium_limit if tier == Config.PREMIUM else free_limit
+            used = self._used_today(pipe.hgetall(usage_key), today)
+            if used + cost > limit:
+                pipe.unwatch()
+                return None
+            pipe.multi()
+            pipe.hset(usage_key, mapping={"day": today, "used": used + cost})
+            pipe.expire(usage_key, self.USAGE_TTL)
+            return used + cost
+
+        return self.client.transaction(charge, profile_key, usage_key, value_from_callable=True)
+
+    def refund_quota(self, user_id: int, cost: int, today: str) -> int | None:
+        usage_key = self._key("usage", user_id)
+
+        def give_back(pipe):
+            usage = self._fields(pipe.hgetall(usage_key))
+            if usage.get("day") != today:
+                pipe.unwatch()
+                return None
+            used = max(int(usage.get("used", 0)) - cost, 0)
+            pipe.multi()
+            pipe.hset(usage_key, "used", used)
+            return used
+
+        return self.client.transaction(give_back, usage_key, value_from_callable=True)
+
+    def get_usage(self, user_id: int, today: str) -> int:
+        return self._used_today(self.client.hgetall(self._key("usage", user_id)), today)
+
+    def write_usage(self, rows: list):
+        pipe = self.client.pipeline()
+        for user_id, daily_usage, day in rows:
+            usage_key = self._key("usage", user_id)
+            pipe.hset(usage_key, mapping={"day": day, "used": daily_usage})
+            pipe.expire(usage_key, self.USAGE_TTL)
+        pipe.execute()
+
+    def allow_request(self, key: str, limit: int, window: float, now: float, cost: int = 1) -> bool:
+        rate_key = self._key("rate", key)
+
+        def charge(pipe):
+            stored = pipe.get(rate_key)
+            tat = max(float(stored) if stored is not None else now, now) + cost * window / limit
+            if tat - now > window:
+                pipe.unwatch()
+                return False
+            pipe.multi()
+            # The key expires once the budget is full again, so idle users cost nothing
+            pipe.set(rate_key, repr(tat), px=max(int((tat - now) * 1000), 1))
+            return True
+
+        return self.client.transaction(charge, rate_key, value_from_callable=True)
+
+    def get_file_id(self, cache_key: str) -> str | None:
+        return self._text(self.client.get(self._key("file_id", cache_key)))
+
+    def put_file_id(self, cache_key: str, file_id: str):
+        self.client.set(self._key("file_id", cache_key), file_id)
+
+    def delete_file_id(self, cache_key: str):
+        self.client.delete(self._key("file_id", cache_key))
+
+    @classmethod
+    def _used_today(cls, usage: dict, today: str) -> int:
+        """Usage from a counter hash, or 0 if it belongs to another day."""
+        usage = cls._fields(usage)
+        return int(usage.get("used", 0)) if usage.get("day") == today else 0
+
+    @classmethod
+    def _fields(cls, reply: dict) -> dict:
+        """Normalize an HGETALL reply to a str -> str dict."""
+        return {cls._text(field): cls._text(value) for field, value in reply.items()}
+
+    @staticmethod
+    def _text(value) -> str | None:
+        """Normalize a Redis reply to str, whether or not the client decodes responses."""
+        return value.decode() if isinstance(value, bytes) else value
@@ -0,0 +1,182 @@
+"""Bounded worker pool that runs blocking TTS work off the event loop."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.logger import bot_logger
+from utils.metrics import metrics
+
+
+class SynthesisQueueFull(Exception):
+    """Raised when the synthesis queue has no free slots."""
+
+
+class SynthesisCancelled(Exception):
+    """Raised to a waiter whose job was cancelled by the user."""
+
+
+class _Flight:
+    """A job in the worker pool and the number of callers awaiting it."""
+
+    def __init__(self, future):
+        self.future = future
+        self.result = asyncio.wrap_future(future)
+        self.result.add_done_callback(self._retrieve)
+        self.waiters = 1
+
+    @staticmethod
+    def _retrieve(result):
+        """Mark an exception as retrieved; waiters may all have left before it arrived."""
+        if not result.cancelled():
+            result.exception()
+
+
+class SynthesisPool:
+    """
+    Runs synthesis jobs in worker threads with a bounded queue, timeouts and per-user cancellation.
+
+    Jobs submitted with the same key while one is in flight share its
+    result instead of running again (single-flight).
+    """
+
+    _instance = None
+
+    def __init__(self, max_workers: int = None, max_queue: int = None, timeout: float = None):
+        self.max_workers = max_workers or Config.TTS_WORKER_THREADS
+        self.max_queue = Config.TTS_QUEUE_SIZE if max_queue is None else max_queue
+        self.timeout = timeout or Config.TTS_JOB_TIMEOUT
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="tts")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._user_jobs = {}
+        self._cancelled = set()
+        self._in_flight = {}
+
+    @classmethod
+    def instance(cls) -> "SynthesisPool":
+        """Return the process-wide synthesis pool, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def pending(self) -> int:
+        """Number of jobs queued or running."""
+        return self._pending
+
+    async def submit(self, user_id: int, func, *args, key: str = None):
+        """
+        Run a blocking synthesis call in the worker pool.
+
+        Args:
+            user_id (int): Telegram user ID owning the job (used for cancellation).
+            func (callable): Blocking function to run, e.g. TTSService.render_audio.
+            *args: Arguments passed to func.
+            key (str): Optional single-flight key. While a job with the same key
+                is in flight, the caller awaits that job instead of starting a
+                new one; its result or exception is delivered to every caller.
+
+        Returns:
+            The return value of func.
+
+        Raises:
+            SynthesisQueueFull: If all workers are busy and the queue is full.
+            SynthesisCancelled: If the user cancelled the job.
+            asyncio.TimeoutError: If the job did not finish within the timeout.
+        """
+        flight = self._in_flight.get(key) if key is not None else None
+        if flight is not None:
+            flight.waiters += 1
+            metrics.increment("synthesis.coalesced")
+            bot_logger.debug(f"Coalesced synthesis for user {user_id} into in-flight job {key[:8]}")
+        else:
+            flight = self._start(func, args, key)
+
+        # Each caller waits on its own shield so one cancellation never cancels the shared job
+        waiter = asyncio.shield(flight.result)
+        jobs = self._user_jobs.setdefault(user_id, set())
+        jobs.add(waiter)
+
+        try:
+            with metrics.timer("synthesis.job_time"):
+                return await asyncio.wait_for(waiter, self.timeout)
+        except asyncio.TimeoutError:
+            metrics.increment("synthesis.timeouts")
+            bot_logger.warning(f"Synthesis job for user {user_id} timed out after {self.timeout}s")
+            raise
+        except asyncio.CancelledError:
+            if waiter in self._cancelled:
+                metrics.increment("synthesis.cancelled")
+                raise SynthesisCancelled(f"Synthesis cancelled by user {user_id}")
+            raise
+        finally:
+            self._cancelled.discard(waiter)
+            jobs.discard(waiter)
+            if not jobs:
+                self._user_jobs.pop(user_id, None)
+            self._leave(flight, key)
+
+    def _start(self, func, args: tuple, key: str = None) -> _Flight:
+        """Reserve a queue slot and start a job, registering it under key."""
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                metrics.increment("synthesis.rejected")
+                raise SynthesisQueueFull(f"Synthesis queue is full ({self._pending} pending)")
+            self._pending += 1
+            metrics.set_gauge("synthesis.pending", self._pending)
+
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._release)
+        flight = _Flight(future)
+        if key is not None:
+            self._in_flight[key] = flight
+        return flight
+
+    def _leave(self, flight: _Flight, key: str = None):
+        """Drop a caller from a job, abandoning the job once nobody waits for it."""
+        flight.waiters -= 1
+        if flight.result.done() or flight.waiters == 0:
+            if key is not None and self._in_flight.get(key) is flight:
+                del self._in_flight[key]
+        if flight.waiters == 0 and not flight.result.done():
+            self._abandon(flight.future)
+
+    def cancel_user(self, user_id: int) -> int:
+        """
+        Cancel all queued or running jobs of a user.
+
+        Queued jobs never start; running jobs finish in their thread but
+        their result is discarded.
+
+        Returns:
+            int: Number of jobs cancelled.
+        """
+        jobs = self._user_jobs.get(user_id, set())
+        for waiter in list(jobs):
+            self._cancelled.add(waiter)
+            waiter.cancel()
+        if jobs:
+            bot_logger.info(f"Cancelled {len(jobs)} synthesis job(s) for user {user_id}")
+        return len(jobs)
+
+    def shutdown(self):
+        """Stop accepting work and drop queued jobs."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _release(self, future):
+        """Free the queue slot held by a finished job."""
+        with self._lock:
+            self._pending -= 1
+            metrics.set_gauge("synthesis.pending", self._pending)
+
+    @staticmethod
+    def _abandon(future):
+        """
+        Cancel a job nobody waits for.
+
+        A job that is already running finishes in its thread. Its result
+        is bytes or an AudioBuffer, which deletes any spilled file itself,
+        so nothing is left to clean up.
+        """
+        future.cancel()
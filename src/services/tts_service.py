@@ -1,25 +1,189 @@
 import io
 import tempfile
 import os
+from concurrent.futures import ThreadPoolExecutor
 from gtts import gTTS
 from pydub import AudioSegment
 from utils.logger import bot_logger
 from services.file_service import FileService
+from services.audio_codec import AudioCodec
+from services.audio_buffer import AudioBuffer
+from services.cache_service import CacheService
+from services.time_stretch import TimeStretcher
+from config import Config
 from utils.validators import TextValidator
+from utils.text_chunker import TextChunker
+from utils.lru_cache import LRUCache
+
+
+class BaseRendering:
+    """The 1.0x synthesis of a text; its decoded PCM is filled in lazily."""
+
+    def __init__(self, mp3_data: bytes, pcm_data: bytes = None):
+        self.mp3_data = mp3_data
+        self.pcm_data = pcm_data
+
+    @property
+    def size(self) -> int:
+        """Memory held by this rendering in bytes."""
+        return len(self.mp3_data) + len(self.pcm_data or b"")
+
 
 class TTSService:
-    """Text-to-Speech service using gTTS and pydub for speed adjustments."""
+    """Text-to-Speech service using gTTS, deriving every speed from one base rendering."""
+
+    # Shared by all instances so any handler can reuse another's rendering
+    _base_renderings = LRUCache(Config.BASE_RENDER_CACHE_BYTES)
 
     def __init__(self):
         self.validator = TextValidator()
+        self.cache_service = CacheService()
 
     def detect_language(self, text: str) -> str:
         """Detect the language of the input text."""
         return 'fa' if self.validator.is_persian_text(text) else 'en'
 
+    def synthesis_key(self, text: str, speed: float = 1.0) -> str:
+        """Key identifying the rendering of a text at a speed; identical requests share it."""
+        return self.cache_service.get_cache_key(text, speed, self.detect_language(text))
+
+    def render_audio(self, text: str, speed: float = 1.0) -> bytes:
+        """
+        Render text to MP3 bytes at the given speed.
+
+        Finished clips are served from the two-tier audio cache. On a miss
+        the text is synthesized once at 1.0x; other speeds are derived
+        locally from that cached rendering, so changing speed costs no
+        network round trip.
+
+        Args:
+            text: Input text to convert.
+            speed: Speed multiplier (0.5 to 3.0).
+
+        Returns:
+            MP3 audio bytes.
+
+        Raises:
+            Exception: If synthesis or deriving the speed variant fails;
+                nothing is cached for the requested speed.
+        """
+        lang_code = self.detect_language(text)
+        cached_audio = self.cache_service.get_audio(text, speed, lang_code)
+        if cached_audio is not None:
+            return cached_audio
+
+        key = self.cache_service.get_cache_key(text, 1.0, lang_code, CacheService.BASE)
+        rendering = self._get_base_rendering(key, text, lang_code)
+        audio_data = self._derive_variant(rendering, speed, key)
+
+        self.cache_service.cache_audio(text, speed, audio_data, lang_code)
+        return audio_data
+
+    def render_buffer(self, text: str, speed: float = 1.0) -> AudioBuffer:
+        """
+        Render text at the given speed into an AudioBuffer ready for upload.
+
+        Args:
+            text: Input text to convert.
+            speed: Speed multiplier (0.5 to 3.0).
+
+        Returns:
+            AudioBuffer holding the MP3 audio and its duration, measured from
+            the MP3 frames (None if they cannot be parsed).
+        """
+        audio_data = self.render_audio(text, speed)
+        seconds = AudioCodec.mp3_duration(audio_data)
+        return AudioBuffer(audio_data, max(round(seconds), 1) if seconds else None)
+
+    def prerender(self, text: str):
+        """
+        Synthesize and cache the base rendering of a text ahead of time.
+
+        A 1.0x clip already in the audio cache is the base rendering, so it
+        is reused instead of calling gTTS again.
+        """
+        lang_code = self.detect_language(text)
+        key = self.cache_service.get_cache_key(text, 1.0, lang_code, CacheService.BASE)
+        if self._base_renderings.get(key) is not None:
+            return
+
+        cached_audio = self.cache_service.get_audio(text, 1.0, lang_code)
+        if cached_audio is not None:
+            rendering = BaseRendering(cached_audio)
+            self._base_renderings.put(key, rendering, rendering.size)
+            return
+
+        self._get_base_rendering(key, text, lang_code)
+
+    def _get_base_rendering(self, key: str, text: str, lang_code: str) -> BaseRendering:
+        """Return the cached 1.0x rendering of a text, synthesizing it on a miss."""
+        rendering = self._base_renderings.get(key)
+        if rendering is not None:
+            bot_logger.debug(f"Base rendering hit for key: {key[:8]}")
+            return rendering
+
+        rendering = BaseRendering(self._synthesize(text, lang_code, slow=False))
+        self._base_renderings.put(key, rendering, rendering.size)
+        return rendering
+
+    def _derive_variant(self, rendering: BaseRendering, speed: float, key: str = None) -> bytes:
+        """
+        Derive a speed variant from a base rendering locally.
+
+        When key is given, the decoded PCM is kept in the cache so later
+        variants of the same text skip decoding too.
+
+        Raises:
+            Exception: If decoding, stretching or encoding fails. The 1.0x
+                audio is never returned in place of another speed, so it
+                cannot be cached under that speed's key.
+        """
+        if speed == 1.0:
+            return rendering.mp3_data
+
+        if rendering.pcm_data is None:
+            rendering.pcm_data = self._decode_pcm(rendering.mp3_data)
+            if key is not None:
+                self._base_renderings.put(key, rendering, rendering.size)
+
+        stretched = TimeStretcher.stretch_pcm16(rendering.pcm_data, speed)
+        bot_logger.debug(f"Audio speed adjusted to {speed}x")
+        return self._encode_pcm(stretched)
+
+    def _synthesize(self, text: str, lang_code: str, slow: bool) -> bytes:
+        """
+        Synthesize text with gTTS, fetching sentence chunks concurrently.
+
+        Long texts are split on sentence boundaries and each chunk is
+        synthesized in parallel (at most Config.TTS_CHUNK_CONCURRENCY at a
+        time). MP3 frames concatenate cleanly, so chunks are joined in order.
+
+        Returns:
+            MP3 audio bytes.
+        """
+        chunks = TextChunker.split(text, Config.TTS_CHUNK_MAX_CHARS)
+        if len(chunks) <= 1:
+            return self._synthesize_chunk(text, lang_code, slow)
+
+        workers = min(Config.TTS_CHUNK_CONCURRENCY, len(chunks))
+        bot_logger.debug(f"Synthesizing {len(chunks)} chunks with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="tts-chunk") as executor:
+            parts = executor.map(lambda chunk: self._synthesize_chunk(chunk, lang_code, slow), chunks)
+            return b"".join(parts)
+
+    @staticmethod
+    def _synthesize_chunk(text: str, lang_code: str, slow: bool) -> bytes:
+        """Synthesize a single chunk of text to MP3 bytes."""
+        tts = gTTS(text=text, lang=lang_code, slow=slow, lang_check=False)
+
+        # Generate audio to buffer
+        audio_buffer = io.BytesIO()
+        tts.write_to_fp(audio_buffer)
+        return audio_buffer.getvalue()
+
     def adjust_audio_speed(self, audio_data: bytes, speed: float) -> bytes:
         """
-        Adjust audio speed using pydub.
+        Adjust audio speed without changing pitch.
 
         Args:
             audio_data: Raw MP3 audio bytes.
@@ -29,44 +193,49 @@ class TTSService:
             Adjusted MP3 audio bytes.
         """
         try:
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as input_file:
-                input_file.write(audio_data)
-                input_path = input_file.name
+            return self._derive_variant(BaseRendering(audio_data), speed)
+        except Exception as e:
+            bot_logger.error(f"Speed adjustment failed: {e}")
+            return audio_data  # fallback to original audio
 
-            with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as output_file:
-                output_path = output_file.name
+    def _decode_pcm(self, audio_data: bytes) -> bytes:
+        """Decode MP3 bytes to 16-bit mono PCM at Config.AUDIO_SAMPLE_RATE."""
+        if Config.AUDIO_STREAMING_PIPELINE:
+            return AudioCodec.decode_mp3(audio_data, Config.AUDIO_SAMPLE_RATE)
 
+        # Legacy path: round-trip the audio through a temporary file
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as input_file:
+            input_file.write(audio_data)
+            input_path = input_file.name
+        try:
             audio = AudioSegment.from_mp3(input_path)
+        finally:
+            os.unlink(input_path)
 
-            if speed != 1.0:
-                # Change frame rate to adjust speed while preserving pitch
-                new_frame_rate = int(audio.frame_rate * speed)
-                adjusted_audio = audio._spawn(audio.raw_data, overrides={"frame_rate": new_frame_rate})
-                adjusted_audio = adjusted_audio.set_frame_rate(audio.frame_rate)
-            else:
-                adjusted_audio = audio
-
-            adjusted_audio.export(
-                output_path,
-                format="mp3",
-                bitrate="64k",
-                parameters=["-ac", "1"]  # Mono audio for smaller files
-            )
+        audio = audio.set_channels(AudioCodec.CHANNELS).set_sample_width(AudioCodec.SAMPLE_WIDTH)
+        return audio.set_frame_rate(Config.AUDIO_SAMPLE_RATE).raw_data
 
-            with open(output_path, 'rb') as f:
-                adjusted_data = f.read()
+    def _encode_pcm(self, pcm_data: bytes) -> bytes:
+        """Encode 16-bit mono PCM at Config.AUDIO_SAMPLE_RATE to MP3 bytes."""
+        if Config.AUDIO_STREAMING_PIPELINE:
+            return AudioCodec.encode_mp3(pcm_data, Config.AUDIO_SAMPLE_RATE)
 
-            # Cleanup temp files
-            os.unlink(input_path)
+        # Legacy path: round-trip the audio through a temporary file
+        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as output_file:
+            output_path = output_file.name
+        try:
+            audio = AudioSegment(
+                data=pcm_data,
+                sample_width=AudioCodec.SAMPLE_WIDTH,
+                frame_rate=Config.AUDIO_SAMPLE_RATE,
+                channels=AudioCodec.CHANNELS,
+            )
+            audio.export(output_path, format="mp3", bitrate="64k")
+            with open(output_path, 'rb') as f:
+                return f.read()
+        finally:
             os.unlink(output_path)
 
-            bot_logger.debug(f"Audio speed adjusted to {speed}x")
-            return adjusted_data
-
-        except Exception as e:
-            bot_logger.error(f"Speed adjustment failed: {e}")
-            return audio_data  # fallback to original audio
-
     def convert_text_to_speech(self, text: str, speed: float = 1.0) -> str:
         """
         Convert text to speech and optionally adjust speed.
@@ -84,29 +253,13 @@ class TTSService:
         try:
             bot_logger.info(f"Converting text ({len(text)} chars) at {speed}x speed")
 
-            language = self.detect_language(text)
-            lang_code = 'fa' if language == 'fa' else 'en'
-
-            # Determine gTTS slow parameter
-            slow = lang_code == 'en' and speed < 0.8
-
-            tts = gTTS(text=text, lang=lang_code, slow=slow, lang_check=False)
-
-            # Generate audio to buffer
-            audio_buffer = io.BytesIO()
-            tts.write_to_fp(audio_buffer)
-            audio_buffer.seek(0)
-            raw_audio = audio_buffer.read()
-
-            # Adjust speed if necessary
-            if speed != 1.0 and not (lang_code == 'fa' and speed < 0.8):
-                raw_audio = self.adjust_audio_speed(raw_audio, speed)
+            raw_audio = self.render_audio(text, speed)
 
             # Save audio to file
             filename = FileService.generate_filename()
             file_path = FileService.save_audio_file(raw_audio, filename)
 
-            bot_logger.info(f"✅ Audio generated successfully ({language})")
+            bot_logger.info("✅ Audio generated successfully")
             return file_path
 
         except Exception as e:
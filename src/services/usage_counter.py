@@ -0,0 +1,165 @@
+"""In-memory daily usage counters written back to SQLite in batches."""
+
+import asyncio
+import threading
+from datetime import date
+from config import Config
+from utils.logger import bot_logger
+from utils.metrics import metrics
+from services.storage import StorageBackend
+
+
+class UsageCounter:
+    """
+    Write-behind store for per-user daily usage.
+
+    Quota is enforced against the in-memory counters, so the check stays
+    exact within the process, while changed counters are written to the
+    storage backend in one batch every
+    Config.USAGE_FLUSH_INTERVAL seconds or Config.USAGE_FLUSH_MAX_PENDING
+    updates, whichever comes first. At most that much usage is lost if
+    the process dies without running post_stop.
+    """
+
+    _instance = None
+
+    def __init__(self, flush_interval: float = None, max_pending: int = None):
+        self.flush_interval = flush_interval or Config.USAGE_FLUSH_INTERVAL
+        self.max_pending = max_pending or Config.USAGE_FLUSH_MAX_PENDING
+        self._lock = threading.Lock()
+        self._usage = {}  # user_id -> [day, usage, limit]
+        self._dirty = set()
+        self._pending = 0
+        self._task = None
+
+    @classmethod
+    def instance(cls) -> "UsageCounter":
+        """Return the process-wide usage counter, creating it on first use."""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    @property
+    def pending(self) -> int:
+        """Number of updates not yet written to the database."""
+        return self._pending
+
+    def reserve(self, user_id: int, cost: int, limit_for_tier) -> bool:
+        """
+        Charge quota in memory if the user has enough left today.
+
+        Args:
+            user_id (int): Telegram user ID.
+            cost (int): Units of quota to charge.
+            limit_for_tier (callable): Maps a user tier to its daily quota.
+
+        Returns:
+            bool: True if the quota was charged.
+        """
+        with self._lock:
+            entry = self._entry(user_id, limit_for_tier)
+            if entry[1] + cost > entry[2]:
+                return False
+            entry[1] += cost
+            self._mark_dirty(user_id)
+            flush_now = self._pending >= self.max_pending
+
+        if flush_now:
+            self.flush()
+        return True
+
+    def refund(self, user_id: int, cost: int) -> bool:
+        """
+        Give back quota charged today.
+
+        Returns:
+            bool: False if the user has no counter for today.
+        """
+        with self._lock:
+            entry = self._usage.get(user_id)
+            if entry is None or entry[0] != date.today().isoformat():
+                return False
+            entry[1] = max(entry[1] - cost, 0)
+            self._mark_dirty(user_id)
+        return True
+
+    def get_usage(self, user_id: int) -> int | None:
+        """Return today's in-memory usage of a user, or None if it is not tracked."""
+        entry = self._usage.get(user_id)
+        if entry is None or entry[0] != date.today().isoformat():
+            return None
+        return entry[1]
+
+    def flush(self) -> int:
+        """
+        Write all changed counters in one transaction.
+
+        Returns:
+            int: Number of users written.
+        """
+        with self._lock:
+            if not self._dirty:
+                return 0
+            rows = [(user_id, self._usage[user_id][1], self._usage[user_id][0]) for user_id in self._dirty]
+            self._dirty.clear()
+            self._pending = 0
+            # Counters from previous days are never read again
+            today = date.today().isoformat()
+            self._usage = {user_id: entry for user_id, entry in self._usage.items() if entry[0] == today}
+
+        try:
+            with metrics.timer("usage.flush_time"):
+                StorageBackend.instance().write_usage(rows)
+        except Exception as e:
+            bot_logger.error(f"Usage flush failed, will retry: {e}")
+            with self._lock:
+                self._dirty.update(user_id for user_id, _, _ in rows if user_id in self._usage)
+                self._pending += len(rows)
+            raise
+
+        metrics.increment("usage.flushed", len(rows))
+        return len(rows)
+
+    def start(self):
+        """Start flushing periodically on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Stop the periodic flush and write out everything still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+
+    async def _run(self):
+        """Flush every flush_interval seconds until cancelled."""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception:
+                pass  # already logged; the rows stay dirty for the next round
+
+    def _entry(self, user_id: int, limit_for_tier) -> list:
+        """Return today's counter for a user, loading it from the storage backend on first use."""
+        today = date.today().isoformat()
+        entry = self._usage.get(user_id)
+        if entry is not None and entry[0] == today:
+            return entry
+
+        row = StorageBackend.instance().get_profile(user_id)
+        _, tier, usage, last_reset = row if row else (None, Config.FREE, 0, None)
+        entry = [today, usage if last_reset == today else 0, limit_for_tier(tier)]
+        self._usage[user_id] = entry
+        return entry
+
+    def _mark_dirty(self, user_id: int):
+        """Record a change to write on the next flush; caller must hold the lock."""
+        self._dirty.add(user_id)
+        self._pending += 1
+        metrics.set_gauge("usage.pending", self._pending)
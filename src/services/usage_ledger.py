@@ -0,0 +1,164 @@
+"""Day-bucketed usage history with precomputed daily and hourly rollups."""
+
+from datetime import date, datetime, timedelta
+from config import Config
+from services.database import Database
+
+
+class UsageLedger:
+    """
+    Records delivered audio per (day, user_id) and keeps rollups current.
+
+    Every record() updates the user's ledger row, the day's rollup and the
+    hour's rollup in one transaction, so admin statistics read a handful
+    of rollup rows instead of aggregating the ledger. Old buckets are
+    removed with range deletes on the day-leading primary keys.
+    """
+
+    LEDGER_SQL = """
+        INSERT INTO usage_ledger (day, user_id, requests, characters, audio_seconds)
+        VALUES (?, ?, 1, ?, ?)
+        ON CONFLICT(day, user_id) DO UPDATE SET
+            requests = requests + 1,
+            characters = characters + excluded.characters,
+            audio_seconds = audio_seconds + excluded.audio_seconds
+        RETURNING requests
+    """
+
+    DAILY_SQL = """
+        INSERT INTO usage_daily (day, users, requests, characters, audio_seconds)
+        VALUES (?, ?, 1, ?, ?)
+        ON CONFLICT(day) DO UPDATE SET
+            users = users + excluded.users,
+            requests = requests + 1,
+            characters = characters + excluded.characters,
+            audio_seconds = audio_seconds + excluded.audio_seconds
+    """
+
+    HOURLY_SQL = """
+        INSERT INTO usage_hourly (hour, requests, characters, audio_seconds)
+        VALUES (?, 1, ?, ?)
+        ON CONFLICT(hour) DO UPDATE SET
+            requests = requests + 1,
+            characters = characters + excluded.characters,
+            audio_seconds = audio_seconds + excluded.audio_seconds
+    """
+
+    def __init__(self):
+        self.db = Database.instance()
+        self._create_tables()
+
+    def _create_tables(self):
+        """Create the ledger and rollup tables if they do not exist."""
+        self.db.ensure_schema("usage_ledger", """
+            CREATE TABLE IF NOT EXISTS usage_ledger (
+                day TEXT NOT NULL,
+                user_id INTEGER NOT NULL,
+                requests INTEGER NOT NULL,
+                characters INTEGER NOT NULL,
+                audio_seconds REAL NOT NULL,
+                PRIMARY KEY (day, user_id)
+            ) WITHOUT ROWID
+        """, """
+            CREATE TABLE IF NOT EXISTS usage_daily (
+                day TEXT PRIMARY KEY,
+                users INTEGER NOT NULL,
+                requests INTEGER NOT NULL,
+                characters INTEGER NOT NULL,
+                audio_seconds REAL NOT NULL
+            ) WITHOUT ROWID
+        """, """
+            CREATE TABLE IF NOT EXISTS usage_hourly (
+                hour TEXT PRIMARY KEY,
+                requests INTEGER NOT NULL,
+                characters INTEGER NOT NULL,
+                audio_seconds REAL NOT NULL
+            ) WITHOUT ROWID
+        """)
+
+    def record(self, user_id: int, characters: int, audio_seconds: float, when: datetime = None):
+        """
+        Record one delivered audio message.
+
+        Args:
+            user_id (int): Telegram user ID.
+            characters (int): Length of the synthesized text.
+            audio_seconds (float): Duration of the delivered audio.
+            when (datetime): Delivery time. Defaults to now.
+        """
+        when = when or datetime.now()
+        day = when.date().isoformat()
+        with self.db.transaction():
+            rows = self.db.fetchall(self.LEDGER_SQL, (day, user_id, characters, audio_seconds))
+            first_today = rows[0][0] == 1
+            self.db.execute(self.DAILY_SQL, (day, int(first_today), characters, audio_seconds))
+            self.db.execute(self.HOURLY_SQL, (when.strftime("%Y-%m-%d %H"), characters, audio_seconds))
+
+    def get_user_day(self, user_id: int, day: str = None) -> dict:
+        """Return one user's totals for a day (default today)."""
+        row = self.db.fetchone(
+            "SELECT requests, characters, audio_seconds FROM usage_ledger WHERE day = ? AND user_id = ?",
+            (day or date.today().isoformat(), user_id)
+        )
+        requests, characters, audio_seconds = row or (0, 0, 0.0)
+        return {'requests': requests, 'characters': characters, 'audio_seconds': audio_seconds}
+
+    def daily_stats(self, days: int = 7) -> list[dict]:
+        """
+        Return per-day totals for the last days days, newest first.
+
+        Returns:
+            list[dict]: One entry per day with users, requests, characters and audio_seconds.
+        """
+        since = (date.today() - timedelta(days=days - 1)).isoformat()
+        rows = self.db.fetchall("""
+            SELECT day, users, requests, characters, audio_seconds
+            FROM usage_daily WHERE day >= ? ORDER BY day DESC
+        """, (since,))
+        return [
+            {'day': day, 'users': users, 'requests': requests, 'characters': characters, 'audio_seconds': seconds}
+            for day, users, requests, characters, seconds in rows
+        ]
+
+    def hourly_stats(self, day: str = None) -> list[dict]:
+        """Return per-hour totals of a day (default today), in hour order."""
+        day = day or date.today().isoformat()
+        rows = self.db.fetchall("""
+            SELECT hour, requests, characters, audio_seconds
+            FROM usage_hourly WHERE hour >= ? AND hour < ? ORDER BY hour
+        """, (f"{day} 00", f"{day} 24"))
+        return [
+            {'hour': int(hour[-2:]), 'requests': requests, 'characters': characters, 'audio_seconds': seconds}
+            for hour, requests, characters, seconds in rows
+        ]
+
+    def top_users(self, day: str = None, limit: int = 10) -> list[tuple]:
+        """Return (user_id, requests, characters) of the heaviest users of a day (default today)."""
+        return self.db.fetchall("""
+            SELECT user_id, requests, characters FROM usage_ledger
+            WHERE day = ? ORDER BY characters DESC LIMIT ?
+        """, (day or date.today().isoformat(), limit))
+
+    def prune(self, retention_days: int = None, hourly_retention_days: int = None) -> int:
+        """
+        Delete buckets older than the retention windows in bulk.
+
+        Args:
+            retention_days (int): Days of ledger rows and daily rollups to keep.
+                Defaults to Config.USAGE_LEDGER_RETENTION_DAYS.
+            hourly_retention_days (int): Days of hourly rollups to keep.
+                Defaults to Config.USAGE_HOURLY_RETENTION_DAYS.
+
+        Returns:
+            int: Number of rows deleted.
+        """
+        today = date.today()
+        cutoff = (today - timedelta(days=retention_days or Config.USAGE_LEDGER_RETENTION_DAYS)).isoformat()
+        hourly_days = hourly_retention_days or Config.USAGE_HOURLY_RETENTION_DAYS
+        hourly_cutoff = (today - timedelta(days=hourly_days)).isoformat()
+
+        with self.db.transaction():
+            deleted = self.db.execute("DELETE FROM usage_ledger WHERE day < ?", (cutoff,))
+            deleted += self.db.execute("DELETE FROM usage_daily WHERE day < ?", (cutoff,))
+            deleted += self.db.execute("DELETE FROM usage_hourly WHERE hour < ?", (hourly_cutoff,))
+        return deleted
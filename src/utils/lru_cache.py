@@ -0,0 +1,75 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache bounded by total size in bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def total_bytes(self) -> int:
+        """Total size of all cached values."""
+        return self._total_bytes
+
+    def get(self, key, default=None):
+        """Return the value for key and mark it as recently used."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size: int = None) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay within budget.
+
+        Args:
+            key: Cache key.
+            value: Value to store.
+            size (int): Size of the value in bytes. Defaults to len(value).
+
+        Returns:
+            bool: False if the value alone exceeds the budget and was not stored.
+        """
+        size = len(value) if size is None else size
+        with self._lock:
+            self._remove(key)
+            if size > self.max_bytes:
+                return False
+            self._entries[key] = (value, size)
+            self._total_bytes += size
+            while self._total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total_bytes -= evicted_size
+            return True
+
+    def pop(self, key, default=None):
+        """Remove key and return its value."""
+        with self._lock:
+            entry = self._remove(key)
+            return default if entry is None else entry[0]
+
+    def clear(self):
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key):
+        """Remove key without locking; caller must hold the lock."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._total_bytes -= entry[1]
+        return entry
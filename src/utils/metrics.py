@@ -0,0 +1,80 @@
+"""Lightweight in-process metrics registry."""
+import threading
+import time
+from contextlib import contextmanager
+
+
+class Metrics:
+    """Thread-safe counters, gauges and timing summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._gauges = {}
+        self._timings = {}
+
+    def increment(self, name: str, value: int = 1):
+        """Increase a counter by the given value."""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def set_gauge(self, name: str, value: float):
+        """Record the current value of a gauge."""
+        with self._lock:
+            self._gauges[name] = value
+
+    def observe(self, name: str, seconds: float):
+        """Record a duration sample (count, total and max are kept)."""
+        with self._lock:
+            stats = self._timings.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+            stats['count'] += 1
+            stats['total'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Context manager that records the duration of its block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def get_counter(self, name: str) -> int:
+        """Return the current value of a counter."""
+        with self._lock:
+            return self._counters.get(name, 0)
+
+    def get_gauge(self, name: str, default: float = 0) -> float:
+        """Return the current value of a gauge."""
+        with self._lock:
+            return self._gauges.get(name, default)
+
+    def snapshot(self) -> dict:
+        """
+        Return a copy of all metrics.
+
+        Returns:
+            dict: Counters, gauges and timings (with average) by name.
+        """
+        with self._lock:
+            timings = {
+                name: {**stats, 'avg': stats['total'] / stats['count'] if stats['count'] else 0.0}
+                for name, stats in self._timings.items()
+            }
+            return {
+                'counters': dict(self._counters),
+                'gauges': dict(self._gauges),
+                'timings': timings,
+            }
+
+    def reset(self):
+        """Clear all recorded metrics."""
+        with self._lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._timings.clear()
+
+
+# Global metrics registry
+metrics = Metrics()
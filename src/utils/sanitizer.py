@@ -0,0 +1,160 @@
+import re
+
+
+class SanitizeResult:
+    """
+    Outcome of one Sanitizer.scan().
+
+    Attributes:
+        text (str): Input with every flagged span removed and outer whitespace stripped.
+        flags (frozenset): Categories found, e.g. {'tag', 'event_handler'}.
+        spans (tuple): (flag, start, end) of each removed span, as offsets into the original text.
+            Spans that only formed after a first removal (e.g. 'java<b>script:') are not
+            listed; they set the 'nested' flag instead.
+    """
+
+    # Content that makes text unfit for synthesis, not just in need of cleaning.
+    # Each is looked for on its own, as TextValidator always did, so a span
+    # removed as a plain tag cannot hide a script that overlaps it.
+    DANGEROUS = frozenset({'script', 'event_handler', 'script_url'})
+
+    def __init__(self, text: str, flags: frozenset, spans: tuple):
+        self.text = text
+        self.flags = flags
+        self.spans = spans
+
+    @property
+    def is_clean(self) -> bool:
+        """True if nothing was removed."""
+        return not self.flags
+
+    @property
+    def is_dangerous(self) -> bool:
+        """True if the text carried script, event handlers or script URLs."""
+        return not self.DANGEROUS.isdisjoint(self.flags)
+
+
+class Sanitizer:
+    """
+    Single-pass scanner that finds and removes markup and script payloads.
+
+    Every pattern contains one of a few trigger characters: tags start
+    with '<', handlers end in '=', URLs in ':' and calls in '('. A charset
+    search finds the triggers and the full pattern is only tried in a
+    small window around each, so text without them costs one fast scan.
+    """
+
+    # One alternation; order matters where alternatives overlap
+    PATTERN = re.compile(
+        r'(?P<script><script.*?>.*?</script>)'
+        r'|(?P<tag><[^>]*>)'
+        r'|(?P<event_handler>on\w+\s*=)'
+        r'|(?P<script_url>(?:java|vb)script:)'
+        r'|(?P<data_url>data:)'
+        r'|(?P<script_call>(?:alert|eval|expression)\()',
+        re.IGNORECASE,
+    )
+
+    TRIGGERS = re.compile(r'[<=:(]')
+
+    # Longest literal before a ':' or '(' trigger ('javascript', 'expression')
+    PREFIX_LENGTH = 10
+
+    # The dangerous categories on their own, for verdicts that do not depend on removal order
+    SCRIPT = re.compile(r'<script.*?>.*?</script>', re.IGNORECASE)
+    EVENT_HANDLER = re.compile(r'on\w+\s*=', re.IGNORECASE)
+    SCRIPT_URL = re.compile(r'(?:java|vb)script:', re.IGNORECASE)
+
+    MAX_PASSES = 4
+
+    @classmethod
+    def scan(cls, text: str) -> SanitizeResult:
+        """
+        Sanitize and classify text in one pass.
+
+        Removing a span can join its neighbours into a new match
+        ('on<b>click='). Such text is rescanned, up to MAX_PASSES times,
+        and flagged 'nested'.
+
+        Args:
+            text (str): Raw user input.
+
+        Returns:
+            SanitizeResult: Clean text, the categories found and where they were.
+        """
+        if not text:
+            return SanitizeResult(text or "", frozenset(), ())
+
+        flags = set()
+        clean, matches = cls._remove(text, flags)
+        if not matches:
+            return SanitizeResult(text.strip(), frozenset(), ())
+
+        spans = []
+        for match in matches:
+            flag = match.lastgroup
+            spans.append((flag, match.start(), match.end()))
+            flags.add(flag)
+
+        for _ in range(cls.MAX_PASSES - 1):
+            clean, nested = cls._remove(clean)
+            if not nested:
+                break
+            flags.add('nested')
+        return SanitizeResult(clean.strip(), frozenset(flags), tuple(spans))
+
+    @classmethod
+    def _remove(cls, text: str, dangers: set = None) -> tuple:
+        """
+        Return text without its matches, and the matches, leftmost first.
+
+        If a dangers set is given, the dangerous categories anywhere in
+        text are added to it in the same walk, including those overlapping
+        or inside a removed span. Each one is checked at its trigger: the
+        '<' of a script, the ':' of a script URL, the '=' of a handler.
+        """
+        pieces, matches = [], []
+        position = 0
+        for trigger in cls.TRIGGERS.finditer(text):
+            at = trigger.start()
+            char = text[at]
+            if dangers is not None:
+                if char == '<':
+                    if 'script' not in dangers and cls.SCRIPT.match(text, at):
+                        dangers.add('script')
+                elif char == '=':
+                    if 'event_handler' not in dangers:
+                        start = at
+                        while start > 0 and text[start - 1].isspace():
+                            start -= 1
+                        while start > 0 and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                            start -= 1
+                        if cls.EVENT_HANDLER.search(text, start, at + 1):
+                            dangers.add('event_handler')
+                elif char == ':':
+                    if 'script_url' not in dangers and \
+                            cls.SCRIPT_URL.search(text, max(0, at - cls.PREFIX_LENGTH), at + 1):
+                        dangers.add('script_url')
+            if at < position:
+                continue
+            if char == '<':
+                match = cls.PATTERN.match(text, at)
+            elif char == '=':
+                # Back over whitespace and the word an 'on...' handler would be in
+                start = at
+                while start > position and text[start - 1].isspace():
+                    start -= 1
+                while start > position and (text[start - 1].isalnum() or text[start - 1] == '_'):
+                    start -= 1
+                match = cls.PATTERN.search(text, start, at + 1)
+            else:
+                match = cls.PATTERN.search(text, max(position, at - cls.PREFIX_LENGTH), at + 1)
+            if match:
+                matches.append(match)
+                pieces.append(text[position:match.start()])
+                position = match.end()
+
+        if not matches:
+            return text, matches
+        pieces.append(text[position:])
+        return ''.join(pieces), matches
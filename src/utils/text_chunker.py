@@ -0,0 +1,81 @@
+import re
+
+
+class TextChunker:
+    """Split long texts into sentence-aligned chunks for parallel synthesis."""
+
+    # Sentence terminators for English and Persian, followed by whitespace or end of text
+    SENTENCE_PATTERN = re.compile(r'[^.!?؟۔…\n]*(?:[.!?؟۔…]+[\'"»)\]]*|\n+|$)\s*')
+
+    # Clause separators used when a single sentence is too long
+    CLAUSE_PATTERN = re.compile(r'[^,،;؛:]*(?:[,،;؛:]+|$)\s*')
+
+    @classmethod
+    def split(cls, text: str, max_chars: int) -> list:
+        """
+        Split text into chunks of at most max_chars, breaking on sentence boundaries.
+
+        Sentences are packed greedily into chunks. Sentences longer than
+        max_chars are broken at clause punctuation, then at whitespace.
+
+        Args:
+            text (str): Text to split.
+            max_chars (int): Maximum chunk length.
+
+        Returns:
+            list: Non-empty chunks in original order.
+        """
+        text = (text or "").strip()
+        if not text:
+            return []
+        if len(text) <= max_chars:
+            return [text]
+
+        pieces = []
+        for sentence in cls._match_all(cls.SENTENCE_PATTERN, text):
+            if len(sentence) <= max_chars:
+                pieces.append(sentence)
+            else:
+                pieces.extend(cls._split_long_sentence(sentence, max_chars))
+
+        chunks, current = [], ""
+        for piece in pieces:
+            if current and len(current) + len(piece) > max_chars:
+                chunks.append(current.strip())
+                current = ""
+            current += piece
+        if current.strip():
+            chunks.append(current.strip())
+
+        return [chunk for chunk in chunks if chunk]
+
+    @classmethod
+    def _split_long_sentence(cls, sentence: str, max_chars: int) -> list:
+        """Break an oversized sentence at clauses, then words, then hard limits."""
+        pieces = []
+        for clause in cls._match_all(cls.CLAUSE_PATTERN, sentence):
+            if len(clause) <= max_chars:
+                pieces.append(clause)
+                continue
+
+            current = ""
+            for word in re.findall(r'\S+\s*', clause):
+                while len(word) > max_chars:
+                    if current:
+                        pieces.append(current)
+                        current = ""
+                    pieces.append(word[:max_chars])
+                    word = word[max_chars:]
+                if current and len(current) + len(word) > max_chars:
+                    pieces.append(current)
+                    current = ""
+                current += word
+            if current:
+                pieces.append(current)
+
+        return pieces
+
+    @staticmethod
+    def _match_all(pattern: re.Pattern, text: str) -> list:
+        """Return all non-empty matches of pattern in text."""
+        return [match.group(0) for match in pattern.finditer(text) if match.group(0)]
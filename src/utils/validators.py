@@ -1,4 +1,5 @@
 import re
+from utils.sanitizer import Sanitizer
 
 class TextValidator:
     """Advanced text validation and sanitization for TTS."""
@@ -7,41 +8,22 @@ class TextValidator:
         r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]'
     )
 
-    SUSPICIOUS_PATTERNS = [
-        re.compile(r'<script.*?>.*?</script>', re.IGNORECASE),
-        re.compile(r'on\w+\s*=', re.IGNORECASE),
-        re.compile(r'javascript:', re.IGNORECASE),
-        re.compile(r'vbscript:', re.IGNORECASE),
-    ]
-
     def is_valid_text(self, text: str) -> bool:
         """Validate text for TTS processing."""
         if not text or not text.strip():
             return False
 
-        cleaned = text.strip()
-
-        # Check for suspicious patterns
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            if pattern.search(cleaned):
-                return False
-
-        # Must contain at least one alphanumeric character
-        if not any(char.isalnum() for char in cleaned):
+        result = Sanitizer.scan(text)
+        if result.is_dangerous:
             return False
 
-        return True
+        # Must contain at least one alphanumeric character
+        return any(char.isalnum() for char in text)
 
     def sanitize_text(self, text: str) -> str:
         """Remove potentially dangerous content from text."""
-        sanitized = text or ""
-
-        for pattern in self.SUSPICIOUS_PATTERNS:
-            sanitized = pattern.sub('', sanitized)
-
         # Normalize whitespace
-        sanitized = re.sub(r'\s+', ' ', sanitized).strip()
-        return sanitized
+        return ' '.join(Sanitizer.scan(text).text.split())
 
     def is_persian_text(self, text: str) -> bool:
         """Detect if text is primarily Persian/Arabic."""
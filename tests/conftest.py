@@ -100,6 +100,7 @@ def fake_update_and_context():
             self.text = text
             self.reply_text = AsyncMock()
             self.reply_audio = AsyncMock()
+            self.reply_chat_action = AsyncMock()
 
     class FakeUser:
         id = 12345
@@ -116,3 +117,26 @@ def fake_update_and_context():
             self.job_queue = None
 
     return FakeUpdate, FakeContext
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_caches():
+    """Clear process-wide caches and close the shared database between tests."""
+    from services.tts_service import TTSService
+    from services.cache_service import CacheService
+    from services.database import Database
+    from services.usage_counter import UsageCounter
+    from services.db_worker import DatabaseWorker
+    from services.profile_cache import ProfileCache
+    from services.storage import StorageBackend
+    from services.admission import AdmissionController
+    TTSService._base_renderings.clear()
+    UsageCounter._instance = None
+    ProfileCache._instance = None
+    StorageBackend._instance = None
+    AdmissionController._instance = None
+    CacheService._memory.clear()
+    Database.shutdown()  # reopened lazily at this test's Config.DATABASE_PATH
+    yield
+    DatabaseWorker.shutdown()
+    Database.shutdown()
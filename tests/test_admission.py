@@ -0,0 +1,155 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from config import Config
+from handlers.audio_handler import AudioHandler
+from handlers.start_handler import StartHandler
+from handlers.text_handler import TextHandler
+from services.admission import AdmissionController, AdmissionRejected
+from services.synthesis_pool import SynthesisCancelled
+from utils.metrics import metrics
+
+INTERACTIVE_PREMIUM = AdmissionController.priority(AdmissionController.INTERACTIVE, Config.PREMIUM)
+INTERACTIVE_FREE = AdmissionController.priority(AdmissionController.INTERACTIVE, Config.FREE)
+BATCH_FREE = AdmissionController.priority(AdmissionController.BATCH, Config.FREE)
+
+
+async def hold(controller, priority, order, name, release):
+    """Take a slot, note the admission order and keep it until released."""
+    async with controller.admit(priority):
+        order.append(name)
+        await release.wait()
+
+
+async def hold_for_user(controller, user_id, release):
+    """Take a slot on behalf of a user and keep it until released."""
+    async with controller.admit(INTERACTIVE_FREE, user_id):
+        await release.wait()
+
+
+def test_lanes_are_ordered():
+    """Ensure interactive beats batch and premium beats free within a lane."""
+    assert INTERACTIVE_PREMIUM < INTERACTIVE_FREE < BATCH_FREE
+    assert INTERACTIVE_FREE < AdmissionController.priority(AdmissionController.BATCH, Config.PREMIUM)
+
+
+@pytest.mark.asyncio
+async def test_waiters_are_admitted_by_priority():
+    """Ensure the global limit holds and freed slots go to the most urgent waiter."""
+    controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait=5)
+    order, release = [], asyncio.Event()
+
+    first = asyncio.create_task(hold(controller, BATCH_FREE, order, "running", release))
+    await asyncio.sleep(0)
+    waiters = [
+        asyncio.create_task(hold(controller, priority, order, name, release))
+        for name, priority in (("batch", BATCH_FREE), ("free", INTERACTIVE_FREE), ("premium", INTERACTIVE_PREMIUM))
+    ]
+    await asyncio.sleep(0)
+    assert controller.active == 1
+    assert controller.queue_depth == 3
+
+    release.set()
+    await asyncio.gather(first, *waiters)
+    assert order == ["running", "premium", "free", "batch"]
+    assert controller.active == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_lowest_priority():
+    """Ensure an urgent request displaces a batch waiter and a batch request is refused outright."""
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait=5)
+    order, release = [], asyncio.Event()
+    shed = metrics.get_counter("admission.shed")
+
+    running = asyncio.create_task(hold(controller, BATCH_FREE, order, "running", release))
+    await asyncio.sleep(0)
+    queued_batch = asyncio.create_task(hold(controller, BATCH_FREE, order, "batch", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        await hold(controller, BATCH_FREE, order, "late batch", release)
+
+    urgent = asyncio.create_task(hold(controller, INTERACTIVE_FREE, order, "urgent", release))
+    await asyncio.sleep(0)
+    with pytest.raises(AdmissionRejected):
+        await queued_batch
+
+    release.set()
+    await asyncio.gather(running, urgent)
+    assert order == ["running", "urgent"]
+    assert metrics.get_counter("admission.shed") - shed == 2
+
+
+@pytest.mark.asyncio
+async def test_wait_is_bounded():
+    """Ensure a request that cannot get a slot in time is shed instead of hanging."""
+    controller = AdmissionController(max_concurrent=1, max_queue=5, max_wait=0.05)
+    release = asyncio.Event()
+    running = asyncio.create_task(hold(controller, INTERACTIVE_FREE, [], "running", release))
+    await asyncio.sleep(0)
+
+    with pytest.raises(AdmissionRejected):
+        await hold(controller, INTERACTIVE_FREE, [], "waiting", release)
+    assert controller.queue_depth == 0
+
+    release.set()
+    await running
+    assert controller.active == 0
+
+
+@pytest.mark.asyncio
+async def test_busy_message_when_shed(fake_update_and_context):
+    """Ensure users get a localized busy message and no audio when synthesis is shed."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update, context = FakeUpdate("hello"), FakeContext()
+    handler = AudioHandler()
+
+    with patch.object(AdmissionController, "_acquire", side_effect=AdmissionRejected("queue full")):
+        success = await handler._generate_and_send_audio(update, context, "hello", 1.0, 12345, "en")
+
+    assert success is False
+    update.message.reply_audio.assert_not_called()
+    assert update.message.reply_text.call_args_list[-1].args[0] == handler.locale.get_text("en", "errors.busy")
+
+
+@pytest.mark.asyncio
+async def test_cancel_reaches_requests_waiting_for_admission(fake_update_and_context):
+    """Ensure /cancel stops a request that is still queued for a slot."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    controller = AdmissionController.instance()
+    controller.max_concurrent = 1
+    release = asyncio.Event()
+    running = asyncio.create_task(hold(controller, INTERACTIVE_FREE, [], "other user", release))
+    await asyncio.sleep(0)
+    waiting = asyncio.create_task(hold_for_user(controller, 12345, release))
+    await asyncio.sleep(0)
+    assert controller.queue_depth == 1
+
+    await StartHandler().cancel(FakeUpdate("/cancel"), FakeContext())
+
+    with pytest.raises(SynthesisCancelled):
+        await waiting
+    assert controller.queue_depth == 0
+    release.set()
+    await running
+    assert controller.active == 0
+
+
+@pytest.mark.asyncio
+async def test_speculative_render_waits_in_lowest_lane(monkeypatch):
+    """Ensure speculative renders take an admission slot behind batch work."""
+    handler = TextHandler()
+    priorities = []
+    original = AdmissionController._acquire
+
+    async def recording_acquire(self, priority, user_id=None):
+        priorities.append(priority)
+        await original(self, priority, user_id)
+
+    monkeypatch.setattr(AdmissionController, "_acquire", recording_acquire)
+    monkeypatch.setattr(handler.tts_service, "prerender", lambda text: None)
+
+    await handler._speculative_render(12345, "hello there")
+
+    assert priorities and priorities[0] > BATCH_FREE
@@ -0,0 +1,61 @@
+import gc
+import os
+from telegram import InputFile
+from config import Config
+from services.audio_buffer import AudioBuffer
+from services.audio_codec import AudioCodec
+from services.tts_service import TTSService
+
+
+def test_small_audio_stays_in_memory():
+    """Ensure small clips are uploaded straight from memory without touching disk."""
+    audio = AudioBuffer(b"MP3DATA", duration=3)
+
+    assert not audio.spilled
+    assert audio.size == 7
+    assert audio.duration == 3
+    upload = audio.input_file()
+    assert isinstance(upload, InputFile)
+    assert upload.input_file_content == b"MP3DATA"
+    assert upload.filename.endswith(".mp3")
+    assert os.listdir(Config.TEMP_AUDIO_DIR) == []
+
+
+def test_large_audio_spills_to_disk_and_is_cleaned_up(monkeypatch):
+    """Ensure clips above the spill threshold go to a temp file that is deleted with the buffer."""
+    monkeypatch.setattr(Config, "AUDIO_SPILL_BYTES", 4)
+    audio = AudioBuffer(b"MP3DATA")
+
+    assert audio.spilled
+    assert audio.data == b"MP3DATA"
+    path = audio.path
+    assert os.path.exists(path)
+
+    del audio
+    gc.collect()
+    assert not os.path.exists(path)
+
+
+def mp3_frames(count: int) -> bytes:
+    """MPEG-2 Layer III frames as gTTS produces them: 24 kHz, 32 kbit/s, 576 samples and 96 bytes each."""
+    return (b"\xff\xf3\x44\xc4" + b"\x00" * 92) * count
+
+
+def test_duration_is_measured_from_mp3_frames():
+    """Ensure the duration comes from the frame headers, across tags and concatenated chunks."""
+    one_second = mp3_frames(24000 // 576)
+    id3 = b"ID3\x04\x00\x00\x00\x00\x00\x05" + b"\x00" * 5
+    chunks = id3 + one_second + one_second + b"junk" + mp3_frames(125 - 2 * len(one_second) // 96)
+
+    assert abs(AudioCodec.mp3_duration(mp3_frames(125)) - 3.0) < 1e-9
+    assert abs(AudioCodec.mp3_duration(chunks) - 3.0) < 1e-9
+    assert AudioCodec.mp3_duration(b"MP3DATA") is None
+
+
+def test_render_buffer_reports_real_duration(monkeypatch):
+    """Ensure uploads carry the measured length, not a word-count guess, and omit it when unknown."""
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(lambda t, l, s: mp3_frames(125)))
+    assert TTSService().render_buffer("hi").duration == 3
+
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(lambda t, l, s: b"not audio"))
+    assert TTSService().render_buffer("a much longer text with many words in it").duration is None
@@ -59,3 +59,135 @@ async def test_audio_handler_processes_audio(fake_update_and_context, monkeypatc
 
     # Test is permissive: ensure method ran without exception
     assert True
+
+
+@pytest.mark.asyncio
+async def test_failed_synthesis_refunds_quota(fake_update_and_context, monkeypatch):
+    """
+    Test that quota reserved for a text is given back when synthesis fails.
+    """
+    from handlers.audio_handler import AudioHandler
+
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("1.0x")
+    context = FakeContext()
+    context.user_data["text_to_process"] = "Hello there"
+
+    handler = AudioHandler()
+    user_id = update.effective_user.id
+    assert handler.quota_service.reserve(user_id)
+
+    def fail(text, speed=1.0):
+        raise RuntimeError("gTTS down")
+
+    monkeypatch.setattr(handler.tts_service, "render_buffer", fail)
+    await handler.handle_speed_selection(update, context)
+
+    assert handler.user_session.get_daily_usage(user_id) == 0
+
+
+async def convert_once(fake_update_and_context, monkeypatch):
+    """Run one speed selection with a stubbed renderer; return the update and the API calls it counted."""
+    from handlers.audio_handler import AudioHandler
+    from services.audio_buffer import AudioBuffer
+    from utils.metrics import metrics
+
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("1.0x")
+    context = FakeContext()
+    context.user_data["text_to_process"] = "Hello there"
+
+    handler = AudioHandler()
+    monkeypatch.setattr(handler.tts_service, "render_buffer", lambda text, speed=1.0: AudioBuffer(b"FAKE", 1))
+    calls = metrics.get_counter("delivery.api_calls")
+
+    state = await handler.handle_speed_selection(update, context)
+
+    assert state == Config.CONTINUOUS_MODE
+    return update, metrics.get_counter("delivery.api_calls") - calls
+
+
+@pytest.mark.asyncio
+async def test_lean_delivery_sends_one_message(fake_update_and_context, monkeypatch):
+    """
+    Test that lean delivery shows a chat action and puts caption and keyboard on the audio.
+    """
+    monkeypatch.setattr(Config, "LEAN_DELIVERY", True)
+    update, api_calls = await convert_once(fake_update_and_context, monkeypatch)
+
+    update.message.reply_chat_action.assert_called_with("upload_voice")
+    update.message.reply_text.assert_not_called()
+    kwargs = update.message.reply_audio.call_args.kwargs
+    assert kwargs["caption"] and kwargs["reply_markup"] is not None
+    assert api_calls == 2
+
+
+@pytest.mark.asyncio
+async def test_classic_delivery_call_count(fake_update_and_context, monkeypatch):
+    """
+    Test that the classic flow still sends progress, success and keyboard messages.
+    """
+    monkeypatch.setattr(Config, "LEAN_DELIVERY", False)
+    update, api_calls = await convert_once(fake_update_and_context, monkeypatch)
+
+    update.message.reply_chat_action.assert_not_called()
+    assert update.message.reply_text.call_count == 3
+    assert api_calls == 6
+
+
+@pytest.mark.asyncio
+async def test_repeated_speed_taps_convert_once(fake_update_and_context, monkeypatch):
+    """
+    Test that a second speed tap during a conversion neither renders again nor refunds.
+    """
+    import asyncio
+    import threading
+    from handlers.audio_handler import AudioHandler
+    from services.audio_buffer import AudioBuffer
+
+    FakeUpdate, FakeContext = fake_update_and_context
+    context = FakeContext()
+    context.user_data["text_to_process"] = "Hello there"
+    handler = AudioHandler()
+    user_id = FakeUpdate().effective_user.id
+    assert handler.quota_service.reserve(user_id)
+
+    renders, release = [], threading.Event()
+
+    def slow_render(text, speed=1.0):
+        renders.append(speed)
+        release.wait(5)
+        return AudioBuffer(b"FAKE", 1)
+
+    monkeypatch.setattr(handler.tts_service, "render_buffer", slow_render)
+    first = asyncio.create_task(handler.handle_speed_selection(FakeUpdate("1.0x"), context))
+    await asyncio.sleep(0.05)
+    second_update = FakeUpdate("2.0x")
+    second = await handler.handle_speed_selection(second_update, context)
+    release.set()
+
+    assert await first == Config.CONTINUOUS_MODE
+    assert second == Config.AWAITING_SPEED
+    assert renders == [1.0]
+    second_update.message.reply_text.assert_not_called()
+    assert handler.user_session.get_daily_usage(user_id) == 1
+
+
+@pytest.mark.asyncio
+async def test_usage_records_measured_duration(fake_update_and_context, monkeypatch):
+    """
+    Test that the usage ledger gets the measured length of synthesized audio, not an estimate.
+    """
+    from handlers.audio_handler import AudioHandler
+    from services.audio_buffer import AudioBuffer
+
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("1.0x")
+    context = FakeContext()
+    context.user_data["text_to_process"] = "Hello there"
+
+    handler = AudioHandler()
+    monkeypatch.setattr(handler.tts_service, "render_buffer", lambda text, speed=1.0: AudioBuffer(b"FAKE", 7))
+    await handler.handle_speed_selection(update, context)
+
+    assert handler.usage_ledger.get_user_day(update.effective_user.id)["audio_seconds"] == 7
@@ -31,16 +31,13 @@ async def test_batch_input_simple_text(fake_update_and_context, monkeypatch):
 
     handler = BatchHandler()
 
-    # Mock TTS output to a fake file path
+    # Mock TTS output to fake audio bytes
     monkeypatch.setattr(
         handler.tts_service,
-        "convert_text_to_speech",
-        lambda text, speed=1.0: "/tmp/fake_audio.mp3"
+        "render_audio",
+        lambda text, speed=1.0: b"FAKEAUDIO"
     )
 
-    # Mock open to avoid actual file operations
-    monkeypatch.setattr("builtins.open", lambda *a, **k: open(__file__, "rb"))
-
     state = await handler.handle_batch_input(update, context)
 
     # Should return to main menu (StartHandler.main_menu returns an int normally)
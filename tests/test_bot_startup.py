@@ -23,3 +23,51 @@ def test_bot_import_does_not_crash(monkeypatch):
         pytest.skip(f"Importing bot module failed: {e}")
 
     assert bot_module is not None
+
+
+def command_update(text: str, user_id: int = 12345):
+    """A private-chat Update carrying a bot command, as Telegram delivers it."""
+    from datetime import datetime
+    from telegram import Chat, Message, MessageEntity, Update, User
+    message = Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=user_id, type=Chat.PRIVATE),
+        from_user=User(id=user_id, first_name="Test", is_bot=False),
+        text=text,
+        entities=[MessageEntity(MessageEntity.BOT_COMMAND, 0, len(text))],
+    )
+    return Update(update_id=1, message=message)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("state_name", ["AWAITING_TEXT", "AWAITING_SPEED", "CONTINUOUS_MODE"])
+async def test_cancel_command_reaches_cancel_in_every_state(state_name, monkeypatch):
+    """Ensure /cancel is dispatched to StartHandler.cancel rather than eaten by a text handler."""
+    from unittest.mock import AsyncMock
+    from telegram import User
+    from telegram.ext import Application, CallbackContext, ConversationHandler
+    from config import Config
+    from bot import TextToSpeechBot
+
+    bot = TextToSpeechBot()
+    cancel = AsyncMock(return_value=ConversationHandler.END)
+    monkeypatch.setattr(bot.start_handler, "cancel", cancel)
+    bot.application = Application.builder().token("123:TEST").build()
+    bot.setup_handlers()
+    conversation = next(
+        handler for handler in bot.application.handlers[0] if isinstance(handler, ConversationHandler)
+    )
+    # CommandHandler matches the bot's username, which normally comes from getMe
+    bot.application.bot._bot_user = User(id=1, first_name="Bot", is_bot=True, username="tts_bot")
+    update = command_update("/cancel")
+    update.set_bot(bot.application.bot)
+    update.message.set_bot(bot.application.bot)
+    conversation._conversations[(update.effective_chat.id, update.effective_user.id)] = getattr(Config, state_name)
+
+    check = conversation.check_update(update)
+    assert check is not None
+    context = CallbackContext.from_update(update, bot.application)
+    await conversation.handle_update(update, bot.application, check, context)
+
+    cancel.assert_awaited_once()
@@ -0,0 +1,99 @@
+import os
+import time
+from unittest.mock import patch
+from config import Config
+from services.cache_service import CacheService
+from utils.metrics import metrics
+
+
+def test_cache_keys_distinguish_base_and_derived_variants():
+    """Ensure base renderings and derived speed variants never share a key."""
+    cache = CacheService()
+
+    base = cache.get_cache_key("hello", 1.0, "en", CacheService.BASE)
+    derived = cache.get_cache_key("hello", 1.0, "en", CacheService.DERIVED)
+
+    assert base != derived
+    assert base == cache.get_cache_key("hello", 2.0, "en", CacheService.BASE)
+    assert derived != cache.get_cache_key("hello", 2.0, "en")
+
+
+def test_two_tier_cache_serves_from_memory_and_promotes_disk_hits():
+    """Ensure cached audio is served from RAM and disk hits are promoted back into memory."""
+    cache = CacheService()
+    cache.cache_audio("hello", 1.5, b"AUDIO", "en")
+
+    assert cache.get_audio("hello", 1.5, "en") == b"AUDIO"
+
+    CacheService._memory.clear()
+    assert cache.get_audio("hello", 1.5, "en") == b"AUDIO"  # from disk
+    key = cache.get_cache_key("hello", 1.5, "en")
+    assert key in CacheService._memory
+
+
+def test_cache_disabled_returns_nothing(monkeypatch):
+    """Ensure the cache is bypassed when caching is disabled."""
+    monkeypatch.setattr(Config, "ENABLE_AUDIO_CACHING", False)
+    cache = CacheService()
+    cache.cache_audio("hello", 1.0, b"AUDIO", "en")
+
+    assert cache.get_audio("hello", 1.0, "en") is None
+
+
+def test_disk_cache_uses_sharded_layout():
+    """Ensure cached clips are stored under two levels of key-prefix directories."""
+    cache = CacheService()
+    cache.cache_audio("hello", 1.5, b"AUDIO", "en")
+    key = cache.get_cache_key("hello", 1.5, "en")
+
+    path = cache.get_cached_audio("hello", 1.5, "en")
+    assert path == os.path.join(cache.cache_dir, key[:2], key[2:4], f"{key}.mp3")
+    assert os.path.exists(path)
+
+
+def test_disk_cache_evicts_to_low_watermark(monkeypatch):
+    """Ensure the disk cache evicts least recently used clips once it passes its budget."""
+    monkeypatch.setattr(Config, "AUDIO_CACHE_DISK_BYTES", 1000)
+    metrics.reset()
+    cache = CacheService()
+
+    for i in range(9):
+        cache.cache_audio(f"text {i}", 1.0, b"x" * 100, "en")
+    cache.get_cached_audio("text 0", 1.0, "en")  # keep the oldest one warm
+
+    cache.cache_audio("text 9", 1.0, b"x" * 100, "en")  # 1000 bytes > 950 high watermark
+
+    assert cache.index.total_bytes <= 800
+    assert cache.get_cached_audio("text 0", 1.0, "en") is not None
+    assert cache.get_cached_audio("text 1", 1.0, "en") is None
+    assert cache.get_cached_audio("text 9", 1.0, "en") is not None
+    assert metrics.get_counter("audio_cache.evictions") == 2
+
+
+def test_cleanup_removes_expired_entries_through_index():
+    """Ensure expired clips are found via the index and deleted from disk."""
+    cache = CacheService()
+    cache.cache_audio("old", 1.0, b"AUDIO", "en")
+    path = cache.get_cached_audio("old", 1.0, "en")
+
+    with patch("services.cache_service.time.time", return_value=time.time() + 25 * 3600):
+        cache.cleanup_old_cache()
+
+    assert not os.path.exists(path)
+    assert cache.index.total_bytes == 0
+    assert cache.get_cached_audio("old", 1.0, "en") is None
+
+
+def test_memory_hits_keep_clips_warm_on_disk(monkeypatch):
+    """Ensure clips served from RAM are not evicted from disk as if they were never read."""
+    monkeypatch.setattr(Config, "AUDIO_CACHE_DISK_BYTES", 1000)
+    cache = CacheService()
+
+    for i in range(9):
+        cache.cache_audio(f"text {i}", 1.0, b"x" * 100, "en")
+    assert cache.get_audio("text 0", 1.0, "en") is not None  # memory hit, touch is batched
+
+    cache.cache_audio("text 9", 1.0, b"x" * 100, "en")
+
+    assert cache.get_cached_audio("text 0", 1.0, "en") is not None
+    assert cache.get_cached_audio("text 1", 1.0, "en") is None
@@ -0,0 +1,60 @@
+import threading
+import pytest
+from config import Config
+from services.database import Database
+
+
+def test_instance_is_shared_and_tuned():
+    """Ensure one WAL-mode connection is shared across callers."""
+    db = Database.instance()
+
+    assert Database.instance() is db
+    assert db.fetchone("PRAGMA journal_mode")[0] == "wal"
+    assert db.fetchone("PRAGMA synchronous")[0] == 1  # NORMAL
+
+
+def test_shutdown_reopens_at_current_database_path(monkeypatch, tmp_path):
+    """Ensure the shared connection stays open until shutdown and then follows Config.DATABASE_PATH."""
+    db = Database.instance()
+    monkeypatch.setattr(Config, "DATABASE_PATH", tmp_path / "other.db")
+
+    assert Database.instance() is db
+
+    Database.shutdown()
+    other = Database.instance()
+
+    assert other is not db
+    assert other.path == tmp_path / "other.db"
+
+
+def test_nested_transaction_rolls_back_as_a_whole():
+    """Ensure an error in a nested block rolls back the outer transaction too."""
+    db = Database.instance()
+    db.ensure_schema("items", "CREATE TABLE IF NOT EXISTS items (name TEXT)")
+
+    with pytest.raises(RuntimeError):
+        with db.transaction():
+            db.execute("INSERT INTO items VALUES ('outer')")
+            with db.transaction():
+                db.execute("INSERT INTO items VALUES ('inner')")
+                raise RuntimeError("boom")
+
+    assert db.fetchall("SELECT name FROM items") == []
+
+
+def test_concurrent_writers_share_connection():
+    """Ensure writes from several threads are serialized safely."""
+    db = Database.instance()
+    db.ensure_schema("counter", "CREATE TABLE IF NOT EXISTS counter (n INTEGER)")
+
+    def write():
+        for _ in range(50):
+            db.execute("INSERT INTO counter VALUES (1)")
+
+    threads = [threading.Thread(target=write) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert db.fetchone("SELECT COUNT(*) FROM counter")[0] == 200
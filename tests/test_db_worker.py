@@ -0,0 +1,53 @@
+import asyncio
+import threading
+import pytest
+from services.database import Database
+from services.db_worker import DatabaseWorker
+from utils.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_on_database_thread():
+    """Ensure calls run off the event loop and return their result."""
+    worker = DatabaseWorker.instance()
+    loop_thread = threading.get_ident()
+
+    thread = await worker.submit(threading.get_ident)
+
+    assert thread != loop_thread
+    assert worker.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_failing_call_does_not_undo_its_batch():
+    """Ensure one failing call in a batch is rolled back alone and its error reaches the caller."""
+    db = Database.instance()
+    db.ensure_schema("notes", "CREATE TABLE IF NOT EXISTS notes (body TEXT)")
+    worker = DatabaseWorker.instance()
+    release = threading.Event()
+    commands_before = metrics.get_counter("db.commands")
+    batches_before = metrics.get_counter("db.batches")
+
+    def insert(body):
+        db.execute("INSERT INTO notes VALUES (?)", (body,))
+
+    def insert_then_fail():
+        insert("lost")
+        raise ValueError("bad write")
+
+    blocker = asyncio.create_task(worker.submit(release.wait))
+    await asyncio.sleep(0.05)
+    calls = [
+        asyncio.create_task(worker.submit(insert, "first")),
+        asyncio.create_task(worker.submit(insert_then_fail)),
+        asyncio.create_task(worker.submit(insert, "second")),
+    ]
+    await asyncio.sleep(0.05)
+    release.set()
+
+    results = await asyncio.gather(blocker, *calls, return_exceptions=True)
+
+    assert isinstance(results[2], ValueError)
+    assert db.fetchall("SELECT body FROM notes") == [("first",), ("second",)]
+    assert metrics.get_counter("db.commands") - commands_before == 4
+    assert metrics.get_counter("db.batches") - batches_before == 2  # the blocker, then the rest together
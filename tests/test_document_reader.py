@@ -0,0 +1,79 @@
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from config import Config
+from services.document_reader import DocumentReader, DocumentTooLarge
+from handlers.batch_handler import BatchHandler
+
+
+def make_document(content: bytes, file_size: int = None):
+    """Build a fake Telegram document whose download writes content into the given buffer."""
+    async def download_to_memory(out):
+        out.write(content)
+
+    file = SimpleNamespace(download_to_memory=AsyncMock(side_effect=download_to_memory))
+    return SimpleNamespace(
+        file_name="texts.txt",
+        mime_type="text/plain",
+        file_size=len(content) if file_size is None else file_size,
+        get_file=AsyncMock(return_value=file),
+    )
+
+
+@pytest.mark.asyncio
+async def test_oversized_document_rejected_before_download():
+    """Ensure documents over the limit are refused using file_size without fetching them."""
+    document = make_document(b"x" * 100)
+
+    with pytest.raises(DocumentTooLarge):
+        await DocumentReader.download(document, max_bytes=50)
+    document.get_file.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_buffer_bounds_download_when_size_is_unreported():
+    """Ensure the in-memory buffer enforces the limit even if Telegram reports no size."""
+    document = make_document(b"x" * 100, file_size=0)
+
+    with pytest.raises(DocumentTooLarge):
+        await DocumentReader.download(document, max_bytes=50)
+
+
+@pytest.mark.asyncio
+async def test_iter_lines_decodes_utf8_and_skips_blank_lines():
+    """Ensure lines are decoded incrementally, stripped and blank lines dropped."""
+    document = make_document("first\n\n  دوم  \r\nthird".encode("utf-8"))
+
+    buffer = await DocumentReader.download(document)
+
+    assert list(DocumentReader.iter_lines(buffer)) == ["first", "دوم", "third"]
+
+
+@pytest.mark.asyncio
+async def test_batch_upload_reads_lines_in_memory(fake_update_and_context):
+    """Ensure batch uploads are parsed from memory and capped one past the batch size."""
+    FakeUpdate, _ = fake_update_and_context
+    update = FakeUpdate("")
+    lines = "\n".join(f"text {i}" for i in range(Config.MAX_BATCH_SIZE + 5))
+    update.message.document = make_document(lines.encode("utf-8"))
+
+    texts = await BatchHandler()._handle_batch_file_upload(update)
+
+    assert texts[0] == "text 0"
+    assert len(texts) == Config.MAX_BATCH_SIZE + 1
+
+
+@pytest.mark.asyncio
+async def test_oversized_text_upload_reports_too_long(fake_update_and_context):
+    """Ensure a text document over the size limit gets the too-long message, not the invalid-text one."""
+    from handlers.text_handler import TextHandler
+
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("")
+    update.message.text = None
+    update.message.document = make_document(b"x" * (Config.MAX_TEXT_LENGTH * 4 + 1))
+
+    state = await TextHandler().handle_text_input(update, FakeContext())
+
+    assert state == Config.AWAITING_TEXT
+    assert "too_long" in update.message.reply_text.call_args.args[0]
@@ -0,0 +1,59 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from telegram.error import BadRequest
+from services.file_id_cache import FileIdCache
+from utils.metrics import metrics
+
+
+def test_file_id_round_trip_with_normalized_text():
+    """Ensure file_ids are stored per rendering and whitespace differences share an entry."""
+    cache = FileIdCache()
+    cache.put("Hello   world ", 1.5, "en", "FILE_ID_1")
+
+    assert cache.get("Hello world", 1.5, "en") == "FILE_ID_1"
+    assert cache.get("Hello world", 2.0, "en") is None
+    assert cache.get("Hello world", 1.5, "fa") is None
+
+
+@pytest.mark.asyncio
+async def test_remember_ignores_messages_without_audio():
+    """Ensure only real file_id strings are stored."""
+    cache = FileIdCache()
+    await cache.remember(MagicMock(), "text", 1.0, "en")
+
+    assert cache.get("text", 1.0, "en") is None
+
+
+@pytest.mark.asyncio
+async def test_reply_cached_audio_hit_and_stale_invalidation():
+    """Ensure a hit is sent by file_id and a rejected id is dropped."""
+    cache = FileIdCache()
+    cache.put("popular quote", 1.0, "en", "FILE_ID_2")
+    message = MagicMock()
+    message.reply_audio = AsyncMock()
+
+    assert await cache.reply_cached_audio(message, "popular quote", 1.0, "en", caption="c") is True
+    message.reply_audio.assert_called_once_with(audio="FILE_ID_2", caption="c")
+
+    invalidated = metrics.get_counter("file_id_cache.invalidated")
+    message.reply_audio = AsyncMock(side_effect=BadRequest("Wrong file identifier"))
+
+    assert await cache.reply_cached_audio(message, "popular quote", 1.0, "en") is False
+    assert cache.get("popular quote", 1.0, "en") is None
+    assert metrics.get_counter("file_id_cache.invalidated") == invalidated + 1
+
+
+@pytest.mark.asyncio
+async def test_remember_failure_does_not_fail_delivery(monkeypatch):
+    """Ensure a storage error after upload is logged instead of failing the delivered message."""
+    cache = FileIdCache()
+    message = MagicMock()
+    message.audio.file_id = "FILE_ID_3"
+
+    def broken_put(*args):
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(cache, "put", broken_put)
+    await cache.remember(message, "text", 1.0, "en")
+
+    assert cache.get("text", 1.0, "en") is None
@@ -0,0 +1,22 @@
+from utils.lru_cache import LRUCache
+
+
+def test_evicts_least_recently_used_within_byte_budget():
+    """Ensure the cache stays under its byte budget and evicts cold entries first."""
+    cache = LRUCache(max_bytes=10)
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    cache.get("a")
+    cache.put("c", b"1234")
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+    assert cache.total_bytes == 8
+
+
+def test_rejects_values_larger_than_budget():
+    """Ensure oversized values are not stored."""
+    cache = LRUCache(max_bytes=4)
+
+    assert cache.put("big", b"12345") is False
+    assert len(cache) == 0
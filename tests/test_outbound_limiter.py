@@ -0,0 +1,89 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from telegram.error import RetryAfter
+from config import Config
+from middleware.outbound_limiter import OutboundRateLimiter, TokenBucket
+from utils.metrics import metrics
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    """An outbound limiter whose waits are recorded instead of slept."""
+    limiter = OutboundRateLimiter()
+    waits = []
+
+    async def fake_wait(seconds):
+        waits.append(seconds)
+        await asyncio.sleep(0)
+
+    monkeypatch.setattr(limiter, "_wait", fake_wait)
+    limiter.waits = waits
+    return limiter
+
+
+def test_token_bucket_allows_burst_then_spaces_calls():
+    """Ensure a bucket hands out its burst at once and then one token per interval."""
+    bucket = TokenBucket(rate=1.0, burst=3)
+
+    assert [bucket.reserve(100.0) for _ in range(5)] == [0.0, 0.0, 0.0, 1.0, 2.0]
+    assert bucket.reserve(110.0) == 0.0
+    assert bucket.idle(120.0)
+
+
+@pytest.mark.asyncio
+async def test_chat_bursts_are_spaced(limiter):
+    """Ensure calls to one chat beyond its burst wait for tokens."""
+    callback = AsyncMock(return_value=True)
+
+    for _ in range(Config.OUTBOUND_CHAT_BURST + 2):
+        await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 5}, None)
+
+    assert callback.await_count == Config.OUTBOUND_CHAT_BURST + 2
+    assert len(limiter.waits) == 2
+    # Other chats are not slowed down by chat 5
+    await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 6}, None)
+    assert len(limiter.waits) == 2
+
+
+@pytest.mark.asyncio
+async def test_retry_after_is_honored(limiter):
+    """Ensure RetryAfter holds the buckets and the call is retried."""
+    callback = AsyncMock(side_effect=[RetryAfter(7), {"ok": True}])
+    retries = metrics.get_counter("outbound.retry_after")
+
+    result = await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 8}, None)
+
+    assert result == {"ok": True}
+    assert callback.await_count == 2
+    assert max(limiter.waits) >= 6.9
+    assert metrics.get_counter("outbound.retry_after") - retries == 1
+
+
+@pytest.mark.asyncio
+async def test_retry_after_gives_up_after_max_retries(limiter):
+    """Ensure a persistent flood limit reaches the caller."""
+    callback = AsyncMock(side_effect=RetryAfter(1))
+
+    with pytest.raises(RetryAfter):
+        await limiter.process_request(callback, (), {}, "sendMessage", {"chat_id": 9}, 2)
+    assert callback.await_count == 3
+
+
+@pytest.mark.asyncio
+async def test_superseded_edits_are_dropped(limiter):
+    """Ensure only the newest waiting edit of a message is sent."""
+    for _ in range(Config.OUTBOUND_CHAT_BURST):
+        await limiter.process_request(AsyncMock(), (), {}, "sendMessage", {"chat_id": 10}, None)
+    coalesced = metrics.get_counter("outbound.coalesced")
+    edit = AsyncMock(return_value={"message_id": 1})
+    data = {"chat_id": 10, "message_id": 1}
+
+    results = await asyncio.gather(*(
+        limiter.process_request(edit, (text,), {}, "editMessageText", {**data, "text": text}, None)
+        for text in ("1/3", "2/3", "3/3")
+    ))
+
+    edit.assert_awaited_once_with("3/3")
+    assert results == [True, True, {"message_id": 1}]
+    assert metrics.get_counter("outbound.coalesced") - coalesced == 2
@@ -0,0 +1,51 @@
+import pytest
+from config import Config
+from models.user_session import UserSession
+from services.profile_cache import ProfileCache
+from services.quota_service import QuotaService
+from utils.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_language_survives_restart():
+    """Ensure a stored language is restored into empty conversation data after a restart."""
+    ProfileCache.instance().set_language(42, "fa")
+
+    ProfileCache._instance = None  # simulate a restart
+    user_data = {}
+    language = await ProfileCache.instance().get_language(42, user_data)
+
+    assert language == "fa"
+    assert user_data["language"] == "fa"
+
+
+def test_profile_is_read_through_once():
+    """Ensure repeated lookups are served from memory."""
+    cache = ProfileCache.instance()
+    hits_before = metrics.get_counter("profile_cache.hits")
+
+    assert cache.get(7).language == Config.DEFAULT_LANGUAGE
+    assert cache.get(7).tier == Config.FREE
+    assert metrics.get_counter("profile_cache.hits") - hits_before == 1
+
+
+def test_profile_expires_after_ttl(monkeypatch):
+    """Ensure stale profiles are re-read from SQLite."""
+    cache = ProfileCache(ttl=60)
+    cache.get(8)
+    UserSession().set_user_language(8, "fa")
+
+    assert cache.get(8).language == Config.DEFAULT_LANGUAGE
+    monkeypatch.setattr("services.profile_cache.time.monotonic", lambda: 10 ** 9)
+    assert cache.get(8).language == "fa"
+
+
+def test_set_language_keeps_tier_and_usage():
+    """Ensure changing language does not reset the user's tier or usage."""
+    quota_service = QuotaService()
+    quota_service.reserve(9)
+
+    ProfileCache.instance().set_language(9, "fa")
+
+    assert quota_service.user_session.get_daily_usage(9) == 1
+    assert quota_service.get_usage(9) == 1
@@ -42,3 +42,47 @@ def test_free_quota_behavior():
     assert total == Config.DAILY_QUOTA_FREE
     assert has_quota is True or remaining == 0
     assert remaining <= total
+
+
+def test_reserve_charges_until_free_limit():
+    """
+    Verify reserve() charges one unit per call and refuses past the free limit.
+    """
+    quota_service = QuotaService()
+    user_id = 1001
+
+    for _ in range(Config.DAILY_QUOTA_FREE):
+        assert quota_service.reserve(user_id) is True
+
+    assert quota_service.reserve(user_id) is False
+    assert quota_service.user_session.get_daily_usage(user_id) == Config.DAILY_QUOTA_FREE
+
+
+def test_reserve_uses_premium_limit_and_rolls_over_day():
+    """
+    Verify premium users get their tier's limit and yesterday's usage does not count.
+    """
+    quota_service = QuotaService()
+    user_id = 1002
+    quota_service.user_session.db.execute(
+        "INSERT INTO users (user_id, tier, daily_usage, last_reset_date) VALUES (?, ?, ?, ?)",
+        (user_id, Config.PREMIUM, Config.DAILY_QUOTA_PREMIUM, "2000-01-01")
+    )
+
+    assert quota_service.reserve(user_id, Config.DAILY_QUOTA_FREE + 1) is True
+    assert quota_service.user_session.get_daily_usage(user_id) == Config.DAILY_QUOTA_FREE + 1
+    assert quota_service.get_limit(user_id) == Config.DAILY_QUOTA_PREMIUM
+
+
+def test_refund_returns_charged_quota():
+    """
+    Verify refund() gives back quota without going below zero.
+    """
+    quota_service = QuotaService()
+    user_id = 1003
+
+    quota_service.reserve(user_id)
+    quota_service.refund(user_id)
+    quota_service.refund(user_id)
+
+    assert quota_service.user_session.get_daily_usage(user_id) == 0
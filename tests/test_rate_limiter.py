@@ -1,13 +1,17 @@
 import pytest
+import threading
 import time
+from config import Config
 from middleware.rate_limiter import RateLimiter
+from services.storage import SQLiteStorage, RedisStorage
 
 class DummyUser:
     def __init__(self, user_id):
         self.id = user_id
 
 class DummyMessage:
-    text = "hello"
+    def __init__(self):
+        self.text = "hello"
 
 class DummyUpdate:
     def __init__(self, user_id=1):
@@ -69,3 +73,54 @@ async def test_reset_after_time(monkeypatch):
     monkeypatch.setattr(time, "time", lambda: original_time + 61)
 
     assert await limiter.check_rate_limit(update, context) is True
+
+@pytest.mark.asyncio
+async def test_long_texts_cost_more(monkeypatch):
+    """Ensure requests are weighted by text length."""
+    monkeypatch.setattr(Config, "RATE_LIMIT_CHARS_PER_UNIT", 1000)
+    limiter = RateLimiter()
+    update = DummyUpdate(41)
+    update.message.text = "x" * 2500
+
+    assert RateLimiter.request_cost(update) == 3
+    for _ in range(6):
+        assert await limiter.check_rate_limit(update, DummyContext()) is True
+    assert await limiter.check_rate_limit(update, DummyContext()) is False
+
+
+def test_idle_users_are_swept():
+    """Ensure users whose budget has refilled are dropped from memory."""
+    storage = SQLiteStorage()
+    for user_id in range(100):
+        storage.allow_request(f"user:{user_id}", 20, 60, 1000.0)
+    assert storage.rate_limited_keys == 100
+
+    storage.allow_request("user:active", 20, 60, 1000.0 + Config.RATE_LIMIT_SWEEP_INTERVAL + 5)
+    assert storage.rate_limited_keys == 1
+
+
+@pytest.mark.asyncio
+async def test_shared_backend_is_checked_off_loop_behind_a_local_limit():
+    """Ensure Redis is only consulted off the event loop, and not at all for locally rejected users."""
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    first = RateLimiter(RedisStorage(fakeredis.FakeRedis(server=server), prefix="test:"))
+    second = RateLimiter(RedisStorage(fakeredis.FakeRedis(server=server), prefix="test:"))
+    update = DummyUpdate(51)
+
+    remote_threads = []
+    allow_request = first.storage.allow_request
+
+    def recording_allow_request(*args):
+        remote_threads.append(threading.get_ident())
+        return allow_request(*args)
+
+    first.storage.allow_request = recording_allow_request
+    for _ in range(Config.RATE_LIMIT_PER_MINUTE):
+        assert await first.check_rate_limit(update, DummyContext()) is True
+    assert await first.check_rate_limit(update, DummyContext()) is False
+
+    assert len(remote_threads) == Config.RATE_LIMIT_PER_MINUTE
+    assert threading.get_ident() not in remote_threads
+    # Another worker passes its local limit but is stopped by the shared budget
+    assert await second.check_rate_limit(update, DummyContext()) is False
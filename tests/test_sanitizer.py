@@ -0,0 +1,82 @@
+import random
+import re
+from utils.sanitizer import Sanitizer
+from utils.validators import TextValidator
+
+
+def test_clean_text_passes_untouched():
+    """Ensure ordinary text comes back stripped, with no flags or spans."""
+    result = Sanitizer.scan("  Hello world, 2 + 2 = 4.  ")
+
+    assert result.text == "Hello world, 2 + 2 = 4."
+    assert result.is_clean
+    assert result.spans == ()
+
+
+def test_scan_reports_flags_and_original_offsets():
+    """Ensure each removed span is classified and located in the original text."""
+    text = "hi <script>alert(1)</script> <b>x</b> javascript:go data:x"
+    result = Sanitizer.scan(text)
+
+    assert result.text == "hi  x go x"
+    assert result.flags == {"script", "tag", "script_url", "data_url"}
+    assert result.is_dangerous
+    for flag, start, end in result.spans:
+        assert Sanitizer.PATTERN.fullmatch(text[start:end]).lastgroup == flag
+
+
+def test_payloads_inside_tags_and_nested_payloads_are_caught():
+    """Ensure handlers hidden in tags are flagged and payloads split by tags are removed."""
+    in_tag = Sanitizer.scan('<img src=x onerror="boom()"> look')
+    split = Sanitizer.scan("java<b>script:run() on<i>click=")
+
+    assert in_tag.text == "look"
+    assert in_tag.flags == {"tag", "event_handler"}
+    assert "script" not in split.text and "click" not in split.text
+    assert "nested" in split.flags
+
+
+def test_scripts_overlapping_tags_are_dangerous():
+    """Ensure a stray '<' cannot swallow the start of a script as a plain tag."""
+    validator = TextValidator()
+
+    for text in ("<<script>alert(1)</script>", "<a <script>alert(1)</script>>", "<b x=<script>1</script>"):
+        assert Sanitizer.scan(text).is_dangerous
+        assert not validator.is_valid_text(text)
+
+
+def test_validator_agrees_with_previous_rules():
+    """Ensure TextValidator keeps accepting and rejecting the same inputs."""
+    validator = TextValidator()
+
+    assert validator.is_valid_text("Plain <b>bold</b> text")
+    assert validator.is_valid_text("see data: alert(")
+    assert not validator.is_valid_text("<script>x</script>")
+    assert not validator.is_valid_text("<a onclick = 'x'>hi</a>")
+    assert not validator.is_valid_text("VBScript:msgbox")
+    assert not validator.is_valid_text(" ... !!! ")
+    assert not validator.is_valid_text("   ")
+    assert validator.sanitize_text("a  <i>b</i>\n\tc javascript:") == "a b c"
+
+
+def legacy_is_valid_text(text):
+    """TextValidator.is_valid_text as it was before the fused scanner."""
+    patterns = [r'<script.*?>.*?</script>', r'on\w+\s*=', r'javascript:', r'vbscript:']
+    if not text or not text.strip():
+        return False
+    cleaned = text.strip()
+    if any(re.search(pattern, cleaned, re.IGNORECASE) for pattern in patterns):
+        return False
+    return any(char.isalnum() for char in cleaned)
+
+
+def test_validator_verdicts_match_legacy_rules_on_random_input():
+    """Ensure verdicts match the old per-pattern validator on overlapping fragments."""
+    validator = TextValidator()
+    rng = random.Random(7)
+    fragments = ["<", ">", "<b>", "</b>", "<script>", "</script>", "<a ", "on", "click", "=", " ", "\n",
+                 "java", "vb", "script", ":", "data", "(", "alert", "x", "ONload", "_", "é", "1"]
+
+    for _ in range(20000):
+        text = "".join(rng.choice(fragments) for _ in range(rng.randint(1, 14)))
+        assert validator.is_valid_text(text) == legacy_is_valid_text(text), text
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+import pytest
+from config import Config
+from handlers.text_handler import TextHandler
+from handlers.audio_handler import AudioHandler
+from handlers.start_handler import StartHandler
+from services.admission import AdmissionController
+from services.cache_service import CacheService
+from services.synthesis_pool import SynthesisCancelled
+from services.tts_service import TTSService
+
+
+@pytest.mark.asyncio
+async def test_text_input_starts_speculative_render(fake_update_and_context, monkeypatch):
+    """Ensure accepted text starts the base synthesis when speculative mode is on."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("Hello there, this is a test.")
+    update.message.document = None
+    context = FakeContext()
+    rendered = []
+
+    monkeypatch.setattr(Config, "SPECULATIVE_RENDERING", True)
+    handler = TextHandler()
+    monkeypatch.setattr(handler.tts_service, "prerender", rendered.append)
+
+    state = await handler.handle_text_input(update, context)
+    await context.user_data["prerender_task"]
+
+    assert state == Config.AWAITING_SPEED
+    assert rendered == ["Hello there, this is a test."]
+
+
+@pytest.mark.asyncio
+async def test_speculative_render_is_off_by_default(fake_update_and_context):
+    """Ensure no work is started unless the mode is enabled."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("Hello there")
+    update.message.document = None
+    context = FakeContext()
+
+    await TextHandler().handle_text_input(update, context)
+
+    assert "prerender_task" not in context.user_data
+
+
+@pytest.mark.asyncio
+async def test_back_cancels_speculative_render(fake_update_and_context):
+    """Ensure going Back cancels a pending speculative render."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update = FakeUpdate("Back")
+    context = FakeContext()
+    release = threading.Event()
+
+    handler = AudioHandler()
+    task = asyncio.create_task(handler.synthesis_pool.submit(12345, release.wait))
+    context.user_data["prerender_task"] = task
+    await asyncio.sleep(0.01)
+
+    await handler.handle_speed_selection(update, context)
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await task
+    assert "prerender_task" not in context.user_data
+
+
+@pytest.mark.asyncio
+async def test_cancel_stops_speculative_render(fake_update_and_context):
+    """Ensure /cancel cancels a speculative render still waiting for its result."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    context = FakeContext()
+    release = threading.Event()
+    task = asyncio.create_task(AudioHandler().synthesis_pool.submit(12345, release.wait))
+    context.user_data["prerender_task"] = task
+    await asyncio.sleep(0.01)
+
+    await StartHandler().cancel(FakeUpdate("/cancel"), context)
+    release.set()
+
+    with pytest.raises((asyncio.CancelledError, SynthesisCancelled)):
+        await task
+
+
+def test_prerender_reuses_cached_clip(monkeypatch):
+    """Ensure a text whose 1.0x clip is in the audio cache is not sent to gTTS again."""
+    def no_gtts(text, lang_code, slow):
+        raise AssertionError("gTTS called")
+
+    tts = TTSService()
+    tts.cache_service.cache_audio("Cached words", 1.0, b"CACHED_MP3", "en")
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(no_gtts))
+
+    tts.prerender("Cached words")
+
+    key = tts.cache_service.get_cache_key("Cached words", 1.0, "en", CacheService.BASE)
+    assert TTSService._base_renderings.get(key).mp3_data == b"CACHED_MP3"
+
+
+@pytest.mark.asyncio
+async def test_speculative_render_skips_uploaded_texts(monkeypatch):
+    """Ensure texts with a cached file_id are not prerendered."""
+    handler = TextHandler()
+    rendered = []
+    monkeypatch.setattr(handler.tts_service, "prerender", rendered.append)
+    handler.file_id_cache.put("Already sent", 1.5, "en", "FILE_ID")
+
+    await handler._speculative_render(12345, "Already sent")
+    await handler._speculative_render(12345, "Something new")
+
+    assert rendered == ["Something new"]
+
+
+@pytest.mark.asyncio
+async def test_speed_choice_preempts_queued_speculative_render(fake_update_and_context):
+    """Ensure a speculative render still waiting for a slot is cancelled, not awaited."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    AdmissionController._instance = AdmissionController(max_concurrent=1)
+    handler = TextHandler()
+    context = FakeContext()
+
+    async with AdmissionController.instance().admit(AdmissionController.INTERACTIVE):
+        handler._start_speculative_render(context, 12345, "Queued text")
+        task = context.user_data["prerender_task"]
+        await asyncio.sleep(0.05)
+        assert AdmissionController.instance().queue_depth == 1
+
+        await asyncio.wait_for(AudioHandler()._await_prerender(context), 1)
+
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert AdmissionController.instance().queue_depth == 0
+    assert AdmissionController.instance().active == 0
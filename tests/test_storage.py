@@ -0,0 +1,100 @@
+import pytest
+from datetime import date
+from config import Config
+from services.storage import StorageBackend, SQLiteStorage, RedisStorage
+
+fakeredis = pytest.importorskip("fakeredis")
+
+TODAY = date.today().isoformat()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+def storage(request):
+    """Run each test against both backends."""
+    if request.param == "sqlite":
+        return SQLiteStorage()
+    return RedisStorage(fakeredis.FakeRedis(decode_responses=True), prefix="test:")
+
+
+def test_quota_is_enforced_and_refunded(storage):
+    """Ensure reservations stop at the limit and refunds free quota again."""
+    assert [storage.reserve_quota(1, 1, TODAY, 2, 10) for _ in range(3)] == [1, 2, None]
+    assert storage.get_usage(1, TODAY) == 2
+
+    assert storage.refund_quota(1, 1, TODAY) == 1
+    assert storage.reserve_quota(1, 1, TODAY, 2, 10) == 2
+
+
+def test_quota_rolls_over_to_a_new_day(storage):
+    """Ensure usage charged on a previous day neither counts nor gets refunded."""
+    storage.write_usage([(2, 5, "2000-01-01")])
+
+    assert storage.get_usage(2, TODAY) == 0
+    assert storage.refund_quota(2, 1, TODAY) is None
+    assert storage.reserve_quota(2, 1, TODAY, 5, 10) == 1
+
+
+def test_profile_keeps_usage_when_language_changes(storage):
+    """Ensure setting the language does not touch tier or usage."""
+    assert storage.get_profile(3) is None
+
+    storage.reserve_quota(3, 2, TODAY, 5, 10)
+    storage.set_language(3, "fa")
+
+    assert storage.get_profile(3) == ("fa", Config.FREE, 2, TODAY)
+
+
+def test_file_id_round_trip(storage):
+    """Ensure file_ids can be stored, read and forgotten."""
+    storage.put_file_id("key", "FILE_ID")
+    assert storage.get_file_id("key") == "FILE_ID"
+
+    storage.delete_file_id("key")
+    assert storage.get_file_id("key") is None
+
+
+def test_rate_limit_window(storage):
+    """Ensure requests beyond the limit are refused until the window passes."""
+    assert all(storage.allow_request("user:4", 3, 60, 1000.0 + i) for i in range(3))
+    assert storage.allow_request("user:4", 3, 60, 1010.0) is False
+    assert storage.allow_request("user:5", 3, 60, 1010.0) is True
+    assert storage.allow_request("user:4", 3, 60, 1061.0) is True
+
+
+def test_redis_workers_share_state():
+    """Ensure two workers on the same Redis see each other's quota usage."""
+    server = fakeredis.FakeServer()
+    first = RedisStorage(fakeredis.FakeRedis(server=server), prefix="test:")
+    second = RedisStorage(fakeredis.FakeRedis(server=server), prefix="test:")
+
+    assert first.reserve_quota(6, 1, TODAY, 1, 10) == 1
+    assert second.reserve_quota(6, 1, TODAY, 1, 10) is None
+
+
+def test_unknown_backend_is_rejected(monkeypatch):
+    """Ensure a misconfigured STORAGE_BACKEND fails loudly."""
+    monkeypatch.setattr(Config, "STORAGE_BACKEND", "memcached")
+
+    with pytest.raises(ValueError):
+        StorageBackend.instance()
+
+
+def test_rate_limit_cost_weighting(storage):
+    """Ensure heavier requests use proportionally more of the budget."""
+    assert storage.allow_request("user:7", 10, 60, 1000.0, cost=6) is True
+    assert storage.allow_request("user:7", 10, 60, 1000.0, cost=5) is False
+    assert storage.allow_request("user:7", 10, 60, 1000.0, cost=4) is True
+    # One unit refills every 6 seconds
+    assert storage.allow_request("user:7", 10, 60, 1006.0) is True
+    assert storage.allow_request("user:7", 10, 60, 1006.0) is False
+
+
+def test_incomplete_backend_cannot_be_created():
+    """Ensure a backend missing part of the interface fails at construction, not on first use."""
+
+    class ProfilesOnly(StorageBackend):
+        def get_profile(self, user_id):
+            return None
+
+    with pytest.raises(TypeError, match="abstract"):
+        ProfilesOnly()
@@ -0,0 +1,130 @@
+import asyncio
+import threading
+import time
+import pytest
+from services.synthesis_pool import SynthesisPool, SynthesisQueueFull, SynthesisCancelled
+from utils.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_submit_runs_off_event_loop():
+    """Ensure jobs run in a worker thread and return their result."""
+    pool = SynthesisPool(max_workers=2, max_queue=2, timeout=5)
+    loop_thread = threading.get_ident()
+
+    result = await pool.submit(1, lambda: threading.get_ident())
+
+    assert result != loop_thread
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_full_rejects_new_jobs():
+    """Ensure submissions beyond workers + queue size are rejected."""
+    pool = SynthesisPool(max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    first = asyncio.create_task(pool.submit(1, release.wait))
+    second = asyncio.create_task(pool.submit(2, release.wait))
+    await asyncio.sleep(0.05)
+
+    with pytest.raises(SynthesisQueueFull):
+        await pool.submit(3, release.wait)
+
+    release.set()
+    await asyncio.gather(first, second)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_job_timeout():
+    """Ensure slow jobs raise a timeout to the waiter."""
+    pool = SynthesisPool(max_workers=1, max_queue=1, timeout=0.05)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await pool.submit(1, time.sleep, 0.5)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_user_stops_waiting_jobs():
+    """Ensure cancel_user wakes the waiter with SynthesisCancelled."""
+    pool = SynthesisPool(max_workers=1, max_queue=2, timeout=5)
+    release = threading.Event()
+
+    task = asyncio.create_task(pool.submit(7, release.wait))
+    await asyncio.sleep(0.05)
+
+    assert pool.cancel_user(7) == 1
+    with pytest.raises(SynthesisCancelled):
+        await task
+
+    release.set()
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_identical_requests_share_one_job():
+    """Ensure concurrent submissions with the same key run the job once and all get its result."""
+    pool = SynthesisPool(max_workers=2, max_queue=2, timeout=5)
+    release = threading.Event()
+    calls = []
+
+    def render():
+        calls.append(1)
+        release.wait()
+        return b"AUDIO"
+
+    coalesced_before = metrics.get_counter("synthesis.coalesced")
+    tasks = [asyncio.create_task(pool.submit(user_id, render, key="same")) for user_id in (1, 2, 3)]
+    await asyncio.sleep(0.05)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [b"AUDIO"] * 3
+    assert len(calls) == 1
+    assert metrics.get_counter("synthesis.coalesced") - coalesced_before == 2
+    assert pool.pending == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_shared_job_error_reaches_every_waiter():
+    """Ensure an exception raised by a shared job is delivered to all coalesced callers."""
+    pool = SynthesisPool(max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    def fail():
+        release.wait()
+        raise RuntimeError("gTTS down")
+
+    tasks = [asyncio.create_task(pool.submit(user_id, fail, key="same")) for user_id in (1, 2)]
+    await asyncio.sleep(0.05)
+    release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert all(isinstance(result, RuntimeError) for result in results)
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancelling_one_waiter_keeps_shared_job_running():
+    """Ensure one user's cancellation does not cancel a job other users are waiting for."""
+    pool = SynthesisPool(max_workers=1, max_queue=1, timeout=5)
+    release = threading.Event()
+
+    def render():
+        release.wait()
+        return b"AUDIO"
+
+    first = asyncio.create_task(pool.submit(1, render, key="same"))
+    second = asyncio.create_task(pool.submit(2, render, key="same"))
+    await asyncio.sleep(0.05)
+
+    pool.cancel_user(1)
+    release.set()
+
+    with pytest.raises(SynthesisCancelled):
+        await first
+    assert await second == b"AUDIO"
+    pool.shutdown()
@@ -0,0 +1,27 @@
+from utils.text_chunker import TextChunker
+
+
+def test_short_text_is_single_chunk():
+    """Ensure texts under the limit are returned unchanged."""
+    assert TextChunker.split("  Hello world.  ", 100) == ["Hello world."]
+    assert TextChunker.split("", 100) == []
+
+
+def test_splits_on_english_and_persian_sentence_boundaries():
+    """Ensure chunks end at sentence punctuation for both languages."""
+    text = "First sentence here. Second one? Third! " + "جمله اول. جمله دوم؟ جمله سوم."
+    chunks = TextChunker.split(text, 25)
+
+    assert all(len(chunk) <= 25 for chunk in chunks)
+    assert chunks[0] == "First sentence here."
+    assert "جمله اول. جمله دوم؟" in chunks
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_long_sentences_fall_back_to_words_and_hard_cuts():
+    """Ensure oversized sentences are still split within the limit, in order."""
+    text = "word " * 50 + "x" * 70
+    chunks = TextChunker.split(text, 30)
+
+    assert all(len(chunk) <= 30 for chunk in chunks)
+    assert "".join(chunks).replace(" ", "") == text.replace(" ", "")
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from services.time_stretch import TimeStretcher
+
+FRAME_RATE = 24000
+
+
+def _tone(seconds: float, frequency: float = 440.0) -> np.ndarray:
+    t = np.arange(int(seconds * FRAME_RATE)) / FRAME_RATE
+    return (0.5 * np.sin(2 * np.pi * frequency * t) * 32767).astype(np.int16)
+
+
+def _dominant_frequency(samples: np.ndarray) -> float:
+    spectrum = np.abs(np.fft.rfft(samples))
+    return np.argmax(spectrum) * FRAME_RATE / len(samples)
+
+
+@pytest.mark.parametrize("speed", [0.5, 1.5, 2.0, 3.0])
+def test_stretch_changes_duration_but_not_pitch(speed):
+    """Ensure output length scales with 1/speed while the tone stays at 440 Hz."""
+    samples = _tone(2.0)
+    stretched = TimeStretcher.stretch(samples, speed)
+
+    assert len(stretched) == round(len(samples) / speed)
+    middle = stretched[len(stretched) // 4: 3 * len(stretched) // 4]
+    assert abs(_dominant_frequency(middle) - 440.0) < 5
+
+
+def test_stretch_pcm16_round_trip_and_validation():
+    """Ensure PCM bytes stay 16-bit and invalid speeds are rejected."""
+    pcm = _tone(1.0).tobytes()
+
+    assert TimeStretcher.stretch_pcm16(pcm, 1.0) == pcm
+    assert len(TimeStretcher.stretch_pcm16(pcm, 2.0)) == len(pcm) // 2
+    with pytest.raises(ValueError):
+        TimeStretcher.stretch(np.zeros(10), 0)
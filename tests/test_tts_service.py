@@ -1,6 +1,11 @@
 import os
+import tempfile
+import threading
+import pytest
+from config import Config
 from services.tts_service import TTSService
 from services.file_service import FileService
+from services.audio_codec import AudioCodec, AudioCodecError
 
 def test_tts_generates_audio():
     """Ensure TTSService generates a valid audio file."""
@@ -15,3 +20,109 @@ def test_tts_generates_audio():
 
     # Cleanup
     FileService.delete_file(path)
+
+
+def test_streaming_speed_adjustment_uses_no_temp_files(monkeypatch):
+    """Ensure the streaming pipeline re-times audio without temporary files."""
+
+    def no_temp_files(*args, **kwargs):
+        raise AssertionError("temporary file created")
+
+    pcm = b"\x00\x01" * Config.AUDIO_SAMPLE_RATE  # one second of mono 16-bit PCM
+    encoded = {}
+
+    def fake_encode(pcm_data, frame_rate=None, bitrate="64k"):
+        encoded["size"] = len(pcm_data)
+        return b"ENCODED"
+
+    monkeypatch.setattr(Config, "AUDIO_STREAMING_PIPELINE", True)
+    monkeypatch.setattr(tempfile, "NamedTemporaryFile", no_temp_files)
+    monkeypatch.setattr(AudioCodec, "decode_mp3", staticmethod(lambda data, frame_rate=None: pcm))
+    monkeypatch.setattr(AudioCodec, "encode_mp3", staticmethod(fake_encode))
+
+    result = TTSService().adjust_audio_speed(b"MP3", 2.0)
+
+    assert result == b"ENCODED"
+    assert encoded["size"] < len(pcm)
+
+
+def test_audio_codec_reports_missing_ffmpeg(monkeypatch):
+    """Ensure a missing ffmpeg binary surfaces as AudioCodecError."""
+    monkeypatch.setattr(Config, "FFMPEG_BINARY", "/nonexistent/ffmpeg")
+
+    with pytest.raises(AudioCodecError):
+        AudioCodec.decode_mp3(b"MP3")
+
+
+def test_long_text_chunks_are_synthesized_in_parallel_and_in_order(monkeypatch):
+    """Ensure chunked synthesis joins chunk audio in the original order."""
+    import threading
+
+    threads = set()
+
+    def fake_chunk(text, lang_code, slow):
+        threads.add(threading.get_ident())
+        return text.encode()
+
+    monkeypatch.setattr(Config, "TTS_CHUNK_MAX_CHARS", 20)
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(fake_chunk))
+
+    text = "One sentence. Two sentence. Three sentence. Four sentence."
+    audio = TTSService()._synthesize(text, "en", False)
+
+    assert audio == b"One sentence.Two sentence.Three sentence.Four sentence."
+    assert threading.get_ident() not in threads
+
+
+def test_speed_variants_are_derived_from_one_synthesis(monkeypatch):
+    """Ensure changing speed reuses the cached base rendering instead of gTTS."""
+    calls = {"synth": 0, "decode": 0}
+
+    def fake_chunk(text, lang_code, slow):
+        calls["synth"] += 1
+        return b"BASE_MP3"
+
+    def fake_decode(self, audio_data):
+        calls["decode"] += 1
+        return b"\x00\x00" * Config.AUDIO_SAMPLE_RATE
+
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(fake_chunk))
+    monkeypatch.setattr(TTSService, "_decode_pcm", fake_decode)
+    monkeypatch.setattr(TTSService, "_encode_pcm", lambda self, pcm: b"MP3:%d" % len(pcm))
+
+    tts = TTSService()
+    assert tts.render_audio("hello world", 1.0) == b"BASE_MP3"
+    half = tts.render_audio("hello world", 0.5)
+    double = TTSService().render_audio("hello world", 2.0)
+
+    assert calls == {"synth": 1, "decode": 1}
+    assert half == b"MP3:%d" % (4 * Config.AUDIO_SAMPLE_RATE)
+    assert double == b"MP3:%d" % Config.AUDIO_SAMPLE_RATE
+
+
+def test_render_audio_serves_repeats_from_audio_cache(monkeypatch):
+    """Ensure a repeated (text, speed) is served from the audio cache without re-rendering."""
+    calls = []
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(lambda t, l, s: calls.append(t) or b"MP3"))
+
+    assert TTSService().render_audio("cached phrase") == b"MP3"
+    TTSService._base_renderings.clear()
+    assert TTSService().render_audio("cached phrase") == b"MP3"
+
+    assert calls == ["cached phrase"]
+
+
+def test_failed_speed_derivation_is_not_cached(monkeypatch):
+    """Ensure a codec failure never leaves 1.0x audio cached under another speed."""
+    monkeypatch.setattr(TTSService, "_synthesize_chunk", staticmethod(lambda t, l, s: b"BASE_MP3"))
+    monkeypatch.setattr(TTSService, "_encode_pcm", lambda self, pcm: b"STRETCHED")
+
+    def broken_decode(self, audio_data):
+        raise AudioCodecError("ffmpeg crashed")
+
+    monkeypatch.setattr(TTSService, "_decode_pcm", broken_decode)
+    with pytest.raises(AudioCodecError):
+        TTSService().render_audio("flaky codec", 2.0)
+
+    monkeypatch.setattr(TTSService, "_decode_pcm", lambda self, audio_data: b"\x00\x00" * 100)
+    assert TTSService().render_audio("flaky codec", 2.0) == b"STRETCHED"
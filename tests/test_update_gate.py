@@ -0,0 +1,58 @@
+import pytest
+from telegram.ext import ApplicationHandlerStop
+from config import Config
+from middleware.update_gate import UpdateGate
+from utils.metrics import metrics
+
+
+@pytest.mark.asyncio
+async def test_valid_update_passes_and_is_timed(fake_update_and_context):
+    """Ensure an ordinary message passes the gate and handler time is recorded."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update, context = FakeUpdate("hello"), FakeContext()
+    gate = UpdateGate()
+    passed = metrics.get_counter("gate.passed")
+
+    await gate.check(update, context)
+    await gate.finish(update, context)
+
+    assert metrics.get_counter("gate.passed") - passed == 1
+    assert "pipeline.handler_time" in metrics.snapshot()["timings"]
+
+
+@pytest.mark.asyncio
+async def test_over_limit_updates_stop_dispatch_with_one_notice(fake_update_and_context):
+    """Ensure over-limit updates are stopped and the user is told only once."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    update, context = FakeUpdate("hello"), FakeContext()
+    gate = UpdateGate()
+    rejected = metrics.get_counter("gate.rejected.rate_limited")
+
+    for _ in range(Config.RATE_LIMIT_PER_MINUTE):
+        await gate.check(update, context)
+    for _ in range(3):
+        with pytest.raises(ApplicationHandlerStop):
+            await gate.check(update, context)
+
+    assert metrics.get_counter("gate.rejected.rate_limited") - rejected == 3
+    update.message.reply_text.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_updates_are_shed_before_rate_limiting(fake_update_and_context):
+    """Ensure updates without a user, edits and unsafe file names never reach handlers."""
+    FakeUpdate, FakeContext = fake_update_and_context
+    gate = UpdateGate()
+
+    anonymous = FakeUpdate("hello")
+    anonymous.effective_user = None
+    edited = FakeUpdate("hello")
+    edited.edited_message = edited.message
+    upload = FakeUpdate("")
+    upload.message.document = type("Doc", (), {"file_name": "../../etc/passwd.txt"})()
+
+    for update, reason in ((anonymous, "no_user"), (edited, "unsupported"), (upload, "unsafe_filename")):
+        before = metrics.get_counter(f"gate.rejected.{reason}")
+        with pytest.raises(ApplicationHandlerStop):
+            await gate.check(update, FakeContext())
+        assert metrics.get_counter(f"gate.rejected.{reason}") - before == 1
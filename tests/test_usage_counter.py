@@ -0,0 +1,98 @@
+import asyncio
+import threading
+import pytest
+from config import Config
+from services.quota_service import QuotaService
+from services.usage_counter import UsageCounter
+from services.db_worker import DatabaseWorker
+from services.file_service import FileService
+from services.synthesis_pool import SynthesisPool
+
+
+@pytest.fixture
+def write_behind(monkeypatch):
+    """Enable write-behind usage counters."""
+    monkeypatch.setattr(Config, "USAGE_WRITE_BEHIND", True)
+
+
+def stored_usage(quota_service, user_id):
+    """Usage as persisted in SQLite, bypassing the in-memory counters."""
+    return quota_service.user_session.get_daily_usage(user_id)
+
+
+def test_write_behind_enforces_quota_without_writing(write_behind):
+    """Ensure quota is enforced in memory and nothing reaches SQLite before a flush."""
+    quota_service = QuotaService()
+
+    for _ in range(Config.DAILY_QUOTA_FREE):
+        assert quota_service.reserve(7)
+    assert not quota_service.reserve(7)
+
+    assert quota_service.get_usage(7) == Config.DAILY_QUOTA_FREE
+    assert stored_usage(quota_service, 7) == 0
+
+    assert UsageCounter.instance().flush() == 1
+    assert stored_usage(quota_service, 7) == Config.DAILY_QUOTA_FREE
+
+
+def test_write_behind_flushes_after_max_pending(write_behind, monkeypatch):
+    """Ensure a batch is written once enough updates have accumulated."""
+    monkeypatch.setattr(Config, "USAGE_FLUSH_MAX_PENDING", 3)
+    quota_service = QuotaService()
+
+    for user_id in (1, 2, 3):
+        quota_service.reserve(user_id)
+
+    assert UsageCounter.instance().pending == 0
+    assert [stored_usage(quota_service, user_id) for user_id in (1, 2, 3)] == [1, 1, 1]
+
+
+def test_write_behind_refund_and_resume_from_database(write_behind):
+    """Ensure refunds adjust the counter and a fresh process resumes from stored usage."""
+    quota_service = QuotaService()
+    quota_service.reserve(9)
+    quota_service.reserve(9)
+    quota_service.refund(9)
+    UsageCounter.instance().flush()
+
+    UsageCounter._instance = None  # simulate a restart
+    assert quota_service.get_usage(9) == 1
+    for _ in range(Config.DAILY_QUOTA_FREE - 1):
+        assert quota_service.reserve(9)
+    assert not quota_service.reserve(9)
+
+
+@pytest.mark.asyncio
+async def test_stop_flushes_pending_usage(write_behind):
+    """Ensure shutdown writes out buffered usage."""
+    quota_service = QuotaService()
+    counter = UsageCounter.instance()
+    counter.start()
+    quota_service.reserve(11)
+
+    await counter.stop()
+
+    assert stored_usage(quota_service, 11) == 1
+
+
+@pytest.mark.asyncio
+async def test_shutdown_flushes_after_queued_storage_calls(write_behind, monkeypatch):
+    """Ensure reserves still queued on the database thread at shutdown reach SQLite."""
+    from bot import TextToSpeechBot
+    monkeypatch.setattr(FileService, "cleanup_old_files", lambda max_age: 0)
+    monkeypatch.setattr(SynthesisPool, "shutdown", lambda self: None)
+    bot, quota_service = TextToSpeechBot(), QuotaService()
+    UsageCounter.instance().start()
+    worker = DatabaseWorker.instance()
+
+    busy = threading.Event()
+    blocker = asyncio.create_task(worker.submit(busy.wait))
+    queued = asyncio.create_task(worker.submit(quota_service.reserve, 13))
+    await asyncio.sleep(0)
+    threading.Timer(0.05, busy.set).start()
+
+    await bot.post_stop(None)
+
+    assert await queued is True
+    await blocker
+    assert stored_usage(QuotaService(), 13) == 1  # the old connection is closed
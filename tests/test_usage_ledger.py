@@ -0,0 +1,70 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from services.usage_ledger import UsageLedger
+from models.user_session import UserSession
+
+
+def test_record_updates_ledger_and_rollups():
+    """Ensure one record updates the user's bucket and both rollups."""
+    ledger = UsageLedger()
+    now = datetime.now().replace(hour=10)
+    today = now.date().isoformat()
+
+    ledger.record(1, 100, 8.0, when=now)
+    ledger.record(1, 50, 4.0, when=now)
+    ledger.record(2, 30, 2.0, when=now.replace(hour=11))
+
+    assert ledger.get_user_day(1, today) == {'requests': 2, 'characters': 150, 'audio_seconds': 12.0}
+    assert ledger.daily_stats(1) == [
+        {'day': today, 'users': 2, 'requests': 3, 'characters': 180, 'audio_seconds': 14.0}
+    ]
+    assert [(h['hour'], h['requests']) for h in ledger.hourly_stats(today)] == [(10, 2), (11, 1)]
+    assert ledger.top_users(today) == [(1, 2, 150), (2, 1, 30)]
+
+
+def test_prune_drops_old_buckets_only():
+    """Ensure pruning removes expired days and hours and keeps recent ones."""
+    ledger = UsageLedger()
+    now = datetime.now()
+    ledger.record(1, 10, 1.0, when=now - timedelta(days=100))
+    ledger.record(1, 10, 1.0, when=now - timedelta(days=20))
+    ledger.record(1, 10, 1.0, when=now)
+
+    # 1 old ledger row + 1 old daily rollup + 2 hourly rollups beyond 14 days
+    assert ledger.prune(retention_days=90, hourly_retention_days=14) == 4
+    assert [day['day'] for day in ledger.daily_stats(120)] == [
+        now.date().isoformat(), (now - timedelta(days=20)).date().isoformat()
+    ]
+    assert ledger.hourly_stats((now - timedelta(days=20)).date().isoformat()) == []
+
+
+def test_daily_usage_rolls_over_without_reset_write():
+    """Ensure usage from a previous day reads as zero and increments restart from one."""
+    session = UserSession()
+    session.db.execute(
+        "INSERT INTO users (user_id, daily_usage, last_reset_date) VALUES (?, ?, ?)", (5, 4, "2000-01-01")
+    )
+
+    assert session.get_daily_usage(5) == 0
+    assert session.db.fetchone("SELECT daily_usage FROM users WHERE user_id = 5") == (4,)
+
+    session.increment_usage(5)
+    assert session.get_daily_usage(5) == 1
+
+
+@pytest.mark.asyncio
+async def test_bot_prunes_ledger_periodically(monkeypatch):
+    """Ensure the running bot prunes the ledger repeatedly, not only at startup."""
+    from bot import TextToSpeechBot
+    from config import Config
+    pruned = []
+    monkeypatch.setattr(Config, "USAGE_PRUNE_INTERVAL", 0.01)
+    monkeypatch.setattr(UsageLedger, "prune", lambda self: pruned.append(1) or 0)
+    bot = TextToSpeechBot()
+
+    task = asyncio.create_task(bot._prune_usage_ledger())
+    await asyncio.sleep(0.1)
+    task.cancel()
+
+    assert len(pruned) >= 2